@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks of overhead of seismograph itself.
+
+Usage:
+
+    python -m benchmarks --output result.json
+    python -m benchmarks --baseline result.json --workload trivial --group threading
+"""
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+from .runner import main
+
+
+if __name__ == '__main__':
+    main()
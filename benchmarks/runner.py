@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+
+"""
+Each measure is done in own process,
+so startup time and peak RSS are not shared.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import json
+import time
+import platform
+import subprocess
+from optparse import OptionParser
+
+try:
+    from StringIO import StringIO
+except ImportError:  # please python 3
+    from io import StringIO
+
+
+GROUPS = {
+    'default': [],
+    'threading': ['--threading', '--async-suites', '2', '--async-tests', '4'],
+    'gevent': ['--gevent', '--async-suites', '2', '--async-tests', '4'],
+    'multiprocessing': ['--multiprocessing', '--async-suites', '4'],
+}
+
+# metric -> it's regression if value is greater
+METRICS = (
+    'per_case_us',
+    'startup_s',
+    'peak_rss_kb',
+)
+
+DEFAULT_TOLERANCE = 0.2
+
+
+def get_peak_rss():
+    """
+    Peak RSS of process and its workers in kilobytes
+    """
+    import resource
+
+    peak_rss = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+    if sys.platform == 'darwin':
+        return peak_rss // 1024
+
+    return peak_rss
+
+
+def measure(workload_name, group_name, scale):
+    """
+    It's called in child process only
+    """
+    if group_name == 'gevent':
+        try:
+            from gevent.monkey import patch_all
+        except ImportError:
+            return {'skipped': 'gevent is not installed'}
+
+        patch_all(thread=False)
+
+    start_time = time.time()
+
+    from seismograph import Program
+
+    from .workloads import WORKLOADS
+
+    suites, cases_count = WORKLOADS[workload_name](scale)
+
+    sys.argv = [sys.argv[0]] + GROUPS[group_name]
+
+    program = Program(
+        suites_path=None,
+        suites=suites,
+        exit=False,
+        stream=StringIO(),
+    )
+
+    startup_time = time.time() - start_time
+
+    run_start_time = time.time()
+    program()
+    run_time = time.time() - run_start_time
+
+    state = program.result.current_state
+
+    if state.tests != cases_count or not state.was_success:
+        raise RuntimeError(
+            'Workload "{}" on "{}" group was run incorrectly: {}'.format(
+                workload_name, group_name, program.result,
+            ),
+        )
+
+    return {
+        'cases': cases_count,
+        'run_s': round(run_time, 4),
+        'startup_s': round(startup_time, 4),
+        'per_case_us': round(run_time / cases_count * 1000000, 2),
+        'peak_rss_kb': get_peak_rss(),
+    }
+
+
+def run_in_process(workload_name, group_name, scale):
+    try:
+        output = subprocess.check_output(
+            [
+                sys.executable, '-m', 'benchmarks.runner',
+                '--child', workload_name, group_name, str(scale),
+            ],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+    except subprocess.CalledProcessError as error:
+        return {'failed': 'exit code {}'.format(error.returncode)}
+
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def best_of(results):
+    """
+    The lowest values are the least noisy.
+    None is returned if workload can not be measured.
+    """
+    results = [r for r in results if 'skipped' not in r and 'failed' not in r]
+
+    if not results:
+        return None
+
+    best = dict(results[0])
+
+    for result in results[1:]:
+        for metric in METRICS:
+            best[metric] = min(best[metric], result[metric])
+
+    return best
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+
+    for key, result in results.items():
+        base = baseline.get(key)
+
+        if not base or not result:
+            continue
+
+        for metric in METRICS:
+            if not base.get(metric):
+                continue
+
+            ratio = float(result[metric]) / base[metric]
+
+            if ratio > 1 + tolerance:
+                regressions.append((key, metric, base[metric], result[metric], ratio))
+
+    return regressions
+
+
+def create_option_parser():
+    parser = OptionParser(prog='python -m benchmarks')
+
+    parser.add_option(
+        '-w', '--workload',
+        dest='WORKLOADS',
+        action='append',
+        default=[],
+        help='Name of workload. Can be used few times. All by default.',
+    )
+    parser.add_option(
+        '-g', '--group',
+        dest='GROUPS',
+        action='append',
+        default=[],
+        help='Name of group for run. Can be used few times. All by default.',
+    )
+    parser.add_option(
+        '--scale',
+        dest='SCALE',
+        type=float,
+        default=1.0,
+        help='Multiplier for count of cases in workloads.',
+    )
+    parser.add_option(
+        '--repeat',
+        dest='REPEAT',
+        type=int,
+        default=3,
+        help='Count of runs for each measure, the best is saved.',
+    )
+    parser.add_option(
+        '-o', '--output',
+        dest='OUTPUT',
+        default=None,
+        help='Path to JSON file for saving of results.',
+    )
+    parser.add_option(
+        '-b', '--baseline',
+        dest='BASELINE',
+        default=None,
+        help='Path to JSON file with saved results for comparing.',
+    )
+    parser.add_option(
+        '--tolerance',
+        dest='TOLERANCE',
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help='Allowed slowdown relative to baseline. Default: {}'.format(DEFAULT_TOLERANCE),
+    )
+    parser.add_option(
+        '--child',
+        dest='CHILD',
+        action='store_true',
+        default=False,
+        help='Internal: measure one workload in this process.',
+    )
+
+    return parser
+
+
+def main():
+    from .workloads import WORKLOADS
+
+    parser = create_option_parser()
+    options, args = parser.parse_args()
+
+    if options.CHILD:
+        workload_name, group_name, scale = args
+        print(json.dumps(measure(workload_name, group_name, float(scale))))
+        return
+
+    results = {}
+
+    for workload_name in options.WORKLOADS or sorted(WORKLOADS):
+        for group_name in options.GROUPS or sorted(GROUPS):
+            key = '{}:{}'.format(workload_name, group_name)
+
+            result = best_of(
+                [
+                    run_in_process(workload_name, group_name, options.SCALE)
+                    for _ in range(options.REPEAT)
+                ],
+            )
+            results[key] = result
+
+            if result is None:
+                print('{}: was not measured'.format(key))
+            else:
+                print(
+                    '{}: per_case_us={} startup_s={} peak_rss_kb={}'.format(
+                        key, result['per_case_us'], result['startup_s'], result['peak_rss_kb'],
+                    ),
+                )
+
+    if options.OUTPUT:
+        with open(options.OUTPUT, 'w') as fp:
+            json.dump(
+                {
+                    'python': platform.python_version(),
+                    'scale': options.SCALE,
+                    'results': results,
+                },
+                fp,
+                indent=2,
+                sort_keys=True,
+            )
+
+    if options.BASELINE:
+        with open(options.BASELINE) as fp:
+            baseline = json.load(fp)
+
+        regressions = compare(results, baseline['results'], options.TOLERANCE)
+
+        for key, metric, base, value, ratio in regressions:
+            print(
+                'REGRESSION {} {}: {} -> {} (x{:.2f})'.format(key, metric, base, value, ratio),
+            )
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
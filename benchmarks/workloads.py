@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+"""
+Synthetic suites. Bodies of tests are empty,
+so all time of run is overhead of framework.
+"""
+
+from seismograph import Case
+from seismograph import step
+from seismograph import Suite
+from seismograph import Context
+from seismograph import CaseLayer
+
+
+SUITES_COUNT = 10
+
+
+def _count(scale, value):
+    return max(int(value * scale), 1)
+
+
+def _make_suites(name):
+    return [
+        Suite('{}_{}'.format(name, i)) for i in range(SUITES_COUNT)
+    ]
+
+
+def trivial(scale):
+    """
+    Function tests without anything
+    """
+    suites = _make_suites('trivial')
+    count = _count(scale, 10000) // SUITES_COUNT or 1
+
+    for suite in suites:
+        for i in range(count):
+            def test(case):
+                pass
+
+            test.__name__ = 'test_{}'.format(i)
+            suite.register(test)
+
+    return suites, count * SUITES_COUNT
+
+
+def steps(scale):
+    """
+    Step by step cases with ten steps
+    """
+    suites = _make_suites('steps')
+    count = _count(scale, 1000) // SUITES_COUNT or 1
+
+    def make_step(number):
+        @step(number, 'Step {}'.format(number))
+        def method(self):
+            pass
+
+        return method
+
+    for suite in suites:
+        for i in range(count):
+            attributes = {
+                'step_{}'.format(n): make_step(n) for n in range(1, 11)
+            }
+            suite.register(type('StepCase{}'.format(i), (Case, ), attributes))
+
+    return suites, count * SUITES_COUNT
+
+
+class _Layer(CaseLayer):
+
+    def on_init(self, case):
+        pass
+
+    def on_setup(self, case):
+        pass
+
+    def on_teardown(self, case):
+        pass
+
+    def on_run(self, case):
+        pass
+
+    def on_success(self, case, timer):
+        pass
+
+
+def layers(scale):
+    """
+    Cases with stack of 20 layers on all hooks
+    """
+    suites = _make_suites('layers')
+    count = _count(scale, 5000) // SUITES_COUNT or 1
+    stack = tuple(_Layer() for _ in range(20))
+
+    for suite in suites:
+        for i in range(count):
+            def test(case):
+                pass
+
+            test.__name__ = 'test_{}'.format(i)
+            suite.register(layers=stack)(test)
+
+    return suites, count * SUITES_COUNT
+
+
+def flows(scale):
+    """
+    Cases with five flows
+    """
+    suites = _make_suites('flows')
+    count = _count(scale, 2000) // SUITES_COUNT or 1
+    contexts = tuple(Context(num=n) for n in range(5))
+
+    for suite in suites:
+        for i in range(count):
+            def test(case, ctx):
+                pass
+
+            test.__name__ = 'test_{}'.format(i)
+            suite.register(flows=contexts)(test)
+
+    return suites, count * SUITES_COUNT
+
+
+WORKLOADS = {
+    'trivial': trivial,
+    'steps': steps,
+    'layers': layers,
+    'flows': flows,
+}
@@ -8,9 +8,14 @@ By Trifonov Mikhail
 For support, use the https://github.com/trifonovmixail/seismograph/issues tracker
 """
 
+from . import startup as _startup
+
+_startup.start(_startup.IMPORT)
+
 from .case import skip
 from .case import Case
 from .case import flows
+from .case import timeout
 from .case import skip_if
 from .case import assertion
 
@@ -62,6 +67,7 @@ __all__ = (
     'skip_if',
     'Context',
     'Program',
+    'timeout',
     'assertion',
     'CaseLayer',
     'SuiteLayer',
@@ -86,3 +92,6 @@ from .utils.pyv import check_py_version
 check_py_version()
 
 del check_py_version
+
+
+_startup.stop(_startup.IMPORT)
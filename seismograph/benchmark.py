@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark mode of cases.
+Test method is run by warmup rounds and measured iterations,
+statistic goes to metrics of record. Case is failed if median
+is slower than median of baseline more than threshold.
+"""
+
+import os
+import sys
+import json
+import math
+import logging
+from timeit import default_timer
+
+from . import runnable
+from . import metrics as _metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+MIN = 'benchmark_min'
+MEAN = 'benchmark_mean'
+MEDIAN = 'benchmark_median'
+P95 = 'benchmark_p95'
+STDDEV = 'benchmark_stddev'
+ITERATIONS = 'benchmark_iterations'
+BASELINE = 'benchmark_baseline'
+
+STATS_KEYS = (
+    MIN,
+    MEAN,
+    MEDIAN,
+    P95,
+    STDDEV,
+    ITERATIONS,
+)
+
+
+# one iteration if benchmark mode is disabled
+ONCE = (None, )
+
+
+_BASELINE = {}
+
+
+def get_case_key(class_name, method_name):
+    return '{}:{}'.format(class_name, method_name)
+
+
+def percentile(sorted_values, percent):
+    """
+    Nearest rank of sorted values
+    """
+    if not sorted_values:
+        return None
+
+    rank = int(math.ceil(percent / 100.0 * len(sorted_values)))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def get_stats(timings):
+    values = sorted(timings)
+    count = len(values)
+
+    if not count:
+        return {}
+
+    mean = sum(values) / count
+
+    if count % 2:
+        median = values[count // 2]
+    else:
+        median = (values[count // 2 - 1] + values[count // 2]) / 2.0
+
+    if count > 1:
+        stddev = math.sqrt(sum((v - mean) ** 2 for v in values) / (count - 1))
+    else:
+        stddev = 0.0
+
+    return {
+        MIN: values[0],
+        MEAN: mean,
+        MEDIAN: median,
+        P95: percentile(values, 95),
+        STDDEV: stddev,
+        ITERATIONS: count,
+    }
+
+
+def load_baseline(file_path):
+    _BASELINE.clear()
+
+    if not file_path or not os.path.isfile(file_path):
+        return _BASELINE
+
+    logger.debug(
+        'Load benchmark baseline from "{}"'.format(file_path),
+    )
+
+    try:
+        with open(file_path) as fp:
+            _BASELINE.update(json.load(fp))
+    except ValueError:
+        logger.warning(
+            'Benchmark baseline "{}" is broken and will be ignored'.format(file_path),
+        )
+
+    return _BASELINE
+
+
+def get_baseline(key):
+    return _BASELINE.get(key)
+
+
+class Benchmark(object):
+    """
+    Iterations of test method.
+    Time of each measured iteration is taken between
+    steps of iterator, so it can be used by sync and
+    async runners in the same way.
+    """
+
+    def __init__(self, case, warmup=0, iterations=1, budget=None, threshold=None):
+        self.__case = case
+        self.__warmup = warmup
+        self.__iterations = iterations
+        self.__budget = budget
+        self.__threshold = threshold
+
+        self.__timings = []
+
+    @property
+    def timings(self):
+        return self.__timings
+
+    def __iter__(self):
+        for _ in range(self.__warmup):
+            yield
+
+        started = default_timer()
+
+        while True:
+            if self.__budget:
+                if self.__timings and default_timer() - started >= self.__budget:
+                    break
+            elif len(self.__timings) >= self.__iterations:
+                break
+
+            start = default_timer()
+            yield
+            self.__timings.append(default_timer() - start)
+
+        self.finish()
+
+    def finish(self):
+        stats = get_stats(self.__timings)
+
+        if not stats:
+            return
+
+        case_metrics = _metrics.of(self.__case)
+
+        for name, value in stats.items():
+            case_metrics.set(name, value)
+
+        key = get_case_key(
+            runnable.class_name(self.__case), runnable.method_name(self.__case),
+        )
+        baseline = get_baseline(key)
+
+        if not baseline or MEDIAN not in baseline:
+            return
+
+        case_metrics.set(BASELINE, baseline[MEDIAN])
+
+        if self.__threshold is None:
+            return
+
+        limit = baseline[MEDIAN] * (1.0 + self.__threshold)
+
+        if stats[MEDIAN] > limit:
+            raise AssertionError(
+                'Benchmark regression of "{}": median {:.6f}s > {:.6f}s '
+                '(baseline {:.6f}s + {:.0f}%)'.format(
+                    key, stats[MEDIAN], limit, baseline[MEDIAN], self.__threshold * 100,
+                ),
+            )
+
+
+def repeat(case):
+    config = case.config
+
+    if config is None or not config.BENCHMARK:
+        return ONCE
+
+    return Benchmark(
+        case,
+        warmup=config.BENCHMARK_WARMUP,
+        iterations=config.BENCHMARK_ITERATIONS,
+        budget=config.BENCHMARK_TIME,
+        threshold=config.BENCHMARK_THRESHOLD,
+    )
+
+
+def get_results(result):
+    """
+    Statistic of cases from records of result.
+    Workers of multiprocessing are sending it with records.
+    """
+    results = {}
+
+    for storage in (result.successes, result.failures):
+        for _, xunit_data in storage:
+            data = xunit_data.metrics
+
+            if not data or MEDIAN not in data:
+                continue
+
+            key = get_case_key(xunit_data.class_name, xunit_data.method_name)
+            results[key] = dict(
+                (k, data[k]) for k in STATS_KEYS + (BASELINE, ) if k in data
+            )
+
+    return results
+
+
+def save_baseline(file_path, result):
+    """
+    Update baseline by successful cases of current
+    run, regressed cases are keeping previous values.
+    """
+    data = dict(_BASELINE)
+    failed = set(
+        get_case_key(x.class_name, x.method_name) for _, x in result.failures
+    )
+
+    for key, stats in get_results(result).items():
+        if key not in failed:
+            data[key] = dict((k, stats[k]) for k in STATS_KEYS)
+
+    logger.debug(
+        'Save benchmark baseline to "{}"'.format(file_path),
+    )
+
+    tmp_path = '{}.tmp'.format(file_path)
+
+    with open(tmp_path, 'w') as fp:
+        json.dump(data, fp, indent=2, sort_keys=True)
+
+    os.rename(tmp_path, file_path)
+
+
+def format_time(value):
+    if value is None:
+        return '-'
+    return '{:.6f}'.format(value)
+
+
+def print_report(result, stream=None):
+    stream = stream or sys.stdout
+    results = get_results(result)
+
+    if not results:
+        return
+
+    header = ('case', 'iterations', 'min', 'median', 'p95', 'stddev', 'baseline', 'change')
+    rows = []
+
+    for key, stats in sorted(results.items()):
+        baseline = stats.get(BASELINE)
+        change = '-'
+
+        if baseline:
+            change = '{:+.1f}%'.format((stats[MEDIAN] / baseline - 1.0) * 100)
+
+        rows.append((
+            key,
+            str(stats[ITERATIONS]),
+            format_time(stats[MIN]),
+            format_time(stats[MEDIAN]),
+            format_time(stats[P95]),
+            format_time(stats[STDDEV]),
+            format_time(baseline),
+            change,
+        ))
+
+    widths = [
+        max(len(row[i]) for row in rows + [header]) for i in range(len(header))
+    ]
+
+    stream.write('\nBenchmark:\n')
+
+    for row in [header] + rows:
+        stream.write(
+            '  {}\n'.format('  '.join(v.ljust(w) for v, w in zip(row, widths))),
+        )
+
+    stream.write('\n')
@@ -11,11 +11,16 @@ from six import with_metaclass
 from . import steps
 from . import loader
 from . import reason
+from . import tracer
+from . import metrics
+from . import benchmark
 from . import runnable
+from . import watchdog
 from .utils import pyv
 from . import extensions
 from .utils import common
 from .exceptions import Skip
+from .layers import CaseLayer
 from .utils.common import measure_time
 from .utils.common import call_to_chain
 from .exceptions import DependencyError
@@ -29,6 +34,8 @@ logger = logging.getLogger(__name__)
 DEFAULT_LAYERS = []
 MATCH_CASE_TO_LAYER = {}
 
+_layer_chains = runnable.LayerChains(CaseLayer, DEFAULT_LAYERS, MATCH_CASE_TO_LAYER)
+
 
 SKIP_ATTRIBUTE_NAME = '__skip__'
 SKIP_WHY_ATTRIBUTE_NAME = '__skip_why__'
@@ -64,17 +71,53 @@ def prepare(case, method):
 def setup_class_proxy(case):
     if getattr(case.__class__, '__setup_class_was_called__', False):
         return
-    case.setup_class()
+    with tracer.span('{}.setup_class', tracer.CLASS_FIXTURE, case.__class__.__name__):
+        case.setup_class()
     setattr(case.__class__, '__setup_class_was_called__', True)
 
 
 def teardown_class_proxy(case):
     if getattr(case.__class__, '__teardown_class_was_called__', False):
         return
-    case.teardown_class()
+    with tracer.span('{}.teardown_class', tracer.CLASS_FIXTURE, case.__class__.__name__):
+        case.teardown_class()
     setattr(case.__class__, '__teardown_class_was_called__', True)
 
 
+def has_class_fixtures(case):
+    """
+    Case class overrides setup_class or teardown_class.
+    Such cases can not be separated from each other.
+    """
+    return any(
+        getattr(get_case_class(case), name).__func__ is not getattr(Case, name).__func__
+        for name in ('setup_class', 'teardown_class')
+    )
+
+
+def get_case_class(case):
+    if isinstance(case, CaseDescriptor):
+        return case.cls
+    return case.__class__
+
+
+def create_case(case):
+    """
+    Case will be created if descriptor is given
+    """
+    if isinstance(case, CaseDescriptor):
+        return case.create()
+    return case
+
+
+def release_case(case):
+    """
+    Case is kept by result after run,
+    but its extensions are not needed more.
+    """
+    case.context.extensions.clear()
+
+
 def _skip(reason):
     def wrapper(case):
         if not pyv.is_class_type(case):
@@ -136,6 +179,16 @@ def flows(*flows):
     return wrapper
 
 
+def timeout(seconds):
+    """
+    Hard timeout of case class or test method in seconds
+    """
+    def wrapper(obj):
+        setattr(obj, watchdog.TIMEOUT_ATTRIBUTE_NAME, seconds)
+        return obj
+    return wrapper
+
+
 def apply_flows(case):
     if not steps.is_step_by_step_case(case) and case.__flows__:
         setattr(
@@ -162,18 +215,39 @@ def make_case_class_from_function(
     else:
         method = func
 
+    attributes = {
+        '__doc__': doc or func.__doc__,
+        loader.DEFAULT_TEST_NAME: method,
+    }
+
+    # static method is wrapped and does not keep it
+    if hasattr(func, watchdog.TIMEOUT_ATTRIBUTE_NAME):
+        attributes[watchdog.TIMEOUT_ATTRIBUTE_NAME] = getattr(func, watchdog.TIMEOUT_ATTRIBUTE_NAME)
+
     cls = type(
         class_name or func.__name__,
         (base_class, ),
-        {
-            '__doc__': doc or func.__doc__,
-            loader.DEFAULT_TEST_NAME: method,
-        },
+        attributes,
     )
 
     return cls
 
 
+def get_layer_chain(layers, case, hook_name):
+    """
+    Layers of case which are overriding the hook
+    """
+    return _layer_chains.get(layers, case, hook_name)
+
+
+def changed_layers():
+    """
+    Should be called after change of
+    DEFAULT_LAYERS or MATCH_CASE_TO_LAYER
+    """
+    _layer_chains.changed()
+
+
 def with_match_layers(context, case):
     for layer in context.layers:
         yield layer
@@ -221,13 +295,17 @@ class CaseBox(object):
 
     def __run__(self, result):
         for case in self.__cases:
-            self.__current = case
+            self.__current = create_case(case)
             try:
-                setup_class_proxy(self.__current)
-            except BaseException as error:
-                runnable.stopped_on(self.__current, 'setup_class')
-                raise error
-            self.__run_current__(result)
+                try:
+                    setup_class_proxy(self.__current)
+                except BaseException as error:
+                    runnable.stopped_on(self.__current, 'setup_class')
+                    raise error
+                self.__run_current__(result)
+            finally:
+                if self.__current is not case:
+                    release_case(self.__current)
 
         if self.__current:
             try:
@@ -237,21 +315,109 @@ class CaseBox(object):
                 raise error
 
 
+class CaseDescriptor(runnable.RunnableObject):
+    """
+    Test of case class which is not created yet.
+    Case is created right before run and descriptor
+    does not keep it, so suite is holding descriptors
+    instead of fully initialized cases.
+    """
+
+    def __init__(self, cls, method_name, config=None):
+        self.__cls = cls
+        self.__config = config
+        self.__method_name = method_name
+
+        self.__is_run = False
+
+        super(CaseDescriptor, self).__init__()
+
+    def __is_run__(self):
+        return self.__is_run
+
+    def __method_name__(self):
+        return self.__method_name
+
+    def __class_name__(self):
+        return '{}.{}'.format(
+            self.__cls.__mount_data__.suite_name, self.__cls.__name__,
+        )
+
+    def __reason__(self):
+        return ''
+
+    def __run__(self, result):
+        self.__is_run = True
+        case = self.create()
+
+        try:
+            case(result)
+        finally:
+            release_case(case)
+
+    def __str__(self):
+        return '{} ({}:{})'.format(
+            self.__method_name,
+            self.__cls.__mount_data__.suite_name,
+            self.__cls.__name__,
+        )
+
+    def __repr__(self):
+        return '<{} {}:{} method_name={}>'.format(
+            self.__class__.__name__,
+            self.__cls.__mount_data__.suite_name,
+            self.__cls.__name__,
+            self.__method_name,
+        )
+
+    @property
+    def cls(self):
+        return self.__cls
+
+    @property
+    def config(self):
+        return self.__config
+
+    def create(self):
+        case = self.__cls(self.__method_name, config=self.__config)
+        # records of case are matched with descriptor
+        # when they are sent from worker process
+        case._id = self.id
+        return case
+
+
 class MountData(object):
 
-    def __init__(self, suite_name=None, require=None):
+    def __init__(self, suite_name=None, require=None, timeout=None):
         self.__require = require
+        self.__timeout = timeout
         self.__suite_name = suite_name
 
     @property
     def require(self):
         return self.__require
 
+    @property
+    def timeout(self):
+        return self.__timeout
+
     @property
     def suite_name(self):
         return self.__suite_name
 
 
+class Outcome(object):
+    """
+    Outcome of case run. Sync and async runners
+    call hooks of layers by their own way, then
+    result is recorded.
+    """
+
+    def __init__(self, record, *hooks):
+        self.record = record
+        self.hooks = hooks
+
+
 class AssertionBase(object):
 
     __unittest__ = __UnitTest__('__call__')
@@ -524,7 +690,8 @@ class CaseContext(runnable.ContextOfRunnableObject):
                  layers=None):
         self.__require = []
         self.__extensions = {}
-        self.__layers = layers if layers else []
+        self.__pooled = []
+        self.__layers = tuple(layers) if layers else ()
 
         self.__setup_callbacks = [setup]
         self.__teardown_callbacks = [teardown]
@@ -555,165 +722,162 @@ class CaseContext(runnable.ContextOfRunnableObject):
             if layer.enabled:
                 yield layer
 
+    def layers_of_hook(self, case, hook_name):
+        """
+        Enabled layers of case which are overriding the hook
+        """
+        for layer in get_layer_chain(self.__layers, case, hook_name):
+            if layer.enabled:
+                yield layer
+
+    def __call_layers(self, case, hook_name, *args):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Call to chain callbacks "{}" of case "{}"'.format(
+                    hook_name, runnable.class_name(case),
+                ),
+            )
+
+        chain = get_layer_chain(self.__layers, case, hook_name)
+        case_metrics = metrics.of(case)
+
+        # hooks are called without measurement
+        # if metrics and trace are disabled
+        if case_metrics is metrics.NULL and not tracer.is_enabled():
+            for layer in chain:
+                if layer.enabled:
+                    getattr(layer, hook_name)(*args)
+            return
+
+        for layer in chain:
+            if layer.enabled:
+                with case_metrics.measure(metrics.LAYER, layer.__class__.__name__, hook_name):
+                    with tracer.span('{}.{}', tracer.HOOK, layer.__class__.__name__, hook_name):
+                        getattr(layer, hook_name)(*args)
+
     def start_context(self, case):
-        logger.debug(
-            'Start context of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Start context of case "{}"'.format(
+                    runnable.class_name(case),
+                ),
+            )
 
         try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_setup', case,
+            self.__call_layers(
+                case, 'on_setup', case,
             )
-            call_to_chain(self.__setup_callbacks, None)
+            with metrics.of(case).measure(metrics.SETUP):
+                call_to_chain(self.__setup_callbacks, None)
         except BaseException:
             runnable.stopped_on(case, 'start_context')
             raise
 
     def stop_context(self, case):
-        logger.debug(
-            'Stop context of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Stop context of case "{}"'.format(
+                    runnable.class_name(case),
+                ),
+            )
 
         try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_teardown', case,
+            self.__call_layers(
+                case, 'on_teardown', case,
             )
-            call_to_chain(self.__teardown_callbacks, None)
+            with metrics.of(case).measure(metrics.TEARDOWN):
+                call_to_chain(self.__teardown_callbacks, None)
         except BaseException:
             runnable.stopped_on(case, 'stop_context')
             raise
 
     def install_extensions(self):
         for ext_name in self.require:
-            if ext_name not in self.__extensions:
+            if ext_name in self.__extensions or ext_name in self.__pooled:
+                continue
+
+            if extensions.is_pooled(ext_name):
+                self.__pooled.append(ext_name)
+            else:
                 self.__extensions[ext_name] = extensions.get(ext_name)
 
-    def on_init(self, case):
-        logger.debug(
-            'Call to chain callbacks "on_init" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
+    def acquire_extensions(self, case, blocking=True):
+        return extensions.acquire(
+            self.__pooled, self.__extensions, case,
+            suite_name=case.__mount_data__.suite_name, blocking=blocking,
         )
 
-        call_to_chain(
-            with_match_layers(self, case), 'on_init', case,
-        )
+    def release_extensions(self, case):
+        extensions.release(self.__pooled, self.__extensions, case, suite_name=case.__mount_data__.suite_name)
 
-    def on_require(self, case):
-        logger.debug(
-            'Call to chain callbacks "on_require" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
+    def on_init(self, case):
+        self.__call_layers(
+            case, 'on_init', case,
         )
 
-        call_to_chain(
-            with_match_layers(self, case), 'on_require', self.__require,
+    def on_require(self, case):
+        self.__call_layers(
+            case, 'on_require', self.__require,
         )
 
     def on_skip(self, case, reason, result):
-        logger.debug(
-            'Call to chain callbacks "on_skip" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
-
         try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_skip', case, reason, result,
+            self.__call_layers(
+                case, 'on_skip', case, reason, result,
             )
         except BaseException:
             runnable.stopped_on(case, 'on_skip')
             raise
 
     def on_any_error(self, error, case, result, tb, timer):
-        logger.debug(
-            'Call to chain callbacks "on_any_error" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
-
         try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_any_error', error, case, result, tb, timer,
+            self.__call_layers(
+                case, 'on_any_error', error, case, result, tb, timer,
             )
         except BaseException:
             runnable.stopped_on(case, 'on_any_error')
             raise
 
     def on_error(self, error, case, result, tb, timer):
-        logger.debug(
-            'Call to chain callbacks "on_error" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
-
         try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_error', error, case, result, tb, timer,
+            self.__call_layers(
+                case, 'on_error', error, case, result, tb, timer,
             )
         except BaseException:
             runnable.stopped_on(case, 'on_error')
             raise
 
     def on_context_error(self, error, case, result, tb, timer):
-        logger.debug(
-            'Call to chain callbacks "on_context_error" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
-
         try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_context_error', error, case, result, tb, timer,
+            self.__call_layers(
+                case, 'on_context_error', error, case, result, tb, timer,
             )
         except BaseException:
             runnable.stopped_on(case, 'on_context_error')
             raise
 
     def on_fail(self, fail, case, result, tb, timer):
-        logger.debug(
-            'Call to chain callbacks "on_fail" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
-
         try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_fail', fail, case, result, tb, timer,
+            self.__call_layers(
+                case, 'on_fail', fail, case, result, tb, timer,
             )
         except BaseException:
             runnable.stopped_on(case, 'on_fail')
             raise
 
     def on_success(self, case, timer):
-        logger.debug(
-            'Call to chain callbacks "on_success" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
-
         try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_success', case, timer,
+            self.__call_layers(
+                case, 'on_success', case, timer,
             )
         except BaseException:
             runnable.stopped_on(case, 'on_success')
             raise
 
     def on_run(self, case):
-        logger.debug(
-            'Call to chain callbacks "on_run" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
-
         try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_run', case,
+            self.__call_layers(
+                case, 'on_run', case,
             )
         except BaseException:
             runnable.stopped_on(case, 'on_run')
@@ -728,7 +892,10 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
     __flows__ = None
     __layers__ = None
     __static__ = False
+    __trace__ = tracer.CASE
     __require__ = None
+    __timeout__ = None
+    __resources__ = None
     __repeatable__ = True
     __create_reason__ = True
     __always_success__ = False
@@ -794,6 +961,9 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
 
         return reason.join(*reasons)
 
+    def __metrics__(self):
+        return self.__metrics.to_dict()
+
     def __run__(self, result):
         self.__is_run = True
         timer = measure_time()
@@ -801,22 +971,15 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
         if result.current_state.should_stop:
             return
 
+        self._start_metrics()
+
         with result.proxy() as result_proxy:
             result_proxy.start(self)
 
-            if self.__always_success__:
-                self.__context.on_success(self)
-                result_proxy.add_success(
-                    self, timer(),
-                )
-                return
+            outcome = self._get_early_outcome(result_proxy, timer)
 
-            if hasattr(self, SKIP_ATTRIBUTE_NAME):
-                reason = getattr(self, SKIP_WHY_ATTRIBUTE_NAME, 'no reason')
-                self.__context.on_skip(self, reason, result_proxy)
-                result_proxy.add_skip(
-                    self, reason, timer(),
-                )
+            if outcome is not None:
+                self.__apply_outcome(outcome)
                 return
 
             self.__log = result_proxy.console.child_console()
@@ -827,60 +990,44 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
                 was_success = True
 
                 for _ in iter(repeat(self)):
-                    with self.__context(self):
+                    with watchdog.guard(self), self.__context(self):
                         try:
                             test_method = prepare(
                                 self, getattr(self, runnable.method_name(self)),
                             )
-                            for _ in iter(repeat_method(self)):
-                                test_method()
+                            with self.__metrics.measure(metrics.TEST):
+                                for _ in iter(benchmark.repeat(self)):
+                                    for _ in iter(repeat_method(self)):
+                                        common.run_if_awaitable(test_method())
                         except ALLOW_RAISED_EXCEPTIONS:
                             result_proxy.current_state.should_stop = True
                             raise
-                        except Skip as s:
-                            runnable.set_debug_if_allowed(self.config)
-                            was_success = False
-                            self.__context.on_skip(self, s.message, result_proxy)
-                            result_proxy.add_skip(
-                                self, s.message, timer(),
-                            )
-                        except AssertionError as fail:
-                            runnable.set_debug_if_allowed(self.config)
-                            was_success = False
-                            tb = traceback.format_exc()
-                            self.__context.on_fail(fail, self, result_proxy, tb, timer)
-                            result_proxy.add_fail(
-                                self, tb, timer(), fail,
-                            )
                         except BaseException as error:
-                            runnable.set_debug_if_allowed(self.config)
                             was_success = False
-                            tb = traceback.format_exc()
-                            self.__context.on_error(error, self, result_proxy, tb, timer)
-                            self.__context.on_any_error(error, self, result_proxy, tb, timer)
-                            result_proxy.add_error(
-                                self, tb, timer(), error,
+                            self.__apply_outcome(
+                                self._get_outcome(error, result_proxy, timer),
                             )
 
                     if not was_success:
                         break
 
                 if was_success:
-                    self.__context.on_success(self, timer)
-                    result_proxy.add_success(
-                        self, timer(),
+                    self.__apply_outcome(
+                        self._get_outcome(None, result_proxy, timer),
                     )
             except ALLOW_RAISED_EXCEPTIONS:
                 raise
             except BaseException as error:
-                runnable.set_debug_if_allowed(self.config)
-                tb = traceback.format_exc()
-                self.__context.on_context_error(error, self, result_proxy, tb, timer)
-                self.__context.on_any_error(error, self, result_proxy, tb, timer)
-                result_proxy.add_error(
-                    self, tb, timer(), error,
+                self.__apply_outcome(
+                    self._get_context_error_outcome(error, result_proxy, timer),
                 )
 
+    def __apply_outcome(self, outcome):
+        for hook_name, args in outcome.hooks:
+            getattr(self.__context, hook_name)(*args)
+
+        outcome.record()
+
     #
     # Behavior on magic methods
     #
@@ -917,6 +1064,7 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
         self.__log = None
         self.__is_run = False
         self.__config = config
+        self.__metrics = metrics.NULL
         self._method_name = method_name
 
         if use_flows:
@@ -980,6 +1128,7 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
         cls.__mount_data__ = MountData(
             suite_name=suite.name,
             require=common_require,
+            timeout=getattr(suite, '__timeout__', None),
         )
 
         return cls
@@ -993,6 +1142,88 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
     def __prepare__(self, method):
         return method
 
+    def _set_run_state(self, log=None):
+        """
+        For runners which can not use __run__,
+        asyncio groups are awaiting of cases.
+        """
+        self.__is_run = True
+        self.__log = log
+
+    def _get_early_outcome(self, result_proxy, timer):
+        """
+        Outcome of case which is not run
+        or None if test method should be run
+        """
+        if self.__always_success__:
+            return Outcome(
+                lambda: result_proxy.add_success(self, timer()),
+                ('on_success', (self, timer)),
+            )
+
+        if hasattr(self, SKIP_ATTRIBUTE_NAME):
+            why = getattr(self, SKIP_WHY_ATTRIBUTE_NAME, 'no reason')
+            return Outcome(
+                lambda: result_proxy.add_skip(self, why, timer()),
+                ('on_skip', (self, why, result_proxy)),
+            )
+
+        return None
+
+    def _get_outcome(self, error, result_proxy, timer):
+        """
+        Outcome of test method by raised error or success if error is None.
+        It's called from except block because traceback is taken here.
+        """
+        if error is None:
+            return Outcome(
+                lambda: result_proxy.add_success(self, timer()),
+                ('on_success', (self, timer)),
+            )
+
+        runnable.set_debug_if_allowed(self.config)
+
+        if isinstance(error, Skip):
+            return Outcome(
+                lambda: result_proxy.add_skip(self, error.message, timer()),
+                ('on_skip', (self, error.message, result_proxy)),
+            )
+
+        tb = traceback.format_exc()
+
+        if isinstance(error, AssertionError):
+            return Outcome(
+                lambda: result_proxy.add_fail(self, tb, timer(), error),
+                ('on_fail', (error, self, result_proxy, tb, timer)),
+            )
+
+        return Outcome(
+            lambda: result_proxy.add_error(self, tb, timer(), error),
+            ('on_error', (error, self, result_proxy, tb, timer)),
+            ('on_any_error', (error, self, result_proxy, tb, timer)),
+        )
+
+    def _get_context_error_outcome(self, error, result_proxy, timer):
+        runnable.set_debug_if_allowed(self.config)
+        tb = traceback.format_exc()
+
+        return Outcome(
+            lambda: result_proxy.add_error(self, tb, timer(), error),
+            ('on_context_error', (error, self, result_proxy, tb, timer)),
+            ('on_any_error', (error, self, result_proxy, tb, timer)),
+        )
+
+    def _start_metrics(self):
+        """
+        Measurement is started on each run
+        if it's enabled by config
+        """
+        self.__metrics = metrics.create(self.__config)
+
+    @property
+    def _metrics(self):
+        return self.__metrics
+
     @property
     @runnable.mount_method
     def name(self):
@@ -4,7 +4,6 @@ import logging
 from random import Random
 
 from . import loader
-from . import extensions
 from .suite import BuildRule
 from .exceptions import CollectError
 from .utils.common import call_to_chain
@@ -29,6 +28,17 @@ def get_suite_name_from_command(command):
     return suite_name
 
 
+def get_selected_suite_names(config):
+    """
+    Names of suites from command line.
+    None means that all suites are selected.
+    """
+    if config.TESTS:
+        return set(get_suite_name_from_command(c) for c in config.TESTS)
+
+    return None
+
+
 def get_case_name_from_command(command):
     try:
         _, case_name = command.split(':')
@@ -62,7 +72,6 @@ def try_apply_rules(suite, rules):
 
 def base_generator(suites, shuffle=None):
     call_to_chain(suites, 'build', shuffle=shuffle)
-    extensions.clear()
 
     if shuffle:
         shuffle(suites)
@@ -89,7 +98,6 @@ def generator_by_commands(suites, rules, shuffle=None):
         )
 
     call_to_chain(loaded_suites, 'build', shuffle=shuffle)
-    extensions.clear()
 
     if shuffle:
         shuffle(loaded_suites)
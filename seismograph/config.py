@@ -26,6 +26,20 @@ def create_option_parser():
         default=None,
         help='Path to xml file to store the xunit report in.',
     )
+    result_group.add_option(
+        '--metrics',
+        dest='METRICS',
+        action='store_true',
+        default=False,
+        help='Measure phases of cases, CPU time and store them to results.',
+    )
+    result_group.add_option(
+        '--metrics-memory',
+        dest='METRICS_MEMORY',
+        action='store_true',
+        default=False,
+        help='Measure peak of memory allocations of cases in addition to metrics. Python 3.9 and greater.',
+    )
     parser.add_option_group(result_group)
 
     console_group = OptionGroup(parser, 'Output options')
@@ -64,6 +78,51 @@ def create_option_parser():
         default=False,
         help='Print tree of suites to console.',
     )
+    console_group.add_option(
+        '--profile-startup',
+        dest='PROFILE_STARTUP',
+        action='store_true',
+        default=False,
+        help='Print time of import, discovery and build to console.',
+    )
+    console_group.add_option(
+        '--trace',
+        dest='TRACE',
+        type=str,
+        default=None,
+        help='Path to json file to store the timeline of run in. '
+             'Format of chrome trace events, it can be opened by perfetto.',
+    )
+    console_group.add_option(
+        '--profile',
+        dest='PROFILE',
+        type=str,
+        default=None,
+        help='Profile cases and dump stats to this directory. '
+             'Top of functions by suites is printed at the end.',
+    )
+    console_group.add_option(
+        '--profile-mode',
+        dest='PROFILE_MODE',
+        type='choice',
+        choices=('cprofile', 'sampling'),
+        default='cprofile',
+        help='Profiler of cases: cprofile or sampling with low overhead for long suites.',
+    )
+    console_group.add_option(
+        '--profile-interval',
+        dest='PROFILE_INTERVAL',
+        type=float,
+        default=0.005,
+        help='Interval of sampling profiler in seconds.',
+    )
+    console_group.add_option(
+        '--profile-top',
+        dest='PROFILE_TOP',
+        type=int,
+        default=20,
+        help='Num of functions by suite in profile report.',
+    )
     console_group.add_option(
         '--no-color',
         dest='NO_COLOR',
@@ -188,6 +247,45 @@ def create_option_parser():
         default=0,
         help='Num tests from suite to async run.',
     )
+    run_group.add_option(
+        '--max-threads',
+        type=int,
+        dest='MAX_THREADS',
+        default=0,
+        help='Global limit of threads for threading groups of all suites. '
+             'Async suites multiplied by async tests by default.',
+    )
+    run_group.add_option(
+        '--adaptive',
+        dest='ADAPTIVE',
+        action='store_true',
+        default=False,
+        help='Adjust num of active workers of threading and multiprocessing groups '
+             'by utilization of cpu and latency of cases.',
+    )
+    run_group.add_option(
+        '--adaptive-interval',
+        type=float,
+        dest='ADAPTIVE_INTERVAL',
+        default=1.0,
+        help='Interval in seconds between adjustments of workers.',
+    )
+    run_group.add_option(
+        '--memory-limit',
+        type=float,
+        dest='MEMORY_LIMIT',
+        default=None,
+        help='Ceiling of memory of program with its workers in megabytes. '
+             'Num of active workers is decreased if it is reached.',
+    )
+    run_group.add_option(
+        '--case-timeout',
+        type=float,
+        dest='CASE_TIMEOUT',
+        default=None,
+        help='Hard timeout of each case in seconds. '
+             'Hung case is interrupted and recorded as error.',
+    )
     run_group.add_option(
         '--split-flows',
         dest='SPLIT_FLOWS',
@@ -202,6 +300,124 @@ def create_option_parser():
         default=float(1800),
         help='Timeout to release and join multiprocessing process.',
     )
+    run_group.add_option(
+        '--mp-granularity',
+        type='choice',
+        choices=('suite', 'case'),
+        dest='MP_GRANULARITY',
+        default='suite',
+        help='Unit of work for multiprocessing workers: suite or case.',
+    )
+    run_group.add_option(
+        '--benchmark',
+        dest='BENCHMARK',
+        action='store_true',
+        default=False,
+        help='Run test method of each case by warmup rounds and measured iterations.',
+    )
+    run_group.add_option(
+        '--benchmark-warmup',
+        dest='BENCHMARK_WARMUP',
+        type=int,
+        default=1,
+        help='Num of warmup rounds which are not measured.',
+    )
+    run_group.add_option(
+        '--benchmark-iterations',
+        dest='BENCHMARK_ITERATIONS',
+        type=int,
+        default=10,
+        help='Num of measured iterations.',
+    )
+    run_group.add_option(
+        '--benchmark-time',
+        dest='BENCHMARK_TIME',
+        type=float,
+        default=None,
+        help='Budget of measured iterations in seconds, it is used instead of num of iterations.',
+    )
+    run_group.add_option(
+        '--benchmark-baseline',
+        dest='BENCHMARK_BASELINE',
+        default=None,
+        help='Path to json file with baseline of benchmark.',
+    )
+    run_group.add_option(
+        '--benchmark-save',
+        dest='BENCHMARK_SAVE',
+        action='store_true',
+        default=False,
+        help='Save results of successful cases to baseline file.',
+    )
+    run_group.add_option(
+        '--benchmark-threshold',
+        dest='BENCHMARK_THRESHOLD',
+        type=float,
+        default=0.2,
+        help='Case is failed if median is slower than median of baseline by this fraction.',
+    )
+    run_group.add_option(
+        '--load',
+        dest='LOAD',
+        action='store_true',
+        default=False,
+        help='Run selected cases by concurrent virtual users and report latency percentiles.',
+    )
+    run_group.add_option(
+        '--load-users',
+        dest='LOAD_USERS',
+        type=int,
+        default=10,
+        help='Num of virtual users. Users are greenlets with --gevent and tasks with --asyncio.',
+    )
+    run_group.add_option(
+        '--load-duration',
+        dest='LOAD_DURATION',
+        type=float,
+        default=60.0,
+        help='Duration of load in seconds.',
+    )
+    run_group.add_option(
+        '--load-ramp-up',
+        dest='LOAD_RAMP_UP',
+        type=float,
+        default=0.0,
+        help='Time in seconds for starting of all users.',
+    )
+    run_group.add_option(
+        '--load-rate',
+        dest='LOAD_RATE',
+        type=float,
+        default=None,
+        help='Target rate of iterations per second for all users. Not limited by default.',
+    )
+    run_group.add_option(
+        '--load-iterations',
+        dest='LOAD_ITERATIONS',
+        type=int,
+        default=None,
+        help='Max num of iterations for all users.',
+    )
+    run_group.add_option(
+        '--load-report',
+        dest='LOAD_REPORT',
+        default=None,
+        help='Path to json file for export of latency histograms.',
+    )
+    run_group.add_option(
+        '--runtime-history',
+        dest='RUNTIME_HISTORY',
+        default=None,
+        help='Path to file with runtime of suites and cases. '
+             'Async groups are running the longest of them first.',
+    )
+    run_group.add_option(
+        '--discovery-index',
+        dest='DISCOVERY_INDEX',
+        default=None,
+        help='Path to file with index of suites in modules. '
+             'Modules without selected suites are not imported.',
+    )
     run_group.add_option(
         '--gevent',
         dest='GEVENT',
@@ -209,6 +425,14 @@ def create_option_parser():
         default=False,
         help='Use gevent groups for run. Allow for python 2 only.',
     )
+    run_group.add_option(
+        '--asyncio',
+        dest='ASYNCIO',
+        action='store_true',
+        default=False,
+        help='Use asyncio groups for run. Coroutine cases are awaited on one event loop. '
+             'Allow for python 3 only.',
+    )
     run_group.add_option(
         '--threading',
         dest='THREADING',
@@ -242,7 +466,7 @@ def prepare_config(config):
         from logging.config import dictConfig
         dictConfig(logging_settings)
 
-    if not config.GEVENT and not config.THREADING and (
+    if not config.GEVENT and not config.THREADING and not config.ASYNCIO and (
             config.ASYNC_SUITES or config.ASYNC_TESTS):
         config.MULTIPROCESSING = True
 
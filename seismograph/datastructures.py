@@ -1,5 +1,11 @@
 # coding: utf-8
 
+import types
+import numbers
+from copy import deepcopy
+
+from .utils import pyv
+
 
 class DictObject(dict):
 
@@ -32,3 +38,197 @@ class DictObject(dict):
 
 class Context(DictObject):
     pass
+
+
+_ITEM = 'item'
+_ATTRIBUTE = 'attribute'
+
+_IMMUTABLE_TYPES = (
+    pyv.basestring, bytes, numbers.Number, bool, type(None), frozenset,
+)
+
+_CONTAINER_TYPES = (
+    dict, list, tuple, set, frozenset,
+)
+
+# methods of built in containers which are not changing them,
+# any other method is called on copy of data
+_READ_METHODS = frozenset((
+    'keys',
+    'index',
+    'count',
+    'union',
+    'issubset',
+    'isdisjoint',
+    'issuperset',
+    'difference',
+    'intersection',
+    'symmetric_difference',
+))
+
+# these are not data, they are returned as is
+_ROUTINE_TYPES = (
+    type, types.FunctionType, types.BuiltinFunctionType,
+)
+
+
+def _unwrap(value):
+    """
+    Proxy is not stored to data,
+    it's real object is stored
+    """
+    if isinstance(value, CopyOnWriteProxy):
+        return deepcopy(value)
+    return value
+
+
+class _Root(object):
+
+    __slots__ = ('data', 'is_copied')
+
+    def __init__(self, data):
+        self.data = data
+        self.is_copied = False
+
+
+class CopyOnWriteProxy(object):
+    """
+    Read only view of shared data.
+    Shared object is copied on first write
+    to the proxy or to any of its nested values,
+    so it's never changed from the proxy.
+
+    Nested values which are not immutable are
+    returned as proxies too. Use copy.deepcopy
+    for getting of real object. Methods of values
+    are called on copy of data except known
+    methods of built in containers for reading.
+    """
+
+    __slots__ = ('__root', '__path')
+
+    def __init__(self, data, _root=None, _path=()):
+        object.__setattr__(self, '_CopyOnWriteProxy__root', _root or _Root(data))
+        object.__setattr__(self, '_CopyOnWriteProxy__path', _path)
+
+    @property
+    def __target(self):
+        target = self.__root.data
+
+        for kind, key in self.__path:
+            if kind == _ITEM:
+                target = target[key]
+            else:
+                target = getattr(target, key)
+
+        return target
+
+    def __wrap(self, kind, key, value):
+        if isinstance(value, _IMMUTABLE_TYPES + _ROUTINE_TYPES):
+            return value
+
+        return CopyOnWriteProxy(
+            None, _root=self.__root, _path=self.__path + ((kind, key), ),
+        )
+
+    def __write(self):
+        if not self.__root.is_copied:
+            self.__root.data = deepcopy(self.__root.data)
+            self.__root.is_copied = True
+
+        return self.__target
+
+    def __getattr__(self, item):
+        target = self.__target
+        value = getattr(target, item)
+
+        if isinstance(value, _IMMUTABLE_TYPES):
+            return value
+
+        if isinstance(target, dict):
+            if item == 'get':
+                return lambda key, default=None: self[key] if key in self.__target else default
+            if item == 'values':
+                return lambda: [self[k] for k in self.__target]
+            if item == 'items':
+                return lambda: [(k, self[k]) for k in self.__target]
+
+        if item == 'copy' and callable(value):
+            return lambda: deepcopy(self.__target)
+
+        if callable(value) and not isinstance(value, type):
+            if item in _READ_METHODS and isinstance(target, _CONTAINER_TYPES):
+                return value
+
+            return lambda *args, **kwargs: getattr(self.__write(), item)(
+                *[_unwrap(a) for a in args],
+                **dict((k, _unwrap(v)) for k, v in kwargs.items())
+            )
+
+        return self.__wrap(_ATTRIBUTE, item, value)
+
+    def __setattr__(self, key, value):
+        setattr(self.__write(), key, _unwrap(value))
+
+    def __delattr__(self, item):
+        delattr(self.__write(), item)
+
+    def __getitem__(self, item):
+        return self.__wrap(_ITEM, item, self.__target[item])
+
+    def __setitem__(self, key, value):
+        self.__write()[key] = _unwrap(value)
+
+    def __delitem__(self, key):
+        del self.__write()[key]
+
+    def __iadd__(self, other):
+        target = self.__write()
+        target += _unwrap(other)
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return self.__write()(*args, **kwargs)
+
+    def __iter__(self):
+        target = self.__target
+
+        if isinstance(target, (list, tuple)):
+            return (self[i] for i in pyv.xrange(len(target)))
+
+        return iter(target)
+
+    def __len__(self):
+        return len(self.__target)
+
+    def __contains__(self, item):
+        return item in self.__target
+
+    def __nonzero__(self):
+        return bool(self.__target)
+
+    def __bool__(self):  # please python 3
+        return self.__nonzero__()
+
+    def __eq__(self, other):
+        if isinstance(other, CopyOnWriteProxy):
+            other = other.__target
+        return self.__target == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.__target)
+
+    def __copy__(self):
+        return deepcopy(self.__target)
+
+    def __deepcopy__(self, memo):
+        return deepcopy(self.__target, memo)
+
+    def __repr__(self):
+        return repr(self.__target)
+
+    def __str__(self):
+        return str(self.__target)
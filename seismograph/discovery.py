@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+
+"""
+Index of suites, cases and tests in modules.
+Loader is using it for import of modules
+with selected suites only.
+
+Entry of module is valid while mtime and size
+of file are the same. Suites are found by AST of
+module, if it's not possible module is imported
+once and entry is created from its suites. Module which
+is decorating by anything else than register of own suite
+is imported too, cases can be registered in suite of other
+module, so it's unknown which suites are using the module.
+"""
+
+import os
+import ast
+import json
+import logging
+
+from . import loader
+from .utils import pyv
+
+
+logger = logging.getLogger(__name__)
+
+
+INDEX_VERSION = 1
+
+SUITE_CLASS_SUFFIX = 'Suite'
+REGISTER_METHOD_NAME = 'register'
+
+
+def _get_string(node, module_name):
+    if isinstance(node, ast.Name) and node.id == '__name__':
+        return module_name
+
+    try:
+        value = ast.literal_eval(node)
+    except ValueError:
+        return None
+
+    if isinstance(value, pyv.basestring):
+        return value
+
+    return None
+
+
+def _get_call_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+
+    if isinstance(node, ast.Attribute):
+        return node.attr
+
+    return None
+
+
+def _is_suite_call(node):
+    if not isinstance(node, ast.Call):
+        return False
+
+    name = _get_call_name(node.func)
+
+    return bool(name) and name.endswith(SUITE_CLASS_SUFFIX)
+
+
+def _get_suite_name_from_call(node, module_name):
+    if node.args:
+        return _get_string(node.args[0], module_name)
+
+    for keyword in node.keywords:
+        if keyword.arg == 'name':
+            return _get_string(keyword.value, module_name)
+
+    return None
+
+
+def _get_registered_suite(decorator, suite_vars):
+    if isinstance(decorator, ast.Call):
+        decorator = decorator.func
+
+    if isinstance(decorator, ast.Attribute) \
+            and decorator.attr == REGISTER_METHOD_NAME \
+            and isinstance(decorator.value, ast.Name):
+        return suite_vars.get(decorator.value.id)
+
+    return None
+
+
+def _is_literal(node):
+    try:
+        ast.literal_eval(node)
+    except ValueError:
+        return False
+    return True
+
+
+def _is_main_check(node):
+    test = node.test
+
+    return isinstance(test, ast.Compare) \
+        and isinstance(test.left, ast.Name) \
+        and test.left.id == '__name__'
+
+
+def _is_inert(node):
+    """
+    Statement of module which can not create suite.
+    Any other call or statement can do it by factory,
+    loop and etc, so module should be imported.
+    """
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        return True
+
+    if isinstance(node, ast.Expr):
+        # docstring
+        return _is_literal(node.value)
+
+    if isinstance(node, ast.Assign):
+        return _is_literal(node.value) or isinstance(node.value, (ast.Name, ast.Attribute))
+
+    if isinstance(node, ast.If):
+        return _is_main_check(node)
+
+    return False
+
+
+def _get_test_names(node):
+    if isinstance(node, ast.ClassDef):
+        return sorted(
+            n.name for n in node.body
+            if isinstance(n, ast.FunctionDef)
+            and (n.name.startswith(loader.TEST_NAME_PREFIX) or n.name == loader.DEFAULT_TEST_NAME)
+        )
+
+    return [loader.DEFAULT_TEST_NAME]
+
+
+def scan_module(file_path, module_name):
+    """
+    Suites of module by AST.
+    None will be returned if it's not possible
+    to get names of suites without import, module
+    with statements which can create suites or
+    register cases in them too.
+    """
+    with open(file_path, 'rb') as fp:
+        source = fp.read()
+
+    try:
+        tree = ast.parse(source, file_path)
+    except SyntaxError:
+        return None
+
+    suite_vars = {}
+    suites = {}
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and _is_suite_call(node.value):
+            suite_name = _get_suite_name_from_call(node.value, module_name)
+
+            if suite_name is None:
+                return None
+
+            suites.setdefault(suite_name, {})
+
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    suite_vars[target.id] = suite_name
+
+        elif isinstance(node, (ast.ClassDef, ast.FunctionDef)):
+            for decorator in node.decorator_list:
+                suite_name = _get_registered_suite(decorator, suite_vars)
+
+                if suite_name is None:
+                    # suite of other module or decorator
+                    # which can register case by self
+                    return None
+
+                suites[suite_name][node.name] = _get_test_names(node)
+
+        elif not _is_inert(node):
+            return None
+
+    if not suites:
+        # suites can be created by factories or
+        # defined in other way, import is needed
+        return None
+
+    return suites
+
+
+def suites_to_entry(suites):
+    """
+    Entry of index from imported suites
+    """
+    entry = {}
+
+    for suite in suites:
+        entry[suite.name] = dict(
+            (
+                case_class.__name__,
+                list(loader.load_test_names_from_case(case_class)),
+            )
+            for case_class in suite.cases
+        )
+
+    return entry
+
+
+class DiscoveryIndex(object):
+
+    def __init__(self, file_path):
+        self.__file_path = file_path
+        self.__modules = {}
+        self.__changed = False
+
+        if os.path.isfile(file_path):
+            try:
+                with open(file_path) as fp:
+                    data = json.load(fp)
+            except ValueError:
+                logger.warning(
+                    'Discovery index "{}" is broken and will be rewritten'.format(file_path),
+                )
+            else:
+                if data.get('version') == INDEX_VERSION:
+                    self.__modules = data.get('modules', {})
+
+    @staticmethod
+    def __get_stat(file_path):
+        stat = os.stat(file_path)
+        return stat.st_mtime, stat.st_size
+
+    def __make_key(self, file_path):
+        return os.path.abspath(file_path)
+
+    def get(self, file_path, module_name):
+        """
+        Get suites of module as dict of suite name
+        to dict of case class name to test names.
+        None will be returned if module should be imported.
+        """
+        key = self.__make_key(file_path)
+        entry = self.__modules.get(key)
+        mtime, size = self.__get_stat(file_path)
+
+        if entry and entry['mtime'] == mtime and entry['size'] == size and entry['module'] == module_name:
+            return entry['suites']
+
+        suites = scan_module(file_path, module_name)
+
+        if suites is not None:
+            self.__set(key, module_name, mtime, size, suites)
+
+        return suites
+
+    def update(self, file_path, module_name, suites):
+        """
+        Update entry of module from its imported suites
+        """
+        mtime, size = self.__get_stat(file_path)
+        entry = suites_to_entry(suites)
+
+        self.__set(self.__make_key(file_path), module_name, mtime, size, entry)
+
+    def __set(self, key, module_name, mtime, size, suites):
+        current = self.__modules.get(key)
+        entry = {
+            'mtime': mtime,
+            'size': size,
+            'module': module_name,
+            'suites': suites,
+        }
+
+        if current != entry:
+            logger.debug(
+                'Module "{}" was indexed'.format(module_name),
+            )
+            self.__modules[key] = entry
+            self.__changed = True
+
+    def save(self):
+        if not self.__changed:
+            return
+
+        logger.debug(
+            'Save discovery index to "{}"'.format(self.__file_path),
+        )
+
+        tmp_path = '{}.tmp'.format(self.__file_path)
+
+        with open(tmp_path, 'w') as fp:
+            json.dump(
+                {
+                    'version': INDEX_VERSION,
+                    'modules': self.__modules,
+                },
+                fp,
+                indent=2,
+                sort_keys=True,
+            )
+
+        os.rename(tmp_path, self.__file_path)
+
+        self.__changed = False
@@ -39,6 +39,14 @@ class TimeoutException(SeismographError):
     pass
 
 
+class CaseTimeout(TimeoutException):
+    pass
+
+
+class WorkerError(SeismographError):
+    pass
+
+
 class ExtensionNotFound(SeismographError):
     pass
 
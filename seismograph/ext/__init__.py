@@ -1,38 +1,126 @@
 # -*- coding: utf-8 -*-
 
+"""
+Extensions are imported on demand only.
+Extension is loaded if it's required by name or
+its options from command line are used.
+"""
+
 import logging
+from importlib import import_module
+
+from . import options
+from .. import startup
+from .. import extensions
+from ..utils import pyv
 
 
 logger = logging.getLogger(__name__)
 
 
-TO_INIT = []
+def is_importable(module_name):
+    if pyv.IS_PYTHON_2:
+        from pkgutil import find_loader
+        return find_loader(module_name) is not None
+
+    from importlib.util import find_spec
+    return find_spec(module_name) is not None
+
+
+class LazyExtension(object):
+
+    def __init__(self, module_name, names=None, dependencies=None, add_options=None):
+        """
+        :param module_name: name of module in this package
+        :param names: names of extensions which are set by module
+        :param dependencies: top level modules which are needed for import
+        :param add_options: function of options module
+        """
+        self.__module_name = module_name
+        self.__names = tuple(names or tuple())
+        self.__dependencies = tuple(dependencies or tuple())
+        self.__add_options = add_options
+
+        self.__module = None
+        self.__option_dests = tuple()
+
+    def __repr__(self):
+        return '<{}: {}>'.format(self.__class__.__name__, self.__module_name)
+
+    @property
+    def module_name(self):
+        return self.__module_name
+
+    @property
+    def names(self):
+        return self.__names
+
+    @property
+    def is_loaded(self):
+        return self.__module is not None
+
+    def is_available(self):
+        return all(is_importable(d) for d in self.__dependencies)
+
+    def load(self):
+        if self.__module is None:
+            logger.debug('Load extension "{}"'.format(self.__module_name))
+
+            with startup.measure(startup.EXTENSION.format(self.__module_name)):
+                self.__module = import_module(
+                    '{}.{}'.format(__name__, self.__module_name),
+                )
+
+        return self.__module
+
+    def is_used(self, program):
+        if any(n in program.context.require for n in self.__names):
+            return True
+
+        return any(getattr(program.config, d, None) for d in self.__option_dests)
+
+    def __add_options__(self, parser):
+        if self.__add_options:
+            group = self.__add_options(parser)
+            self.__option_dests = tuple(o.dest for o in group.option_list)
+
+    def __install__(self, program):
+        if self.is_used(program):
+            extensions.install(self.load(), program)
+            return
 
+        install = lambda: extensions.install(self.load(), program)
 
-try:
-    from . import mocker
-    TO_INIT.append(mocker)
-except ImportError:
-    pass
+        for name in self.__names:
+            extensions.set(install, name, lazy=True)
 
-try:
-    from . import alchemy
-    TO_INIT.append(alchemy)
-except ImportError:
-    pass
 
-try:
-    from . import selenium
-    TO_INIT.append(selenium)
-except ImportError:
-    pass
+EXTENSIONS = (
+    LazyExtension(
+        'mocker',
+        names=('mocker', ),
+        dependencies=('flask', 'requests'),
+        add_options=options.add_mocker_options,
+    ),
+    LazyExtension(
+        'alchemy',
+        names=('db', ),
+        dependencies=('sqlalchemy', ),
+    ),
+    LazyExtension(
+        'selenium',
+        names=('selenium', ),
+        dependencies=('selenium', ),
+        add_options=options.add_selenium_options,
+    ),
+    LazyExtension(
+        'seisma',
+        add_options=options.add_seisma_options,
+    ),
+)
 
 
-try:
-    from . import seisma
-    TO_INIT.append(seisma)
-except ImportError:
-    raise
+TO_INIT = [e for e in EXTENSIONS if e.is_available()]
 
 
 logger.debug('Available extensions: {}'.format(TO_INIT))
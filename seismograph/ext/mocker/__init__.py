@@ -61,7 +61,6 @@ Need to require mocker where it using
 """
 
 from functools import wraps
-from optparse import OptionGroup
 
 from . import client as _client
 from . import constants as _constants
@@ -139,55 +138,9 @@ def unblock(url_rule, method):
 
 
 def __add_options__(parser):
-    group = OptionGroup(parser, 'MockServer extension options')
+    from ..options import add_mocker_options
 
-    group.add_option(
-        '--mocker-path-to-mocks',
-        dest='MOCKER_PATH_TO_MOCKS',
-        default=None,
-        help='Path to dir within mock files.'
-    )
-    group.add_option(
-        '--mocker-host',
-        dest='MOCKER_HOST',
-        default=None,
-        help='Server host.',
-    )
-    group.add_option(
-        '--mocker-port',
-        dest='MOCKER_PORT',
-        default=None,
-        type=int,
-        help='Server port.',
-    )
-    group.add_option(
-        '--mocker-block-timeout',
-        dest='MOCKER_BLOCK_TIMEOUT',
-        default=None,
-        type=float,
-        help='Timeout to set mock if exist.',
-    )
-    group.add_option(
-        '--mocker-debug',
-        dest='MOCKER_DEBUG',
-        action='store_true',
-        default=False,
-        help='Use debug.',
-    )
-    group.add_option(
-        '--mocker-static-folder',
-        dest='MOCKER_STATIC_FOLDER',
-        default=None,
-        help='Path to dir within mock static files.',
-    )
-    group.add_option(
-        '--mocker-static-path',
-        dest='MOCKER_STATIC_URL_PATH',
-        default=None,
-        help='Path for static files on the web.',
-    )
-
-    parser.add_option_group(group)
+    add_mocker_options(parser)
 
 
 def __install__(program):
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+"""
+Options of extensions. Module has no dependencies,
+so options are available without import of extensions.
+"""
+
+from optparse import OptionGroup
+
+
+def add_mocker_options(parser):
+    group = OptionGroup(parser, 'MockServer extension options')
+
+    group.add_option(
+        '--mocker-path-to-mocks',
+        dest='MOCKER_PATH_TO_MOCKS',
+        default=None,
+        help='Path to dir within mock files.'
+    )
+    group.add_option(
+        '--mocker-host',
+        dest='MOCKER_HOST',
+        default=None,
+        help='Server host.',
+    )
+    group.add_option(
+        '--mocker-port',
+        dest='MOCKER_PORT',
+        default=None,
+        type=int,
+        help='Server port.',
+    )
+    group.add_option(
+        '--mocker-block-timeout',
+        dest='MOCKER_BLOCK_TIMEOUT',
+        default=None,
+        type=float,
+        help='Timeout to set mock if exist.',
+    )
+    group.add_option(
+        '--mocker-debug',
+        dest='MOCKER_DEBUG',
+        action='store_true',
+        default=False,
+        help='Use debug.',
+    )
+    group.add_option(
+        '--mocker-static-folder',
+        dest='MOCKER_STATIC_FOLDER',
+        default=None,
+        help='Path to dir within mock static files.',
+    )
+    group.add_option(
+        '--mocker-static-path',
+        dest='MOCKER_STATIC_URL_PATH',
+        default=None,
+        help='Path for static files on the web.',
+    )
+
+    parser.add_option_group(group)
+
+    return group
+
+
+def add_selenium_options(parser):
+    group = OptionGroup(parser, 'Selenium extension options')
+
+    group.add_option(
+        '--selenium-browser',
+        dest='SELENIUM_BROWSERS',
+        action='append',
+        default=[],
+        help='Browser name for run cases.',
+    )
+    group.add_option(
+        '--selenium-project-url',
+        dest='SELENIUM_PROJECT_URL',
+        default=None,
+        help='Base URL of your project.',
+    )
+    group.add_option(
+        '--selenium-remote',
+        dest='SELENIUM_REMOTE',
+        action='store_true',
+        default=False,
+        help='Use remote server only.'
+    )
+    group.add_option(
+        '--selenium-no-remote',
+        dest='SELENIUM_NO_REMOTE',
+        action='store_true',
+        default=False,
+        help='Use local drivers only.'
+    )
+    group.add_option(
+        '--selenium-polling',
+        dest='SELENIUM_POLLING',
+        type=float,
+        default=None,
+        help='Polling timeout. Float or integer value.',
+    )
+    group.add_option(
+        '--selenium-polling-delay',
+        dest='SELENIUM_POLLING_DELAY',
+        type=float,
+        default=None,
+        help='Polling delay. Float or integer value.',
+    )
+    group.add_option(
+        '--selenium-wait-timeout',
+        dest='SELENIUM_WAIT_TIMEOUT',
+        type=float,
+        default=None,
+        help='Implicitly wait timeout. Float or integer value.',
+    )
+    group.add_option(
+        '--selenium-page-load-timeout',
+        dest='SELENIUM_PAGE_LOAD_TIMEOUT',
+        type=float,
+        default=None,
+        help='Load page timeout. Float or integer value.',
+    )
+    group.add_option(
+        '--selenium-script-timeout',
+        dest='SELENIUM_SCRIPT_TIMEOUT',
+        type=float,
+        default=None,
+        help='Execute script timeout. Float or integer value.',
+    )
+    group.add_option(
+        '--selenium-window-size',
+        dest='SELENIUM_WINDOW_SIZE',
+        default=None,
+        help='Window size. For example: 340x480',
+    )
+
+    parser.add_option_group(group)
+
+    return group
+
+
+def add_seisma_options(parser):
+    group = OptionGroup(parser, 'Seisma extension options')
+
+    group.add_option(
+        '--seisma',
+        dest='SEISMA',
+        action='store_true',
+        default=False,
+        help='Use aggregation analytics to seisma.'
+    )
+    group.add_option(
+        '--seisma-url',
+        dest='SEISMA_URL',
+        default=None,
+        help='Base URL to seisma.',
+    )
+    group.add_option(
+        '--seisma-build-name',
+        dest='SEISMA_BUILD_NAME',
+        default=None,
+        help='Unique build name.',
+    )
+    group.add_option(
+        '--seisma-build-title',
+        dest='SEISMA_BUILD_TITLE',
+        default=None,
+        help='Title of build.',
+    )
+
+    parser.add_option_group(group)
+
+    return group
@@ -1,7 +1,5 @@
 # -*- coding: utf-8 -*-
 
-from optparse import OptionGroup
-
 from .client import SeismaClient
 from .layers import SeismaCaseLayer
 from .layers import SeismaProgramLayer
@@ -15,35 +13,9 @@ __all__ = (
 
 
 def __add_options__(parser):
-    group = OptionGroup(parser, 'Seisma extension options')
-
-    group.add_option(
-        '--seisma',
-        dest='SEISMA',
-        action='store_true',
-        default=False,
-        help='Use aggregation analytics to seisma.'
-    )
-    group.add_option(
-        '--seisma-url',
-        dest='SEISMA_URL',
-        default=None,
-        help='Base URL to seisma.',
-    )
-    group.add_option(
-        '--seisma-build-name',
-        dest='SEISMA_BUILD_NAME',
-        default=None,
-        help='Unique build name.',
-    )
-    group.add_option(
-        '--seisma-build-title',
-        dest='SEISMA_BUILD_TITLE',
-        default=None,
-        help='Title of build.',
-    )
-
-    parser.add_option_group(group)
+    from ..options import add_seisma_options
+
+    add_seisma_options(parser)
 
 
 def __install__(program):
@@ -54,6 +26,7 @@ def __install__(program):
         c.DEFAULT_LAYERS.append(
             SeismaCaseLayer(),
         )
+        c.changed_layers()
         p.DEFAULT_LAYERS.append(
             SeismaProgramLayer(),
         )
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
 from warnings import warn
-from optparse import OptionGroup
 
 from selenium.webdriver.common.keys import Keys as keys
 
@@ -37,78 +36,9 @@ CONFIG_KEY = 'SELENIUM_EX'
 
 
 def __add_options__(parser):
-    group = OptionGroup(parser, 'Selenium extension options')
-
-    group.add_option(
-        '--selenium-browser',
-        dest='SELENIUM_BROWSERS',
-        action='append',
-        default=[],
-        help='Browser name for run cases.',
-    )
-    group.add_option(
-        '--selenium-project-url',
-        dest='SELENIUM_PROJECT_URL',
-        default=None,
-        help='Base URL of your project.',
-    )
-    group.add_option(
-        '--selenium-remote',
-        dest='SELENIUM_REMOTE',
-        action='store_true',
-        default=False,
-        help='Use remote server only.'
-    )
-    group.add_option(
-        '--selenium-no-remote',
-        dest='SELENIUM_NO_REMOTE',
-        action='store_true',
-        default=False,
-        help='Use local drivers only.'
-    )
-    group.add_option(
-        '--selenium-polling',
-        dest='SELENIUM_POLLING',
-        type=float,
-        default=None,
-        help='Polling timeout. Float or integer value.',
-    )
-    group.add_option(
-        '--selenium-polling-delay',
-        dest='SELENIUM_POLLING_DELAY',
-        type=float,
-        default=None,
-        help='Polling delay. Float or integer value.',
-    )
-    group.add_option(
-        '--selenium-wait-timeout',
-        dest='SELENIUM_WAIT_TIMEOUT',
-        type=float,
-        default=None,
-        help='Implicitly wait timeout. Float or integer value.',
-    )
-    group.add_option(
-        '--selenium-page-load-timeout',
-        dest='SELENIUM_PAGE_LOAD_TIMEOUT',
-        type=float,
-        default=None,
-        help='Load page timeout. Float or integer value.',
-    )
-    group.add_option(
-        '--selenium-script-timeout',
-        dest='SELENIUM_SCRIPT_TIMEOUT',
-        type=float,
-        default=None,
-        help='Execute script timeout. Float or integer value.',
-    )
-    group.add_option(
-        '--selenium-window-size',
-        dest='SELENIUM_WINDOW_SIZE',
-        default=None,
-        help='Window size. For example: 340x480',
-    )
+    from ..options import add_selenium_options
 
-    parser.add_option_group(group)
+    add_selenium_options(parser)
 
 
 def __install__(program):
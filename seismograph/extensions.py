@@ -1,13 +1,89 @@
 # -*- coding: utf-8 -*-
 
+import os
+import logging
+from copy import copy as _copy
 from copy import deepcopy
+from threading import Condition
+from timeit import default_timer
 
 from .exceptions import ExtensionNotFound
+from .datastructures import CopyOnWriteProxy
+
+
+logger = logging.getLogger(__name__)
 
 
 _TMP = {}
 _WAS_CLEAR = False
 
+# acquire of several pools is waiting
+# for release of any of them
+_RELEASED = Condition()
+_releases = 0
+
+
+# Scopes of pooled extensions. Instance is held by
+# owner of scope and it's shared by all users of scope.
+SCOPE_CASE = 'case'
+SCOPE_SUITE = 'suite'
+SCOPE_WORKER = 'worker'
+SCOPE_PROGRAM = 'program'
+
+SCOPES = (
+    SCOPE_CASE,
+    SCOPE_SUITE,
+    SCOPE_WORKER,
+    SCOPE_PROGRAM,
+)
+
+# owner of wider level can not take instance of narrower
+# scope from pool, its users are waiting for the same places
+_SCOPE_LEVELS = {
+    SCOPE_CASE: 0,
+    SCOPE_SUITE: 1,
+    SCOPE_WORKER: 2,
+    SCOPE_PROGRAM: 2,
+}
+
+# returned by acquire which should not wait
+NOT_ACQUIRED = object()
+
+
+# Policies of copying shared data on getting.
+COPY_DEEP = 'deep'
+COPY_SHALLOW = 'shallow'
+COPY_NONE = 'none'
+# read only proxy, data is copied on first write
+COPY_FROZEN = 'frozen'
+
+COPY_POLICIES = (
+    COPY_DEEP,
+    COPY_SHALLOW,
+    COPY_NONE,
+    COPY_FROZEN,
+)
+
+DEFAULT_COPY = COPY_DEEP
+
+
+def copy_data(data, policy):
+    if policy == COPY_DEEP:
+        return deepcopy(data)
+
+    if policy == COPY_SHALLOW:
+        return _copy(data)
+
+    if policy == COPY_FROZEN:
+        return CopyOnWriteProxy(data)
+
+    if policy == COPY_NONE:
+        return data
+
+    raise ValueError(
+        'Unknown copy policy "{}". Allowed: {}'.format(policy, ', '.join(COPY_POLICIES)),
+    )
+
 
 def install(ext, program):
     if getattr(ext, '__install__', None):
@@ -57,9 +133,295 @@ class SingletonExtensionContainer(ExtensionContainer):
         return self.__instance
 
 
-def get(name):
+class DataContainer(ExtensionContainer):
+    """
+    Shared data with own copy policy
+    """
+
+    def __init__(self, data, copy=COPY_DEEP):
+        if copy not in COPY_POLICIES:
+            raise ValueError(
+                'Unknown copy policy "{}". Allowed: {}'.format(copy, ', '.join(COPY_POLICIES)),
+            )
+
+        super(DataContainer, self).__init__(data)
+
+        self.__copy = copy
+
+    def __call__(self):
+        return copy_data(self.ext, self.__copy)
+
+    @property
+    def copy(self):
+        return self.__copy
+
+
+class LazyExtensionContainer(ExtensionContainer):
+    """
+    Extension is installed on first usage.
+    Installation should replace this container.
+    """
+
+    def __init__(self, name, install):
+        super(LazyExtensionContainer, self).__init__(install)
+
+        self.__name = name
+
+    def __call__(self):
+        self.ext()
+
+        if isinstance(_TMP.get(self.__name), LazyExtensionContainer):
+            raise ExtensionNotFound(self.__name)
+
+        return get(self.__name)
+
+
+class PooledExtensionContainer(ExtensionContainer):
+    """
+    Bounded pool of instances of extension.
+    Instance is acquired by key of scope and
+    it's returned to pool when the last holder
+    of the key has released it.
+
+    :param scope: which owners are sharing instance
+    :param max_size: acquire is waiting for release
+      if all instances are held, unlimited by default
+    :param idle_timeout: idle instances are closed after it
+    :param check: function which gets instance and returns bool,
+      unhealthy instance is closed and replaced on acquire
+    :param close: function which gets instance for closing it
+    """
+
+    def __init__(self,
+                 ext,
+                 args=None,
+                 kwargs=None,
+                 scope=SCOPE_CASE,
+                 max_size=None,
+                 idle_timeout=None,
+                 check=None,
+                 close=None):
+        if scope not in SCOPES:
+            raise ValueError(
+                'Unknown scope "{}". Allowed: {}'.format(scope, ', '.join(SCOPES)),
+            )
+
+        super(PooledExtensionContainer, self).__init__(ext, args=args, kwargs=kwargs)
+
+        self.__scope = scope
+        self.__max_size = max_size
+        self.__idle_timeout = idle_timeout
+        self.__check = check
+        self.__close = close
+
+        self.__size = 0
+        self.__idle = []
+        self.__held = {}
+        self.__pids = {}
+        self.__condition = Condition()
+
+    def __call__(self):
+        """
+        Instance for using outside of scopes,
+        it's held until shutdown.
+        """
+        return self.acquire(None)
+
+    @property
+    def scope(self):
+        return self.__scope
+
+    @property
+    def size(self):
+        return self.__size
+
+    def get_key(self, owner, suite_name=None):
+        if self.__scope == SCOPE_CASE:
+            return SCOPE_CASE, id(owner)
+
+        if self.__scope == SCOPE_SUITE:
+            return SCOPE_SUITE, suite_name
+
+        if self.__scope == SCOPE_WORKER:
+            return SCOPE_WORKER, os.getpid()
+
+        return SCOPE_PROGRAM, None
+
+    def __is_healthy(self, instance):
+        if self.__check is None:
+            return True
+
+        try:
+            return bool(self.__check(instance))
+        except BaseException:
+            logger.warning('Health check of extension was failed', exc_info=True)
+            return False
+
+    def __close_instances(self, instances):
+        for instance in instances:
+            # instance of parent process is
+            # not closed from forked worker
+            if self.__pids.pop(id(instance), None) != os.getpid():
+                continue
+
+            self.close(instance)
+
+    def __evict(self):
+        """
+        Should be called under lock.
+        Evicted instances are returned for closing.
+        """
+        if not self.__idle_timeout:
+            return []
+
+        now = default_timer()
+        evicted = [i for i, t in self.__idle if now - t > self.__idle_timeout]
+
+        if evicted:
+            self.__idle = [(i, t) for i, t in self.__idle if now - t <= self.__idle_timeout]
+            self.__size -= len(evicted)
+
+        return evicted
+
+    def __take(self, blocking):
+        """
+        Should be called under lock.
+        Idle instance or None will be returned,
+        place in pool is reserved in second case.
+        NOT_ACQUIRED is returned instead of waiting
+        if it's not blocking.
+        """
+        while True:
+            if self.__idle:
+                instance, _ = self.__idle.pop()
+                return instance
+
+            if not self.__max_size or self.__size < self.__max_size:
+                self.__size += 1
+                return None
+
+            if not blocking:
+                return NOT_ACQUIRED
+
+            self.__condition.wait()
+
+    def __discard(self):
+        with self.__condition:
+            self.__size -= 1
+            self.__condition.notify()
+
+        _notify_released()
+
+    def is_owned_by(self, level):
+        """
+        Owner of level is sharing instance with users of scope.
+        Owner of wider level gets own instance out of pool.
+        """
+        return _SCOPE_LEVELS[self.__scope] >= _SCOPE_LEVELS[level]
+
+    def create(self):
+        """
+        Instance out of pool, size of pool is not counted
+        """
+        return super(PooledExtensionContainer, self).__call__()
+
+    def close(self, instance):
+        if self.__close is not None:
+            try:
+                self.__close(instance)
+            except BaseException:
+                logger.warning('Extension can not be closed', exc_info=True)
+
+    def acquire(self, key, blocking=True):
+        while True:
+            with self.__condition:
+                held = self.__held.get(key)
+
+                if held is not None:
+                    held[1] += 1
+                    return held[0]
+
+                evicted = self.__evict()
+                instance = self.__take(blocking)
+
+            self.__close_instances(evicted)
+
+            if instance is NOT_ACQUIRED:
+                return instance
+
+            if instance is None:
+                try:
+                    instance = super(PooledExtensionContainer, self).__call__()
+                except BaseException:
+                    self.__discard()
+                    raise
+
+                self.__pids[id(instance)] = os.getpid()
+            elif not self.__is_healthy(instance):
+                self.__close_instances([instance])
+                self.__discard()
+                continue
+
+            with self.__condition:
+                held = self.__held.get(key)
+
+                # was acquired by other thread while
+                # instance was creating or checking
+                if held is not None:
+                    held[1] += 1
+                    self.__idle.append((instance, default_timer()))
+                    self.__condition.notify()
+                    return held[0]
+
+                self.__held[key] = [instance, 1]
+
+            return instance
+
+    def release(self, key):
+        with self.__condition:
+            held = self.__held.get(key)
+
+            if held is None:
+                return
+
+            held[1] -= 1
+
+            if held[1] > 0:
+                return
+
+            del self.__held[key]
+            self.__idle.append((held[0], default_timer()))
+            evicted = self.__evict()
+            self.__condition.notify()
+
+        _notify_released()
+        self.__close_instances(evicted)
+
+    def shutdown(self):
+        with self.__condition:
+            instances = [i for i, _ in self.__idle]
+            instances.extend(i for i, _ in self.__held.values())
+
+            self.__idle = []
+            self.__held = {}
+            self.__size = 0
+            self.__condition.notify_all()
+
+        _notify_released()
+        self.__close_instances(instances)
+
+
+def _notify_released():
+    global _releases
+
+    with _RELEASED:
+        _releases += 1
+        _RELEASED.notify_all()
+
+
+def _get_container(name):
     try:
-        container = _TMP[name]
+        return _TMP[name]
     except KeyError:
         if _WAS_CLEAR:
             raise RuntimeError(
@@ -67,15 +429,148 @@ def get(name):
             )
         raise ExtensionNotFound(name)
 
+
+def is_pooled(name):
+    container = _get_container(name)
+
+    if isinstance(container, LazyExtensionContainer):
+        # extension is installed here, so
+        # it can be pooled after that
+        container.ext()
+        container = _get_container(name)
+
+    return isinstance(container, PooledExtensionContainer)
+
+
+def _try_acquire(names, storage, owner, suite_name, level):
+    """
+    All or nothing, acquired instances are
+    released if any of pools is exhausted
+    """
+    acquired = []
+
+    for name in names:
+        if name in storage:
+            continue
+
+        container = _get_container(name)
+
+        if not container.is_owned_by(level):
+            storage[name] = container.create()
+            continue
+
+        instance = container.acquire(
+            container.get_key(owner, suite_name=suite_name), blocking=False,
+        )
+
+        if instance is NOT_ACQUIRED:
+            release(acquired, storage, owner, suite_name=suite_name, level=level)
+            return False
+
+        storage[name] = instance
+        acquired.append(name)
+
+    return True
+
+
+def acquire(names, storage, owner, suite_name=None, level=SCOPE_CASE, blocking=True):
+    """
+    Acquire pooled extensions to storage
+    of context for owner of context.
+    Extensions are taken all together, so owners
+    which are requiring the same pools in other
+    order are not waiting for each other forever.
+    If it's not blocking, False is returned when
+    any of pools is exhausted.
+    """
+    while True:
+        with _RELEASED:
+            releases = _releases
+
+        if _try_acquire(names, storage, owner, suite_name, level):
+            return True
+
+        if not blocking:
+            return False
+
+        with _RELEASED:
+            while releases == _releases:
+                _RELEASED.wait()
+
+
+def release(names, storage, owner, suite_name=None, level=SCOPE_CASE):
+    for name in names:
+        if name not in storage:
+            continue
+
+        instance = storage.pop(name)
+        container = _TMP.get(name)
+
+        if not isinstance(container, PooledExtensionContainer):
+            continue
+
+        if container.is_owned_by(level):
+            container.release(
+                container.get_key(owner, suite_name=suite_name),
+            )
+        else:
+            container.close(instance)
+
+
+def shutdown():
+    """
+    Close instances of all pools
+    """
+    for container in list(_TMP.values()):
+        if isinstance(container, PooledExtensionContainer):
+            container.shutdown()
+
+
+def get(name):
+    container = _get_container(name)
+
     if isinstance(container, ExtensionContainer):
         return container()
 
-    return deepcopy(container)
+    return copy_data(container, DEFAULT_COPY)
 
 
-def set(ext, name, is_data=False, singleton=False, args=None, kwargs=None):
+def set(ext,
+        name,
+        is_data=False,
+        singleton=False,
+        args=None,
+        kwargs=None,
+        lazy=False,
+        copy=None,
+        scope=None,
+        pool_size=None,
+        idle_timeout=None,
+        check=None,
+        close=None):
+    """
+    :param copy: copy policy of shared data, DEFAULT_COPY is used if it's not given
+    :param scope: extension is pooled if scope or pool_size is given,
+      see PooledExtensionContainer for other params of pool
+    """
     if is_data:
-        _TMP[name] = ext
+        if copy is None:
+            _TMP[name] = ext
+        else:
+            _TMP[name] = DataContainer(ext, copy=copy)
+    elif lazy:
+        _TMP[name] = LazyExtensionContainer(name, ext)
+    elif scope or pool_size:
+        _TMP[name] = PooledExtensionContainer(
+            ext,
+            args=args,
+            kwargs=kwargs,
+            scope=scope or SCOPE_CASE,
+            max_size=pool_size,
+            idle_timeout=idle_timeout,
+            check=check,
+            close=close,
+        )
     else:
         if singleton:
             _TMP[name] = SingletonExtensionContainer(
@@ -90,5 +585,7 @@ def set(ext, name, is_data=False, singleton=False, args=None, kwargs=None):
 def clear():
     global _WAS_CLEAR
 
+    shutdown()
+
     _TMP.clear()
     _WAS_CLEAR = True
@@ -20,3 +20,16 @@ def get_pool_size_of_value(value, in_two=False):
         return int(round(size / 2)) or 2
 
     return size
+
+
+def get_schedule(objects, config):
+    """
+    Order of runnable objects for async groups.
+    The longest are going first if runtime history is enabled.
+    """
+    if config.RUNTIME_HISTORY:
+        from ..history import sort_by_runtime
+
+        return sort_by_runtime(objects, config.RUNTIME_HISTORY)
+
+    return objects
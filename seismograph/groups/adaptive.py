@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+
+"""
+Adaptive number of active workers.
+Controller is sampling utilization of cpu, memory of program with its
+worker processes and latency of cases. It moves limit of threading
+executor and of multiprocessing pools step by step between one and
+maximum of them. Memory ceiling is shrinking them fast.
+
+psutil is used if it's installed, otherwise /proc and load average.
+"""
+
+from __future__ import absolute_import
+
+import os
+import logging
+import threading
+from multiprocessing import cpu_count
+
+
+logger = logging.getLogger(__name__)
+
+
+MIN_LIMIT = 1
+
+# cpu utilization
+LOW_CPU = 0.7
+HIGH_CPU = 0.95
+
+# growth is stopped near to memory ceiling
+MEMORY_HEADROOM = 0.9
+# or if system has less available memory
+LOW_AVAILABLE_MEMORY = 0.05
+
+# latency of cases is degraded if it's
+# slower than the best one by this factor
+LATENCY_FACTOR = 1.5
+
+# threads are limited by controller,
+# they can be more than cpu
+THREADS_PER_CPU = 4
+
+
+_controller = None
+
+
+def import_psutil():
+    try:
+        import psutil
+        return psutil
+    except ImportError:
+        return None
+
+
+def read_proc_file(path):
+    try:
+        with open(path) as fp:
+            return fp.read()
+    except (IOError, OSError):
+        return None
+
+
+class SystemProbe(object):
+    """
+    Utilization of cpu and memory.
+    Values are None if they can not be taken.
+    """
+
+    def __init__(self):
+        self.__psutil = import_psutil()
+        self.__cpu_times = None
+
+        if self.__psutil is not None:
+            # first call is starting measurement
+            self.__psutil.cpu_percent(None)
+
+    def get_cpu_utilization(self):
+        if self.__psutil is not None:
+            return self.__psutil.cpu_percent(None) / 100.0
+
+        stat = read_proc_file('/proc/stat')
+
+        if stat is not None:
+            # user nice system idle iowait irq softirq steal
+            values = [int(v) for v in stat.splitlines()[0].split()[1:9]]
+            total, idle = sum(values), values[3] + values[4]
+            previous, self.__cpu_times = self.__cpu_times, (total, idle)
+
+            if previous is None or total == previous[0]:
+                return None
+
+            return 1.0 - float(idle - previous[1]) / (total - previous[0])
+
+        if hasattr(os, 'getloadavg'):
+            return min(os.getloadavg()[0] / cpu_count(), 1.0)
+
+        return None
+
+    def get_memory_usage(self, pid=None):
+        """
+        RSS of process with its children in bytes
+        """
+        pid = pid or os.getpid()
+
+        if self.__psutil is not None:
+            try:
+                process = self.__psutil.Process(pid)
+                processes = [process] + process.children(recursive=True)
+                return sum(p.memory_info().rss for p in processes)
+            except self.__psutil.Error:
+                return None
+
+        if not os.path.isdir('/proc'):
+            return None
+
+        pids = [pid] + self.get_children(pid)
+
+        return sum(self.get_rss(p) for p in pids)
+
+    @staticmethod
+    def get_rss(pid):
+        status = read_proc_file('/proc/{}/status'.format(pid)) or ''
+
+        for line in status.splitlines():
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) * 1024
+
+        return 0
+
+    @staticmethod
+    def get_children(pid):
+        parents = {}
+
+        for name in os.listdir('/proc'):
+            if not name.isdigit():
+                continue
+
+            stat = read_proc_file('/proc/{}/stat'.format(name))
+
+            if stat:
+                # name of process is in brackets and can have spaces
+                parents[int(name)] = int(stat.rsplit(')', 1)[1].split()[1])
+
+        children, stack = [], [pid]
+
+        while stack:
+            parent = stack.pop()
+
+            for child, ppid in parents.items():
+                if ppid == parent:
+                    children.append(child)
+                    stack.append(child)
+
+        return children
+
+    def get_available_memory(self):
+        """
+        Fraction of available memory of system
+        """
+        if self.__psutil is not None:
+            memory = self.__psutil.virtual_memory()
+            return float(memory.available) / memory.total
+
+        meminfo = read_proc_file('/proc/meminfo')
+
+        if meminfo is None:
+            return None
+
+        values = {}
+
+        for line in meminfo.splitlines():
+            name, _, value = line.partition(':')
+            values[name] = int(value.split()[0])
+
+        if 'MemAvailable' not in values:
+            return None
+
+        return float(values['MemAvailable']) / values['MemTotal']
+
+
+class Controller(threading.Thread):
+    """
+    Limit of workers is increased while cpu is not busy
+    and decreased if cpu is overloaded or memory is over
+    ceiling. Without adjusting by load it's restored after
+    shrinking by memory. Targets are objects with set_limit method.
+    """
+
+    def __init__(self, maximum, memory_limit=None, interval=1.0, by_load=True, probe=None):
+        super(Controller, self).__init__(name='seismograph adaptive controller')
+
+        self.daemon = True
+
+        self.maximum = max(maximum, MIN_LIMIT)
+        self.memory_limit = memory_limit
+        self.interval = interval
+        self.by_load = by_load
+        self.limit = min(self.maximum, cpu_count())
+
+        self.__probe = probe or SystemProbe()
+        self.__targets = []
+        self.__latencies = []
+        self.__best_latency = None
+        self.__stopped = threading.Event()
+
+    def add_target(self, target):
+        self.__targets.append(target)
+        target.set_limit(self.limit)
+
+    def remove_target(self, target):
+        if target in self.__targets:
+            self.__targets.remove(target)
+
+    def observe(self, runtime):
+        # append of list is thread safe
+        self.__latencies.append(runtime)
+
+    def pop_latency(self):
+        latencies, self.__latencies = self.__latencies, []
+
+        if not latencies:
+            return None
+
+        return sum(latencies) / len(latencies)
+
+    def is_latency_degraded(self, latency):
+        if latency is None:
+            return False
+
+        if self.__best_latency is None or latency < self.__best_latency:
+            self.__best_latency = latency
+            return False
+
+        return latency > self.__best_latency * LATENCY_FACTOR
+
+    def decide(self, cpu, memory, available, latency):
+        limit = self.limit
+        can_grow = True
+
+        if self.memory_limit and memory is not None:
+            if memory >= self.memory_limit:
+                return max(MIN_LIMIT, limit // 2)
+
+            per_worker = float(memory) / limit
+            can_grow = memory + per_worker <= self.memory_limit * MEMORY_HEADROOM
+
+        if available is not None and available < LOW_AVAILABLE_MEMORY:
+            return max(MIN_LIMIT, limit - 1)
+
+        # memory ceiling only
+        if not self.by_load:
+            return min(self.maximum, limit + 1) if can_grow else limit
+
+        if cpu is not None and cpu >= HIGH_CPU:
+            return max(MIN_LIMIT, limit - 1)
+
+        if self.is_latency_degraded(latency):
+            return limit
+
+        if can_grow and cpu is not None and cpu < LOW_CPU:
+            return min(self.maximum, limit + 1)
+
+        return limit
+
+    def tick(self):
+        cpu = self.__probe.get_cpu_utilization()
+        memory = self.__probe.get_memory_usage() if self.memory_limit else None
+        available = self.__probe.get_available_memory()
+        latency = self.pop_latency()
+
+        limit = self.decide(cpu, memory, available, latency)
+
+        if limit != self.limit:
+            logger.debug(
+                'Limit of workers {} -> {} (cpu={}, memory={}, available={}, latency={})'.format(
+                    self.limit, limit, cpu, memory, available, latency,
+                ),
+            )
+
+            self.limit = limit
+
+            for target in list(self.__targets):
+                target.set_limit(limit)
+
+    def run(self):
+        while not self.__stopped.wait(self.interval):
+            try:
+                self.tick()
+            except BaseException:
+                logger.warning('Adaptive controller was failed on tick', exc_info=True)
+
+    def stop(self):
+        self.__stopped.set()
+
+
+def get_controller():
+    """
+    Controller is living in main process only
+    """
+    if _controller is not None and _controller[0] == os.getpid():
+        return _controller[1]
+    return None
+
+
+def is_enabled():
+    return get_controller() is not None
+
+
+def get_max_threads(config):
+    """
+    Quotas of groups which are given by config
+    are not cut by global limit by default
+    """
+    if config.MAX_THREADS > 0:
+        return config.MAX_THREADS
+
+    if config.ADAPTIVE:
+        return cpu_count() * THREADS_PER_CPU
+
+    from ..groups import get_pool_size_of_value
+
+    return get_pool_size_of_value(config.ASYNC_SUITES) \
+        * get_pool_size_of_value(config.ASYNC_TESTS, in_two=True)
+
+
+def start(config):
+    global _controller
+
+    memory_limit = None
+
+    if config.MEMORY_LIMIT:
+        memory_limit = int(config.MEMORY_LIMIT * 1024 * 1024)
+
+    controller = Controller(
+        get_max_threads(config),
+        memory_limit=memory_limit,
+        interval=config.ADAPTIVE_INTERVAL,
+        by_load=config.ADAPTIVE,
+    )
+    controller.start()
+
+    _controller = (os.getpid(), controller)
+
+    return controller
+
+
+def stop():
+    global _controller
+
+    controller = get_controller()
+
+    if controller is not None:
+        controller.stop()
+
+    _controller = None
+
+
+def register(target):
+    controller = get_controller()
+
+    if controller is not None:
+        controller.add_target(target)
+
+
+def unregister(target):
+    controller = get_controller()
+
+    if controller is not None:
+        controller.remove_target(target)
+
+
+def observe(runtime):
+    controller = get_controller()
+
+    if controller is not None:
+        controller.observe(runtime)
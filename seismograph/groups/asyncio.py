@@ -0,0 +1,600 @@
+# -*- coding: utf-8 -*-
+
+"""
+Groups for run of coroutine cases on one event loop.
+Allow for python 3 only, module is imported on demand.
+"""
+
+from __future__ import absolute_import
+
+import asyncio
+import logging
+import weakref
+import traceback
+import contextlib
+
+from .. import case as _case
+from .. import tracer
+from .. import metrics
+from .. import benchmark
+from .. import runnable
+from .. import watchdog
+from .. import resources
+from ..utils import pyv
+from ..exceptions import CaseTimeout
+from ..groups import get_schedule
+from ..utils.common import measure_time
+from ..groups import get_pool_size_of_value
+from ..exceptions import ALLOW_RAISED_EXCEPTIONS
+
+
+logger = logging.getLogger(__name__)
+
+
+async def maybe_await(value):
+    if hasattr(value, '__await__'):
+        return await value
+    return value
+
+
+async def call_to_chain(chain, method_name, *args, **kwargs):
+    for obj in chain:
+        if method_name:
+            await maybe_await(getattr(obj, method_name)(*args, **kwargs))
+        else:
+            await maybe_await(obj(*args, **kwargs))
+
+
+async def call_layers(layers, runnable_object, hook_name, *args):
+    object_metrics = metrics.of(runnable_object)
+
+    if object_metrics is metrics.NULL and not tracer.is_enabled():
+        for layer in layers:
+            await maybe_await(getattr(layer, hook_name)(*args))
+        return
+
+    for layer in layers:
+        with object_metrics.measure(metrics.LAYER, layer.__class__.__name__, hook_name):
+            with tracer.span('{}.{}', tracer.HOOK, layer.__class__.__name__, hook_name):
+                await maybe_await(getattr(layer, hook_name)(*args))
+
+
+async def call_hook(layers, runnable_object, hook_name, *args):
+    try:
+        await call_layers(layers, runnable_object, hook_name, *args)
+    except BaseException:
+        runnable.stopped_on(runnable_object, hook_name)
+        raise
+
+
+async def gather(coroutines):
+    """
+    Wait for all coroutines and raise the first
+    exception after that. Running cases of the
+    same suite are not interrupted by error of neighbor.
+    """
+    results = await asyncio.gather(*coroutines, return_exceptions=True)
+
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+# loop -> name -> condition which is notified on release
+_release_conditions = weakref.WeakKeyDictionary()
+
+RESOURCES = 'resources'
+EXTENSIONS = 'extensions'
+
+
+def get_release_condition(name):
+    loop = asyncio.get_event_loop()
+    conditions = _release_conditions.setdefault(loop, {})
+
+    if name not in conditions:
+        conditions[name] = asyncio.Condition()
+
+    return conditions[name]
+
+
+async def notify_release(name):
+    condition = get_release_condition(name)
+
+    async with condition:
+        condition.notify_all()
+
+
+async def bounded(semaphore, coroutine, lock=None):
+    """
+    Slot of semaphore and resources are taken together,
+    so waiting coroutine is holding neither of them.
+    Released slot is notified for coroutines with resources.
+    """
+    if lock is None:
+        try:
+            async with semaphore:
+                return await coroutine
+        finally:
+            await notify_release(RESOURCES)
+
+    condition = get_release_condition(RESOURCES)
+
+    async with condition:
+        await condition.wait_for(
+            lambda: not semaphore.locked() and lock.try_acquire(),
+        )
+        # slot is free, it's taken without waiting
+        await semaphore.acquire()
+
+    try:
+        return await coroutine
+    finally:
+        semaphore.release()
+        lock.release()
+        await notify_release(RESOURCES)
+
+
+def get_coroutine(task):
+    get_coro = getattr(task, 'get_coro', None)
+
+    if get_coro is not None:
+        return get_coro()
+
+    return getattr(task, '_coro', None)  # python < 3.8
+
+
+def format_coroutine_stack(coroutine):
+    """
+    Stack of awaiting chain of suspended coroutine
+    """
+    frames = []
+
+    while coroutine is not None:
+        frame = getattr(coroutine, 'cr_frame', None) or getattr(coroutine, 'gi_frame', None)
+
+        if frame is not None:
+            frames.append((frame, frame.f_lineno))
+
+        coroutine = getattr(coroutine, 'cr_await', None) or getattr(coroutine, 'gi_yieldfrom', None)
+
+    return ''.join(traceback.StackSummary.extract(frames).format())
+
+
+class AsyncGuard(object):
+    """
+    Timeout of coroutine case. Task of case is cancelled
+    and cancellation is replaced by timeout of case.
+    Guard is covering context and test method as sync guard.
+    Case which is blocking the loop can not be interrupted.
+    """
+
+    def __init__(self, case, seconds):
+        self.__case = case
+        self.__seconds = seconds
+
+        self.__task = None
+        self.__handle = None
+        self.__message = None
+
+    async def __aenter__(self):
+        current_task = getattr(asyncio, 'current_task', None) or asyncio.Task.current_task
+        self.__task = current_task()
+        self.__handle = asyncio.get_event_loop().call_later(self.__seconds, self.__fire)
+
+        listener = watchdog.get_listener()
+
+        if listener is not None:
+            listener.on_case_started(self.__case, self.__seconds)
+
+    def __fire(self):
+        self.__message = watchdog.get_message(
+            self.__case, self.__seconds, format_coroutine_stack(get_coroutine(self.__task)),
+        )
+        self.__task.cancel()
+
+    async def __aexit__(self, exc_type, exc_value, tb):
+        self.__handle.cancel()
+
+        listener = watchdog.get_listener()
+
+        if listener is not None:
+            listener.on_case_stopped(self.__case)
+
+        if exc_type is asyncio.CancelledError:
+            self.__raise_timeout()
+
+    def __raise_timeout(self):
+        if self.__message is None:
+            return
+
+        message, self.__message = self.__message, None
+
+        if hasattr(self.__task, 'uncancel'):
+            self.__task.uncancel()
+
+        raise CaseTimeout(message) from None
+
+    @contextlib.contextmanager
+    def interrupts(self):
+        """
+        Timeout in test method is raised there
+        to be recorded as error of test method
+        """
+        try:
+            yield
+        except asyncio.CancelledError:
+            self.__raise_timeout()
+            raise
+
+
+def async_guard(case):
+    seconds = watchdog.get_timeout(case)
+
+    if not seconds:
+        return NullAsyncGuard()
+
+    return AsyncGuard(case, seconds)
+
+
+class NullAsyncGuard(object):
+
+    async def __aenter__(self):
+        pass
+
+    async def __aexit__(self, *args, **kwargs):
+        pass
+
+    @contextlib.contextmanager
+    def interrupts(self):
+        yield
+
+
+class AsyncContext(object):
+    """
+    Same as ContextOfRunnableObject,
+    but setup, teardown and layers are awaited.
+    """
+
+    def __init__(self, context, runnable_object):
+        self.__context = context
+        self.__runnable_object = runnable_object
+
+    def __try_acquire_extensions(self):
+        if self.__context.acquire_extensions(self.__runnable_object, blocking=False):
+            return True
+
+        # nothing is held while waiting
+        self.__context.release_extensions(self.__runnable_object)
+        return False
+
+    async def __acquire_extensions(self):
+        """
+        Pool of extensions is not waited on the loop,
+        acquire is repeated when extensions are released
+        """
+        if self.__try_acquire_extensions():
+            return
+
+        condition = get_release_condition(EXTENSIONS)
+
+        async with condition:
+            await condition.wait_for(self.__try_acquire_extensions)
+
+    async def __release_extensions(self):
+        self.__context.release_extensions(self.__runnable_object)
+        await notify_release(EXTENSIONS)
+
+    async def __aenter__(self):
+        try:
+            await self.__acquire_extensions()
+        except BaseException:
+            await self.__release_extensions()
+            raise
+
+        try:
+            await call_layers(
+                self.__context.layers_of_hook(self.__runnable_object, 'on_setup'),
+                self.__runnable_object,
+                'on_setup',
+                self.__runnable_object,
+            )
+            with metrics.of(self.__runnable_object).measure(metrics.SETUP):
+                await call_to_chain(self.__context.setup_callbacks, None)
+        except BaseException:
+            runnable.stopped_on(self.__runnable_object, 'start_context')
+            await self.__release_extensions()
+            raise
+
+    async def __aexit__(self, *args, **kwargs):
+        if runnable.stopped_on(self.__runnable_object) == 'start_context':
+            return
+
+        try:
+            await call_layers(
+                self.__context.layers_of_hook(self.__runnable_object, 'on_teardown'),
+                self.__runnable_object,
+                'on_teardown',
+                self.__runnable_object,
+            )
+            with metrics.of(self.__runnable_object).measure(metrics.TEARDOWN):
+                await call_to_chain(self.__context.teardown_callbacks, None)
+        except BaseException:
+            runnable.stopped_on(self.__runnable_object, 'stop_context')
+            raise
+        finally:
+            await self.__release_extensions()
+
+
+async def apply_outcome(layers, case, outcome):
+    for hook_name, args in outcome.hooks:
+        await call_hook(layers(hook_name), case, hook_name, *args)
+
+    outcome.record()
+
+
+async def run_case(case, result):
+    case._set_run_state()
+    timer = measure_time()
+
+    if result.current_state.should_stop:
+        return
+
+    case._start_metrics()
+    layers = lambda hook_name: case.context.layers_of_hook(case, hook_name)
+
+    with result.proxy() as result_proxy:
+        result_proxy.start(case)
+
+        outcome = case._get_early_outcome(result_proxy, timer)
+
+        if outcome is not None:
+            await apply_outcome(layers, case, outcome)
+            return
+
+        case._set_run_state(log=result_proxy.console.child_console())
+
+        try:
+            await call_hook(layers('on_run'), case, 'on_run', case)
+
+            was_success = True
+
+            for _ in iter(_case.repeat(case)):
+                guard = async_guard(case)
+
+                async with guard, AsyncContext(case.context, case):
+                    try:
+                        test_method = _case.prepare(
+                            case, getattr(case, runnable.method_name(case)),
+                        )
+                        with guard.interrupts(), case._metrics.measure(metrics.TEST):
+                            for _ in iter(benchmark.repeat(case)):
+                                for _ in iter(_case.repeat_method(case)):
+                                    await maybe_await(test_method())
+                    except ALLOW_RAISED_EXCEPTIONS:
+                        result_proxy.current_state.should_stop = True
+                        raise
+                    except BaseException as error:
+                        was_success = False
+                        await apply_outcome(
+                            layers, case, case._get_outcome(error, result_proxy, timer),
+                        )
+
+                if not was_success:
+                    break
+
+            if was_success:
+                await apply_outcome(
+                    layers, case, case._get_outcome(None, result_proxy, timer),
+                )
+        except ALLOW_RAISED_EXCEPTIONS:
+            raise
+        except BaseException as error:
+            await apply_outcome(
+                layers, case, case._get_context_error_outcome(error, result_proxy, timer),
+            )
+
+
+async def run_case_with_repeat(case, result, repeat=True):
+    """
+    Case is created here if descriptor of case is given
+    """
+    instance = _case.create_case(case)
+
+    try:
+        if repeat and instance.__repeatable__ and instance.config.REPEAT > 0:
+            for _ in pyv.xrange(instance.config.REPEAT):
+                with runnable.trace(instance, tracer.CASE):
+                    await run_case(instance, result)
+        else:
+            with runnable.trace(instance, tracer.CASE):
+                await run_case(instance, result)
+    finally:
+        if instance is not case:
+            _case.release_case(instance)
+
+
+async def run_case_box(case_box, result, semaphore):
+    """
+    Class fixtures are called once around
+    cases of the box which are run concurrently.
+    """
+    cases = list(case_box)
+
+    if not cases:
+        return
+
+    first, last = cases[0], cases[-1]
+    first_class, last_class = _case.get_case_class(first), _case.get_case_class(last)
+
+    if not getattr(first_class, '__setup_class_was_called__', False):
+        try:
+            with tracer.span('{}.setup_class', tracer.CLASS_FIXTURE, first_class.__name__):
+                await maybe_await(first_class.setup_class())
+        except BaseException:
+            runnable.stopped_on(first, 'setup_class')
+            raise
+        setattr(first_class, '__setup_class_was_called__', True)
+
+    await gather(
+        bounded(semaphore, run_case_with_repeat(case, result), lock=resources.lock_of_case(case))
+        for case in cases
+    )
+
+    if not getattr(last_class, '__teardown_class_was_called__', False):
+        try:
+            with tracer.span('{}.teardown_class', tracer.CLASS_FIXTURE, last_class.__name__):
+                await maybe_await(last_class.teardown_class())
+        except BaseException:
+            runnable.stopped_on(last, 'teardown_class')
+            raise
+        setattr(last_class, '__teardown_class_was_called__', True)
+
+
+async def run_group(group, result):
+    if isinstance(group, AsyncioCaseGroup):
+        await group.__arun__(result)
+    else:
+        group(result)
+
+
+async def run_suite(suite, result):
+    suite._set_run_state()
+    timer = measure_time()
+
+    if result.current_state.should_stop or not suite:
+        return
+
+    group = suite._make_group()
+    layers = lambda hook_name: suite.context.layers_of_hook(suite, hook_name)
+
+    with result.proxy(suite, timer=timer) as result_proxy, runnable.trace(suite, tracer.SUITE):
+        try:
+            await call_hook(layers('on_run'), suite, 'on_run', suite)
+
+            async with AsyncContext(suite.context, suite):
+                await run_group(group, result_proxy)
+        except ALLOW_RAISED_EXCEPTIONS:
+            raise
+        except BaseException as error:
+            runnable.set_debug_if_allowed(suite.config)
+            tb = traceback.format_exc()
+            await call_hook(layers('on_error'), suite, 'on_error', error, suite, result_proxy, tb, timer)
+            result_proxy.add_error(
+                suite, tb, timer(), error,
+            )
+
+
+async def run_load_iteration(scenario, recorder, log):
+    case = scenario.create(recorder, log=log)
+
+    try:
+        with recorder.measure(scenario.name):
+            async with AsyncContext(case.context, case):
+                test_method = _case.prepare(
+                    case, getattr(case, runnable.method_name(case)),
+                )
+                for _ in iter(_case.repeat_method(case)):
+                    await maybe_await(test_method())
+    finally:
+        _case.release_case(case)
+
+
+async def run_load_user(user_index, scenarios, schedule, recorder, console):
+    await asyncio.sleep(schedule.get_start_delay(user_index))
+
+    # users are starting from different cases
+    index = user_index
+
+    while True:
+        delay = schedule.next()
+
+        if delay is None:
+            break
+
+        # users are switched between iterations
+        # even if cases are not coroutines
+        await asyncio.sleep(delay)
+
+        scenario = scenarios[index % len(scenarios)]
+        index += 1
+
+        try:
+            await run_load_iteration(scenario, recorder, console.ChildConsole())
+        except (asyncio.CancelledError, ) + ALLOW_RAISED_EXCEPTIONS:
+            schedule.stop()
+            raise
+        except BaseException:
+            # error is recorded by measurement
+            pass
+
+
+async def run_load_users(scenarios, schedule, recorders, console):
+    await gather(
+        run_load_user(i, scenarios, schedule, recorder, console)
+        for i, recorder in enumerate(recorders)
+    )
+
+
+def run_until_complete(coroutine):
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class AsyncioSuiteGroup(runnable.RunnableGroup):
+
+    def __run__(self, result):
+        self._is_run = True
+
+        run_until_complete(self.__arun__(result))
+
+    async def __arun__(self, result):
+        semaphore = asyncio.Semaphore(
+            get_pool_size_of_value(
+                self.config.ASYNC_SUITES,
+            ),
+        )
+
+        await gather(
+            bounded(semaphore, run_suite(suite, result), lock=resources.lock_of_suite(suite))
+            for suite in get_schedule(self.objects, self.config)
+        )
+
+
+class AsyncioCaseGroup(runnable.RunnableGroup):
+    """
+    Up to ASYNC_TESTS cases are run concurrently.
+    Case which is not coroutine is blocking the loop
+    while it's running, so it's run as usual.
+    """
+
+    def __run__(self, result):
+        run_until_complete(self.__arun__(result))
+
+    async def __arun__(self, result):
+        self._is_run = True
+
+        semaphore = asyncio.Semaphore(
+            get_pool_size_of_value(
+                self.config.ASYNC_TESTS, in_two=True,
+            ),
+        )
+
+        coroutines = []
+
+        for case in get_schedule(self.objects, self.config):
+            if isinstance(case, _case.CaseBox):
+                coroutines.append(run_case_box(case, result, semaphore))
+            else:
+                coroutines.append(
+                    bounded(
+                        semaphore,
+                        run_case_with_repeat(case, result, repeat=False),
+                        lock=resources.lock_of_case(case),
+                    ),
+                )
+
+        await gather(coroutines)
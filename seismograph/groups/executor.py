@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+
+"""
+Executor of threading groups which is shared by program.
+Number of threads is limited globally, each group is limited by
+own quota, and workers are taking tasks of groups in turn, so
+suites are going forward evenly. Task with resources is skipped
+while they are held by others. Group which is waiting for own
+tasks runs them in calling thread. Such task takes a slot of
+the limit too, but thread which is running a task already lends
+own slot to tasks of nested group, so they can not be blocked
+by a full pool of threads.
+"""
+
+from __future__ import absolute_import
+
+import os
+import logging
+import threading
+from collections import deque
+
+from ..groups import adaptive
+from ..exceptions import ALLOW_RAISED_EXCEPTIONS
+
+
+logger = logging.getLogger(__name__)
+
+
+_executor = None
+
+
+class TaskQueue(object):
+    """
+    Tasks of one group
+    """
+
+    def __init__(self, executor, quota=None):
+        self.__executor = executor
+
+        self.quota = quota
+        self.tasks = deque()
+        self.errors = []
+        self.running = 0
+        self.unfinished = 0
+
+    @property
+    def has_slot(self):
+        return not self.quota or self.running < self.quota
+
+    def submit(self, func, *args):
+        self.__executor.submit(self, func, args)
+
+    def submit_with_lock(self, lock, func, *args):
+        """
+        Task is taken when resources of lock are free
+        """
+        self.__executor.submit(self, func, args, lock=lock)
+
+    def join(self):
+        self.__executor.join(self)
+
+
+class Executor(object):
+
+    def __init__(self, limit):
+        self.__limit = max(limit, 1)
+        self.__condition = threading.Condition()
+        self.__local = threading.local()
+
+        self.__queues = deque()
+        self.__workers = []
+        self.__idle = 0
+        self.__active = 0
+        self.__is_shutdown = False
+
+    @property
+    def limit(self):
+        return self.__limit
+
+    def set_limit(self, limit):
+        """
+        Limit of tasks which are run by workers.
+        Extra workers are waiting if it's decreased.
+        """
+        with self.__condition:
+            self.__limit = max(limit, 1)
+            self.__condition.notify_all()
+
+            for _ in range(self.__limit - len(self.__workers)):
+                if not any(q.tasks for q in self.__queues):
+                    break
+                self.__start_worker()
+
+    @property
+    def workers(self):
+        return list(self.__workers)
+
+    def queue(self, quota=None):
+        return TaskQueue(self, quota=quota)
+
+    def submit(self, queue, func, args, lock=None):
+        with self.__condition:
+            if self.__is_shutdown:
+                raise RuntimeError('Executor is shut down')
+
+            queue.tasks.append((func, args, lock))
+            queue.unfinished += 1
+
+            if queue not in self.__queues:
+                self.__queues.append(queue)
+
+            if not self.__idle and len(self.__workers) < self.__limit:
+                self.__start_worker()
+
+            self.__condition.notify_all()
+
+    def join(self, queue):
+        """
+        Wait for tasks of queue and raise the first error.
+        Tasks are run by calling thread if quota and limit allow it.
+        """
+        lent = getattr(self.__local, 'has_slot', False)
+
+        try:
+            with self.__condition:
+                while queue.unfinished:
+                    task = self.__take(queue, lent=lent)
+
+                    if task is None:
+                        self.__condition.wait()
+                        continue
+
+                    self.__condition.release()
+
+                    try:
+                        self.__run(queue, task, counted=not lent)
+                    finally:
+                        self.__condition.acquire()
+        except ALLOW_RAISED_EXCEPTIONS:
+            self.cancel(queue)
+            raise
+
+        if queue.errors:
+            raise queue.errors[0]
+
+    def cancel(self, queue):
+        with self.__condition:
+            queue.unfinished -= len(queue.tasks)
+            queue.tasks.clear()
+
+            if queue in self.__queues:
+                self.__queues.remove(queue)
+
+            self.__condition.notify_all()
+
+    def shutdown(self):
+        with self.__condition:
+            self.__is_shutdown = True
+            self.__condition.notify_all()
+
+        for worker in self.__workers:
+            worker.join()
+
+        del self.__workers[:]
+
+    def __start_worker(self):
+        worker = threading.Thread(
+            target=self.__work,
+            name='seismograph worker {}'.format(len(self.__workers) + 1),
+        )
+        worker.daemon = True
+
+        self.__workers.append(worker)
+        worker.start()
+
+        logger.debug(
+            'Worker "{}" was started, {} of {}'.format(
+                worker.name, len(self.__workers), self.__limit,
+            ),
+        )
+
+    @staticmethod
+    def __pop_task(queue):
+        """
+        The first task which resources are free
+        """
+        for index, task in enumerate(queue.tasks):
+            lock = task[2]
+
+            if lock is None or lock.try_acquire():
+                del queue.tasks[index]
+                queue.running += 1
+                return task
+
+        return None
+
+    def __take(self, queue=None, lent=False):
+        """
+        Next task in turn of queues.
+        It's called under lock of condition.
+        """
+        if queue is not None and lent:
+            if queue.tasks and queue.has_slot:
+                return self.__pop_task(queue)
+            return None
+
+        if self.__active >= self.__limit:
+            return None
+
+        if queue is not None:
+            task = None
+
+            if queue.tasks and queue.has_slot:
+                task = self.__pop_task(queue)
+
+            if task is not None:
+                self.__active += 1
+
+            return task
+
+        for _ in range(len(self.__queues)):
+            candidate = self.__queues[0]
+
+            if not candidate.tasks:
+                self.__queues.popleft()
+                continue
+
+            self.__queues.rotate(-1)
+
+            if candidate.has_slot:
+                task = self.__pop_task(candidate)
+
+                if task is not None:
+                    self.__active += 1
+                    return candidate, task
+
+        return None
+
+    def __run(self, queue, task, counted=True):
+        func, args, lock = task
+        has_slot = getattr(self.__local, 'has_slot', False)
+        self.__local.has_slot = True
+
+        try:
+            func(*args)
+        except BaseException as error:
+            queue.errors.append(error)
+        finally:
+            self.__local.has_slot = has_slot
+
+            if lock is not None:
+                lock.release()
+
+            with self.__condition:
+                queue.running -= 1
+                queue.unfinished -= 1
+
+                if counted:
+                    self.__active -= 1
+
+                self.__condition.notify_all()
+
+    def __work(self):
+        while True:
+            with self.__condition:
+                item = self.__take()
+
+                while item is None:
+                    if self.__is_shutdown:
+                        return
+
+                    self.__idle += 1
+                    self.__condition.wait()
+                    self.__idle -= 1
+
+                    item = self.__take()
+
+            self.__run(*item)
+
+
+def get_executor(config):
+    """
+    Executor is created once for process.
+    Threads are not living in forked worker,
+    so it gets own executor.
+    """
+    global _executor
+
+    if _executor is None or _executor[0] != os.getpid():
+        _executor = (os.getpid(), Executor(adaptive.get_max_threads(config)))
+        adaptive.register(_executor[1])
+
+    return _executor[1]
+
+
+def shutdown():
+    global _executor
+
+    if _executor is not None and _executor[0] == os.getpid():
+        adaptive.unregister(_executor[1])
+        _executor[1].shutdown()
+
+    _executor = None
@@ -5,12 +5,19 @@ from __future__ import absolute_import
 from gevent.pool import Pool
 
 from .. import runnable
+from .. import resources
+from ..groups import get_schedule
 from ..groups import get_pool_size_of_value
 from ..exceptions import ALLOW_RAISED_EXCEPTIONS
 
 
-def target(runnable_object, result):
-    runnable_object(result)
+def target(runnable_object, result, lock=None):
+    if lock is None:
+        runnable_object(result)
+        return
+
+    with lock:
+        runnable_object(result)
 
 
 class GeventSuiteGroup(runnable.RunnableGroup):
@@ -25,8 +32,8 @@ class GeventSuiteGroup(runnable.RunnableGroup):
         )
 
         try:
-            for suite in self.objects:
-                pool.spawn(target, suite, result)
+            for suite in get_schedule(self.objects, self.config):
+                pool.spawn(target, suite, result, resources.lock_of_suite(suite))
 
             pool.join()
         except ALLOW_RAISED_EXCEPTIONS:
@@ -46,8 +53,8 @@ class GeventCaseGroup(runnable.RunnableGroup):
         )
 
         try:
-            for case in self.objects:
-                pool.spawn(target, case, result)
+            for case in get_schedule(self.objects, self.config):
+                pool.spawn(target, case, result, resources.lock_of_case(case))
 
             pool.join()
         except ALLOW_RAISED_EXCEPTIONS:
@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+
+"""
+Group of load mode.
+Cases of all suites are run by virtual users concurrently,
+contexts of suites and class fixtures are around the whole load.
+Users are threads by default, greenlets with --gevent and
+tasks of one event loop with --asyncio.
+"""
+
+from __future__ import absolute_import
+
+import time
+import logging
+import threading
+import traceback
+from timeit import default_timer
+
+from .. import load
+from .. import case as _case
+from .. import runnable
+from ..utils import common
+from ..utils.common import measure_time
+from ..exceptions import ALLOW_RAISED_EXCEPTIONS
+
+
+logger = logging.getLogger(__name__)
+
+
+class Schedule(object):
+    """
+    Plan of load which is shared by users.
+    Each iteration takes a slot, slot is a time
+    of start of iteration if rate is limited.
+    """
+
+    def __init__(self, users, duration, rate=None, ramp_up=None, iterations=None):
+        self.__lock = threading.Lock()
+
+        self.__users = users
+        self.__duration = duration
+        self.__rate = rate
+        self.__ramp_up = ramp_up
+        self.__iterations = iterations
+
+        self.__slots = 0
+        self.__started = None
+        self.__stopped = False
+
+    @property
+    def elapsed(self):
+        if self.__started is None:
+            return 0.0
+        return default_timer() - self.__started
+
+    def start(self):
+        self.__started = default_timer()
+
+    def stop(self):
+        self.__stopped = True
+
+    def get_start_delay(self, user_index):
+        """
+        Users are started evenly by time of ramp up
+        """
+        if not self.__ramp_up:
+            return 0.0
+        return float(self.__ramp_up) * user_index / self.__users
+
+    def next(self):
+        """
+        Delay before start of next iteration
+        or None if load is over.
+        """
+        with self.__lock:
+            elapsed = self.elapsed
+
+            if self.__stopped or elapsed >= self.__duration:
+                return None
+
+            if self.__iterations and self.__slots >= self.__iterations:
+                return None
+
+            slot = self.__slots
+
+            if self.__rate:
+                start = slot / float(self.__rate)
+
+                if start >= self.__duration:
+                    return None
+            else:
+                start = elapsed
+
+            self.__slots += 1
+
+        return max(start - elapsed, 0.0)
+
+
+class Scenario(object):
+    """
+    Case which is run by users.
+    Instance of case can not be shared by users,
+    so new one is created for each iteration.
+    """
+
+    def __init__(self, case):
+        # flows are applied to class of case once
+        self.prototype = _case.create_case(case)
+        self.name = load.get_iteration_name(
+            runnable.class_name(self.prototype), runnable.method_name(self.prototype),
+        )
+
+    @property
+    def case_class(self):
+        return self.prototype.__class__
+
+    def create(self, recorder, log=None):
+        case = self.case_class(
+            runnable.method_name(self.prototype),
+            config=self.prototype.config,
+            use_flows=False,
+        )
+        case._set_run_state(log=log)
+        case._load_recorder = recorder
+        return case
+
+
+def is_skipped(case):
+    cls = _case.get_case_class(case)
+    method = getattr(cls, runnable.method_name(case), None)
+
+    return hasattr(cls, _case.SKIP_ATTRIBUTE_NAME) or hasattr(method, _case.SKIP_ATTRIBUTE_NAME)
+
+
+def get_cases(suite):
+    for case in suite:
+        if isinstance(case, _case.CaseBox):
+            for c in case:
+                yield c
+        else:
+            yield case
+
+
+def run_iteration(scenario, recorder, log):
+    case = scenario.create(recorder, log=log)
+
+    try:
+        with recorder.measure(scenario.name):
+            with case.context(case):
+                test_method = _case.prepare(
+                    case, getattr(case, runnable.method_name(case)),
+                )
+                for _ in iter(_case.repeat_method(case)):
+                    common.run_if_awaitable(test_method())
+    finally:
+        _case.release_case(case)
+
+
+def run_user(user_index, scenarios, schedule, recorder, console, sleep=time.sleep):
+    sleep(schedule.get_start_delay(user_index))
+
+    # users are starting from different cases
+    index = user_index
+
+    while True:
+        delay = schedule.next()
+
+        if delay is None:
+            break
+
+        if delay:
+            sleep(delay)
+
+        scenario = scenarios[index % len(scenarios)]
+        index += 1
+
+        try:
+            run_iteration(scenario, recorder, console.ChildConsole())
+        except ALLOW_RAISED_EXCEPTIONS:
+            schedule.stop()
+            raise
+        except BaseException:
+            # error is recorded by measurement
+            pass
+
+
+def run_threads(scenarios, schedule, recorders, console):
+    errors = []
+
+    def target(*args):
+        try:
+            run_user(*args)
+        except BaseException as error:
+            errors.append(error)
+
+    threads = [
+        threading.Thread(
+            target=target,
+            args=(i, scenarios, schedule, recorder, console),
+            name='load user {}'.format(i),
+        )
+        for i, recorder in enumerate(recorders)
+    ]
+
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.1)
+    except ALLOW_RAISED_EXCEPTIONS:
+        schedule.stop()
+        raise
+
+    if errors:
+        raise errors[0]
+
+
+def run_greenlets(scenarios, schedule, recorders, console):
+    import gevent
+
+    greenlets = [
+        gevent.spawn(run_user, i, scenarios, schedule, recorder, console, sleep=gevent.sleep)
+        for i, recorder in enumerate(recorders)
+    ]
+
+    try:
+        gevent.joinall(greenlets, raise_error=True)
+    except ALLOW_RAISED_EXCEPTIONS:
+        schedule.stop()
+        gevent.killall(greenlets)
+        raise
+
+
+class LoadSuiteGroup(runnable.RunnableGroup):
+    """
+    Skipped cases are run as usual, results of
+    others are recorded once per case after load.
+    """
+
+    def __run__(self, result):
+        self._is_run = True
+
+        load.clear()
+        self.__run_suites(list(self.objects), [], result)
+
+    def __run_suites(self, suites, cases, result):
+        if not suites:
+            self.__run_cases(cases, result)
+            return
+
+        suite, others = suites[0], suites[1:]
+        suite._set_run_state()
+
+        if result.current_state.should_stop or not suite:
+            self.__run_suites(others, cases, result)
+            return
+
+        timer = measure_time()
+        is_started = []
+
+        with result.proxy(suite, timer=timer) as result_proxy:
+            try:
+                suite.context.on_run(suite)
+
+                with suite.context(suite):
+                    is_started.append(True)
+                    self.__run_suites(others, cases + list(get_cases(suite)), result_proxy)
+            except ALLOW_RAISED_EXCEPTIONS:
+                raise
+            except BaseException as error:
+                runnable.set_debug_if_allowed(suite.config)
+                tb = traceback.format_exc()
+                suite.context.on_error(error, suite, result_proxy, tb, timer)
+                result_proxy.add_error(
+                    suite, tb, timer(), error,
+                )
+
+        # cases of other suites are run without it
+        if not is_started:
+            self.__run_suites(others, cases, result)
+
+    def __run_cases(self, cases, result):
+        scenarios = []
+
+        for case in cases:
+            if is_skipped(case):
+                case(result)
+            else:
+                scenarios.append(Scenario(case))
+
+        if not scenarios:
+            return
+
+        fixtures = []
+
+        try:
+            for scenario in scenarios:
+                if scenario.case_class in fixtures:
+                    continue
+
+                try:
+                    _case.setup_class_proxy(scenario.prototype)
+                except BaseException:
+                    runnable.stopped_on(scenario.prototype, 'setup_class')
+                    raise
+
+                fixtures.append(scenario.case_class)
+
+            self.__run_load(scenarios, result)
+        except ALLOW_RAISED_EXCEPTIONS:
+            raise
+        except BaseException as error:
+            self.__add_error(scenarios, result, error, traceback.format_exc())
+        finally:
+            for scenario in scenarios:
+                if scenario.case_class in fixtures:
+                    fixtures.remove(scenario.case_class)
+                    _case.teardown_class_proxy(scenario.prototype)
+
+    def __run_load(self, scenarios, result):
+        users = max(self.config.LOAD_USERS, 1)
+        schedule = Schedule(
+            users,
+            self.config.LOAD_DURATION,
+            rate=self.config.LOAD_RATE,
+            ramp_up=self.config.LOAD_RAMP_UP,
+            iterations=self.config.LOAD_ITERATIONS,
+        )
+        recorders = [load.Recorder() for _ in range(users)]
+
+        logger.debug(
+            'Run load of {} cases by {} users'.format(len(scenarios), users),
+        )
+
+        schedule.start()
+
+        if self.config.ASYNCIO:
+            from .asyncio import run_until_complete
+            from .asyncio import run_load_users
+
+            run_until_complete(
+                run_load_users(scenarios, schedule, recorders, result.console),
+            )
+        elif self.config.GEVENT:
+            run_greenlets(scenarios, schedule, recorders, result.console)
+        else:
+            run_threads(scenarios, schedule, recorders, result.console)
+
+        duration = schedule.elapsed
+        stats = load.collect(recorders, users=users, duration=duration)
+
+        for scenario in scenarios:
+            self.__add_record(scenario, stats.get(scenario.name), duration, result)
+
+    @staticmethod
+    def __add_record(scenario, stats, duration, result):
+        case = scenario.prototype
+        case._set_run_state()
+        case._start_metrics()
+
+        if stats is not None:
+            for name, value in load.get_summary(stats, duration).items():
+                case._metrics.set(name, value)
+
+        with result.proxy() as result_proxy:
+            result_proxy.start(case)
+
+            if stats is None or not stats.errors:
+                result_proxy.add_success(case, duration)
+                return
+
+            exc, tb = stats.first_error
+            tb = 'Load: {} of {} iterations were failed, the first of them:\n\n{}'.format(
+                stats.errors, stats.histogram.count, tb,
+            )
+            runnable.stopped_on(case, runnable.method_name(case))
+
+            if isinstance(exc, AssertionError):
+                result_proxy.add_fail(case, tb, duration, exc)
+            else:
+                result_proxy.add_error(case, tb, duration, exc)
+
+    @staticmethod
+    def __add_error(scenarios, result, error, tb):
+        with result.proxy() as result_proxy:
+            for scenario in scenarios:
+                result_proxy.start(scenario.prototype)
+                result_proxy.add_error(scenario.prototype, tb, 0.0, error)
@@ -2,40 +2,169 @@
 
 from __future__ import absolute_import
 
+import os
+import errno
+import time
+import signal
+import logging
+from threading import Lock
+from threading import Thread
+
+try:
+    from StringIO import StringIO
+except ImportError:  # please python 3
+    from io import StringIO
+
+from .. import tracer
+from .. import watchdog
 from .. import runnable
+from .. import resources
+from .. import extensions
+from ..utils import pyv
+from ..utils import mp as _mp
+from ..case import Case
 from ..case import CaseBox
+from ..case import CaseDescriptor
 from ..xunit import XUnitData
-from ..utils.common import waiting_for
+from ..case import has_class_fixtures
+from ..groups import get_schedule
+from ..groups import adaptive
+from ..groups import executor
 from ..groups import get_pool_size_of_value
+from ..exceptions import CaseTimeout
+from ..exceptions import WorkerError
 
 
-MPProcess = mp_manager = None
+logger = logging.getLogger(__name__)
+
+
+MPPipe = MPQueue = MPProcess = MPValue = None
+
+
+# kinds of messages from worker
+RECORD, TASK_STARTED, TASK_DONE, CASE_STARTED, CASE_STOPPED, CASE_HUNG = range(6)
+
+# watchdog of worker has a chance to interrupt
+# hung case before the worker will be killed
+KILL_GRACE = 5.0
 
 
 def import_mp():
-    global MPProcess, mp_manager
+    global MPPipe, MPQueue, MPProcess, MPValue
 
+    from multiprocessing import Pipe
+    from multiprocessing import Queue
+    from multiprocessing import Value
     from multiprocessing import Process
-    from multiprocessing import Manager
 
+    MPPipe = Pipe
+    MPQueue = Queue
+    MPValue = Value
     MPProcess = Process
-    mp_manager = Manager()
 
 
-def target(suite, mp_result):
-    suite(mp_result)
-    mp_result.save_result()
+class MPLimit(object):
+    """
+    Limit of active workers which is shared with them.
+    Worker is waiting with taken task while limit is reached.
+    It's changed by adaptive controller of parent process.
+    """
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, maximum):
+        self.maximum = maximum
+        self.limit = MPValue('i', maximum)
+        self.running = MPValue('i', 0)
+
+    def set_limit(self, limit):
+        self.limit.value = max(min(limit, self.maximum), 1)
+
+    def acquire(self):
+        while True:
+            with self.running.get_lock():
+                if self.running.value < self.limit.value:
+                    self.running.value += 1
+                    return
+
+            time.sleep(self.POLL_INTERVAL)
+
+    def release(self):
+        with self.running.get_lock():
+            self.running.value -= 1
+
+
+def get_cases(runnable_object):
+    """
+    Cases of suite, case box or case itself
+    """
+    if isinstance(runnable_object, (Case, CaseDescriptor)):
+        return [runnable_object]
+
+    cases = []
+
+    for case in runnable_object:
+        cases.extend(get_cases(case))
+
+    return cases
+
+
+def worker(objects, tasks, connection, mp_result, limit=None):
+    """
+    Long-lived worker. Pulls indexes of runnable
+    objects from the shared queue until sentinel
+    and streams result back after each of them.
+    """
+    mp_result.connect(connection)
+    watchdog.set_listener(mp_result)
+
+    while True:
+        index = tasks.get()
+
+        if index is None:
+            break
+
+        if limit is not None:
+            limit.acquire()
+
+        mp_result.send(TASK_STARTED, index)
+
+        try:
+            objects[index](mp_result)
+        finally:
+            if limit is not None:
+                limit.release()
+
+        mp_result.save_result()
+        mp_result.send(TASK_DONE, index)
+
+    # pools of worker are own copies
+    # of parent pools after fork
+    extensions.shutdown()
+    executor.shutdown()
+    tracer.dump_part()
+
+    connection.close()
 
 
 class MPResult(object):
+    """
+    Result of worker process.
+    Each record is sent to parent process as length-prefixed
+    marshal bytes through the own pipe of worker. Cases with
+    timeout are reported on start and stop, so parent can
+    kill worker which is hung.
+    """
 
     MATCH = {}
 
     def __init__(self, result):
         self.result = result
-        self.queue = mp_manager.Queue()
+        self.lock = None
+        self.output = None
+        self.connection = None
 
-        self.result.support_mp(mp_manager)
+        self.result.support_mp()
 
     def __getattr__(self, item):
         return getattr(self.result, item)
@@ -43,87 +172,182 @@ class MPResult(object):
     @staticmethod
     def pack_result_storage(storage):
         return [
-            (runnable.id, xunit_data.to_marshal())
-            for runnable, xunit_data in storage
+            (runnable_object.id, runnable.stopped_on(runnable_object), xunit_data.to_dict())
+            for runnable_object, xunit_data in storage
         ]
 
     def unpack_result_storage(self, storage):
-        for runnable_id, xunit_data in storage:
-            yield self.MATCH[runnable_id], XUnitData.from_marshal(xunit_data)
+        for runnable_id, stopped_on, xunit_data in storage:
+            runnable_object = self.MATCH[runnable_id]
+            runnable.stopped_on(runnable_object, stopped_on)
+            yield runnable_object, XUnitData.from_dict(xunit_data)
 
     def match(self, suite):
         self.MATCH[suite.id] = suite
-        suite.support_mp(mp_manager)
 
         for case in suite:
             if isinstance(case, CaseBox):
-                for c in case:
-                    self.MATCH[c.id] = c
-                    c.support_mp(mp_manager)
+                self.match_case_box(case)
             else:
-                self.MATCH[case.id] = case
-                case.support_mp(mp_manager)
+                self.match_case(case)
 
-    def save_result(self):
-        if self.result.proxies:
-            self.queue.put(
-                (
-                    self.result.proxies[0].name,
-                    self.result.proxies[0].runtime,
-
-                    self.pack_result_storage(
-                        self.result.successes,
-                    ),
-                    self.pack_result_storage(
-                        self.result.skipped,
-                    ),
-                    self.pack_result_storage(
-                        self.result.failures,
-                    ),
-                    self.pack_result_storage(
-                        self.result.errors,
-                    ),
-                ),
-            )
+    def match_case(self, case):
+        self.MATCH[case.id] = case
+
+    def match_case_box(self, case_box):
+        for case in case_box:
+            self.match_case(case)
+
+    def connect(self, connection):
+        self.lock = Lock()
+        self.output = StringIO()
+        self.connection = connection
+
+        # console of worker is buffered and will be
+        # written by parent, so lines are not mixed
+        self.result.set_stream(self.output)
+        # report is written by parent from merged records
+        self.result.set_xunit_writer(None)
+        self.reset_result()
+
+    def pop_output(self):
+        output = self.output.getvalue()
 
-    def sync(self):
-        while not self.queue.empty():
-            name, runtime, successes, skipped, failures, errors = self.queue.get()
+        self.output.seek(0)
+        self.output.truncate()
 
-            result_proxy = self.create_proxy(
-                name=name,
+        return output
+
+    def send(self, kind, *data):
+        # watchdog and threads of cases are sending too
+        with self.lock:
+            self.connection.send_bytes(
+                _mp.pack_record((kind, data)),
             )
+
+    def on_case_started(self, case, seconds):
+        self.send(CASE_STARTED, case.id, seconds)
+
+    def on_case_stopped(self, case):
+        self.send(CASE_STOPPED, case.id)
+
+    def on_case_hung(self, case, message):
+        self.send(CASE_HUNG, case.id, message)
+
+    def put_result(self, name, result):
+        self.send(
+            RECORD,
+            name,
+            result.runtime,
+            self.pop_output(),
+
+            self.pack_result_storage(
+                result.successes,
+            ),
+            self.pack_result_storage(
+                result.skipped,
+            ),
+            self.pack_result_storage(
+                result.failures,
+            ),
+            self.pack_result_storage(
+                result.errors,
+            ),
+        )
+
+    def save_result(self):
+        if self.result.proxies:
+            for result_proxy in self.result.proxies:
+                self.put_result(result_proxy.name, result_proxy)
+        elif self.result.get_state().tests:
+            # cases were run on result of suite directly,
+            # they will be merged to it without creating proxy
+            self.put_result(None, self.result)
+
+        self.reset_result()
+
+    def reset_result(self):
+        # worker is living while the queue is not empty,
+        # so it should not to keep results of done suites
+        del self.result.proxies[:]
+        del self.result.errors[:]
+        del self.result.skipped[:]
+        del self.result.failures[:]
+        del self.result.successes[:]
+
+    def merge(self, record):
+        name, runtime, output, successes, skipped, failures, errors = record
+
+        if output:
+            self.result.console.write(output)
+            self.result.console.flush()
+
+        result_proxy = self.create_proxy(
+            name=name,
+        )
+
+        if name is not None:
             result_proxy.runtime = runtime
 
-            result_proxy.errors.extend(
-                self.unpack_result_storage(errors),
-            )
-            result_proxy.successes.extend(
-                self.unpack_result_storage(successes),
-            )
-            result_proxy.skipped.extend(
-                self.unpack_result_storage(skipped),
-            )
-            result_proxy.failures.extend(
-                self.unpack_result_storage(failures),
-            )
+        result_proxy.errors.extend(
+            self.unpack_result_storage(errors),
+        )
+        result_proxy.successes.extend(
+            self.unpack_result_storage(successes),
+        )
+        result_proxy.skipped.extend(
+            self.unpack_result_storage(skipped),
+        )
+        result_proxy.failures.extend(
+            self.unpack_result_storage(failures),
+        )
 
-            self.result.extend(result_proxy)
+        # latency of cases is observed by controller
+        for storage in (result_proxy.successes, result_proxy.failures):
+            for _, xunit_data in storage:
+                adaptive.observe(xunit_data.runtime)
+
+        self.result.extend(result_proxy)
+
+        if name is not None:
             self.result.proxies.append(result_proxy)
 
 
 class Multiprocessing(object):
+    """
+    Pool of long-lived processes.
+    Runnable objects are matched before start,
+    workers are forked with them and receive
+    only indexes from the queue of tasks.
+    Objects with resources can not be locked between
+    processes, they are run one by one in parent after pool.
+    Worker which is hung on case is killed and replaced,
+    as well as worker which was crashed on task.
+    """
+
+    def __init__(self, result, config, max_processes=None):
+        self.workers = []
+        self.objects = []
+        self.locked = []
+        self.connections = {}
+
+        # connection -> index of running task
+        self.running = {}
+        # connection -> ids of reported cases of running task
+        self.reported = {}
+        # connection -> {case id: (deadline, timeout)}
+        self.deadlines = {}
+        # case id -> stack of hung case from worker
+        self.stacks = {}
 
-    def __init__(self, result, config, suites=None):
-        self.queue = []
-        self.stack = []
+        self.result = result
 
+        self.limit = None
+        self.config = config
+        self.tasks = MPQueue()
         self.mp_result = MPResult(result)
         self.release_timeout = config.MULTIPROCESSING_TIMEOUT
-        self.max_processes = get_pool_size_of_value(config.ASYNC_SUITES)
-
-        if suites:
-            self.add_suites(suites)
+        self.max_processes = max_processes or get_pool_size_of_value(config.ASYNC_SUITES)
 
     def __enter__(self):
         return self
@@ -131,57 +355,312 @@ class Multiprocessing(object):
     def __exit__(self, *args, **kwargs):
         self.terminate_all()
         self.join_all()
-        self.mp_result.sync()
+
+    @property
+    def pool_size(self):
+        return min(self.max_processes, len(self.objects)) or 1
+
+    def add_object(self, runnable_object):
+        if resources.of(runnable_object):
+            self.locked.append(runnable_object)
+        else:
+            self.objects.append(runnable_object)
 
     def add_suite(self, suite):
         self.mp_result.match(suite)
-
-        self.queue.append(
-            MPProcess(
-                target=target,
-                args=(suite, self.mp_result),
-            ),
-        )
+        self.add_object(suite)
 
     def add_suites(self, suites):
         for suite in suites:
             self.add_suite(suite)
 
-    def try_release(self):
-        for process in self.stack[::-1]:
-            if not process.is_alive():
-                process.join(timeout=self.release_timeout)
-                self.stack.remove(process)
-
-    def is_release(self):
-        self.try_release()
-        return len(self.stack) < self.max_processes
-
-    def wait_release(self):
-        waiting_for(
-            self.is_release,
-            timeout=self.release_timeout,
-            message='Process list has not been release for "{}" sec.'.format(
-                self.release_timeout,
-            ),
-        )
+    def add_case_box(self, case_box):
+        self.mp_result.match_case_box(case_box)
+
+        cases = list(case_box)
+
+        if not cases or has_class_fixtures(cases[0]):
+            self.add_object(case_box)
+        else:
+            # without setup_class and teardown_class each case
+            # is independent unit of work, but it's still boxed
+            # for saving behavior of repeat option
+            for case in cases:
+                self.add_object(case_box.__class__((case, )))
+
+    def add_cases(self, cases):
+        for case in cases:
+            if isinstance(case, CaseBox):
+                self.add_case_box(case)
+            else:
+                self.mp_result.match_case(case)
+                self.add_object(case)
 
     def join_all(self):
-        for process in self.stack:
+        for process in self.workers:
             process.join(timeout=self.release_timeout)
 
     def terminate_all(self):
-        for process in self.stack:
-            process.terminate()
+        for process in self.workers:
+            if process.is_alive():
+                process.terminate()
+
+    def start_worker(self):
+        reader, writer = MPPipe(duplex=False)
+
+        process = MPProcess(
+            target=worker,
+            args=(self.objects, self.tasks, writer, self.mp_result, self.limit),
+        )
+        process.start()
+
+        # parent should not hold write end, otherwise
+        # reader will not get EOF after exit of worker
+        writer.close()
+
+        self.workers.append(process)
+        self.connections[reader] = process
+
+    def start_workers(self):
+        for _ in pyv.xrange(self.pool_size):
+            self.start_worker()
+
+    def receive(self, connection, data):
+        kind, data = _mp.unpack_record(data)
+
+        if kind == RECORD:
+            self.reported.setdefault(connection, set()).update(
+                item[0] for storage in data[3:] for item in storage
+            )
+            self.mp_result.merge(data)
+        elif kind == TASK_STARTED:
+            self.running[connection] = data[0]
+            self.reported[connection] = set()
+        elif kind == TASK_DONE:
+            self.running.pop(connection, None)
+            self.reported.pop(connection, None)
+        elif kind == CASE_STARTED:
+            case_id, seconds = data
+            deadline = time.time() + seconds + KILL_GRACE
+            self.deadlines.setdefault(connection, {})[case_id] = (deadline, seconds)
+        elif kind == CASE_STOPPED:
+            self.deadlines.get(connection, {}).pop(data[0], None)
+        elif kind == CASE_HUNG:
+            case_id, stack = data
+            self.stacks[case_id] = stack
+
+    def read(self, connection):
+        """
+        Returns False if worker was exited
+        """
+        try:
+            data = connection.recv_bytes()
+        except EOFError:
+            return False
+
+        try:
+            self.receive(connection, data)
+        except BaseException:
+            logger.exception('Record of worker can not be merged')
+
+        return True
+
+    def get_nearest_deadline(self):
+        deadlines = [
+            deadline for cases in self.deadlines.values() for deadline, _ in cases.values()
+        ]
+        return min(deadlines) if deadlines else None
+
+    def add_timeout_error(self, case_id, seconds, is_hung):
+        case = self.mp_result.MATCH[case_id]
+
+        if is_hung:
+            message = self.stacks.pop(case_id, None) or watchdog.get_message(
+                case, seconds, 'Stack is not available, worker was killed',
+            )
+        else:
+            message = u'Case "{}" was stopped, worker was killed by timeout of other case'.format(
+                case,
+            )
+
+        with self.result.proxy() as result_proxy:
+            result_proxy.add_error(case, message, seconds, CaseTimeout(message))
+
+    def add_lost_errors(self, runnable_object, reported, message):
+        """
+        Cases of task which were not reported by worker
+        """
+        cases = [c for c in get_cases(runnable_object) if c.id not in reported]
+
+        if not cases:
+            return
+
+        if isinstance(runnable_object, (Case, CaseDescriptor, CaseBox)):
+            proxy = self.result.proxy()
+        else:
+            proxy = self.result.proxy(runnable_object)
+
+        with proxy as result_proxy:
+            for case in cases:
+                result_proxy.add_error(case, message, 0.0, WorkerError(message))
+
+    def release_worker(self, connection, message=None):
+        """
+        Worker was exited. If it was crashed while running task,
+        cases of the task which were not reported are recorded as
+        errors and new worker is started instead of it. Returns
+        True in this case.
+        """
+        process = self.connections.pop(connection)
+        connection.close()
+
+        self.deadlines.pop(connection, None)
+        reported = self.reported.pop(connection, set())
+        index = self.running.pop(connection, None)
+
+        if index is None:
+            return False
+
+        process.join(timeout=self.release_timeout)
+
+        if message is None:
+            message = u'Worker "{}" was exited with code "{}" while task was running'.format(
+                process.pid, process.exitcode,
+            )
+        logger.warning(message)
+
+        self.add_lost_errors(self.objects[index], reported, message)
+
+        # worker was exited with taken slot
+        if self.limit is not None:
+            self.limit.release()
+
+        self.start_worker()
+
+        return True
+
+    def kill(self, connection):
+        """
+        Kill worker which is hung on case and start new one.
+        Cases with timeout are recorded as timed out, other cases
+        of its current task which were not reported are errors.
+        """
+        process = self.connections[connection]
+
+        logger.warning(
+            'Worker "{}" is hung on case and it will be replaced'.format(process.pid),
+        )
+
+        process.terminate()
+        process.join(timeout=KILL_GRACE)
+
+        if process.is_alive():
+            try:
+                os.kill(process.pid, signal.SIGKILL)
+            except OSError as error:
+                # was exited after check
+                if error.errno != errno.ESRCH:
+                    raise
+            process.join()
+
+        # messages which were sent before kill
+        while self.read(connection):
+            pass
+
+        now = time.time()
+        reported = self.reported.setdefault(connection, set())
+
+        for case_id, (deadline, seconds) in self.deadlines.pop(connection, {}).items():
+            self.add_timeout_error(case_id, seconds, deadline <= now)
+            reported.add(case_id)
+
+        was_running = self.release_worker(
+            connection,
+            message=u'Worker "{}" was killed by timeout of case, '
+                    u'results of its task were not reported'.format(process.pid),
+        )
+
+        # task was done before kill
+        if not was_running:
+            self.start_worker()
+
+    def kill_hung(self):
+        now = time.time()
+
+        for connection, cases in list(self.deadlines.items()):
+            if connection in self.connections and \
+                    any(deadline <= now for deadline, _ in cases.values()):
+                self.kill(connection)
+
+    def collect(self):
+        """
+        Merge records of workers as they arrive.
+        It's working in background thread while
+        main thread is waiting for workers.
+        """
+        silent_since = time.time()
+
+        while self.connections:
+            timeout = silent_since + self.release_timeout - time.time()
+            deadline = self.get_nearest_deadline()
+
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.time())
+
+            ready = _mp.wait(list(self.connections), timeout=max(timeout, 0))
+
+            for connection in ready:
+                silent_since = time.time()
+
+                if not self.read(connection):
+                    self.release_worker(connection)
+
+            self.kill_hung()
+
+            if not ready and time.time() - silent_since >= self.release_timeout:
+                logger.warning(
+                    'Workers were silent for "{}" sec.'.format(self.release_timeout),
+                )
+                break
+
+    def run_locked(self):
+        for runnable_object in self.locked:
+            if self.result.current_state.should_stop:
+                break
+
+            runnable_object(self.result)
 
     def serve(self):
-        while self.queue:
-            process = self.queue.pop()
-            process.start()
-            self.stack.append(process)
-            self.wait_release()
+        if not self.objects:
+            self.run_locked()
+            return
 
-        self.join_all()
+        self.objects = list(get_schedule(self.objects, self.config))
+
+        for index in pyv.xrange(len(self.objects)):
+            self.tasks.put(index)
+
+        for _ in pyv.xrange(self.pool_size):
+            self.tasks.put(None)
+
+        if adaptive.is_enabled():
+            self.limit = MPLimit(self.pool_size)
+            adaptive.register(self.limit)
+
+        self.start_workers()
+
+        collector = Thread(target=self.collect)
+        collector.daemon = True
+        collector.start()
+
+        try:
+            self.join_all()
+            collector.join(timeout=self.release_timeout)
+        finally:
+            if self.limit is not None:
+                adaptive.unregister(self.limit)
+
+        self.run_locked()
 
 
 class MultiprocessingSuiteGroup(runnable.RunnableGroup):
@@ -191,5 +670,25 @@ class MultiprocessingSuiteGroup(runnable.RunnableGroup):
 
         import_mp()
 
-        with Multiprocessing(result, self.config, suites=self.objects) as mp:
+        with Multiprocessing(result, self.config) as mp:
+            mp.add_suites(self.objects)
+            mp.serve()
+
+
+class MultiprocessingCaseGroup(runnable.RunnableGroup):
+    """
+    Dispatch cases of one suite to worker processes.
+    Suite context is living in the parent process,
+    results are merged to result proxy of the suite.
+    """
+
+    def __run__(self, result):
+        self._is_run = True
+
+        import_mp()
+
+        max_processes = get_pool_size_of_value(self.config.ASYNC_TESTS)
+
+        with Multiprocessing(result, self.config, max_processes=max_processes) as mp:
+            mp.add_cases(self.objects)
             mp.serve()
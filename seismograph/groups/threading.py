@@ -2,35 +2,39 @@
 
 from __future__ import absolute_import
 
-from multiprocessing.pool import ThreadPool
-
 from .. import runnable
+from .. import resources
+from ..groups import adaptive
+from ..groups import get_schedule
+from ..utils.common import measure_time
 from ..groups import get_pool_size_of_value
-from ..exceptions import ALLOW_RAISED_EXCEPTIONS
+from ..groups.executor import get_executor
 
 
 def target(runnable_object, result):
     runnable_object(result)
 
 
+def target_of_case(case, result):
+    timer = measure_time()
+    case(result)
+    # latency of cases is observed by controller
+    adaptive.observe(timer())
+
+
 class ThreadingSuiteGroup(runnable.RunnableGroup):
 
     def __run__(self, result):
         self._is_run = True
 
-        pool = ThreadPool(
-            get_pool_size_of_value(self.config.ASYNC_SUITES),
+        queue = get_executor(self.config).queue(
+            quota=get_pool_size_of_value(self.config.ASYNC_SUITES),
         )
 
-        try:
-            for suite in self.objects:
-                pool.apply_async(target, args=(suite, result))
+        for suite in get_schedule(self.objects, self.config):
+            queue.submit_with_lock(resources.lock_of_suite(suite), target, suite, result)
 
-            pool.close()
-            pool.join()
-        except ALLOW_RAISED_EXCEPTIONS:
-            pool.terminate()
-            raise
+        queue.join()
 
 
 class ThreadingCaseGroup(runnable.RunnableGroup):
@@ -38,16 +42,11 @@ class ThreadingCaseGroup(runnable.RunnableGroup):
     def __run__(self, result):
         self._is_run = True
 
-        pool = ThreadPool(
-            get_pool_size_of_value(self.config.ASYNC_TESTS, in_two=True),
+        queue = get_executor(self.config).queue(
+            quota=get_pool_size_of_value(self.config.ASYNC_TESTS, in_two=True),
         )
 
-        try:
-            for case in self.objects:
-                pool.apply_async(target, args=(case, result))
+        for case in get_schedule(self.objects, self.config):
+            queue.submit_with_lock(resources.lock_of_case(case), target_of_case, case, result)
 
-            pool.close()
-            pool.join()
-        except ALLOW_RAISED_EXCEPTIONS:
-            pool.terminate()
-            raise
+        queue.join()
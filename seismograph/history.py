@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+"""
+Runtime history of suites and cases from previous runs.
+Groups are using it for scheduling of the longest work first.
+"""
+
+import os
+import json
+import logging
+
+from . import runnable
+from .suite import Suite
+from .case import CaseBox
+
+
+logger = logging.getLogger(__name__)
+
+
+SUITES_KEY = 'suites'
+CASES_KEY = 'cases'
+
+
+_HISTORY = {}
+
+
+def _get_case_key(class_name, method_name):
+    return '{}.{}'.format(class_name, method_name)
+
+
+def _empty():
+    return {
+        SUITES_KEY: {},
+        CASES_KEY: {},
+    }
+
+
+def load(file_path):
+    if file_path in _HISTORY:
+        return _HISTORY[file_path]
+
+    data = _empty()
+
+    if os.path.isfile(file_path):
+        logger.debug(
+            'Load runtime history from "{}"'.format(file_path),
+        )
+
+        try:
+            with open(file_path) as fp:
+                data.update(json.load(fp))
+        except ValueError:
+            logger.warning(
+                'Runtime history "{}" is broken and will be rewritten'.format(file_path),
+            )
+
+    _HISTORY[file_path] = data
+
+    return data
+
+
+def save(file_path, result):
+    """
+    Update history file by runtime of suites
+    and cases from the result of current run.
+    """
+    data = load(file_path)
+
+    for result_proxy in result.proxies:
+        data[SUITES_KEY][result_proxy.name] = result_proxy.get_state().runtime
+
+    for storage in (result.errors, result.skipped, result.failures, result.successes):
+        for _, xunit_data in storage:
+            data[CASES_KEY][
+                _get_case_key(xunit_data.class_name, xunit_data.method_name)
+            ] = xunit_data.runtime
+
+    logger.debug(
+        'Save runtime history to "{}"'.format(file_path),
+    )
+
+    tmp_path = '{}.tmp'.format(file_path)
+
+    with open(tmp_path, 'w') as fp:
+        json.dump(data, fp, indent=2, sort_keys=True)
+
+    os.rename(tmp_path, file_path)
+
+
+def get_runtime(data, runnable_object):
+    """
+    Get predicted runtime for suite, case box or case.
+    None will be returned if runnable object is unknown.
+    """
+    if isinstance(runnable_object, CaseBox):
+        runtimes = [get_runtime(data, case) for case in runnable_object]
+
+        if None in runtimes:
+            return None
+
+        return sum(runtimes)
+
+    if isinstance(runnable_object, Suite):
+        runtime = data[SUITES_KEY].get(runnable.class_name(runnable_object))
+
+        if runtime is None:
+            runtimes = [get_runtime(data, case) for case in runnable_object]
+
+            if runtimes and None not in runtimes:
+                runtime = sum(runtimes)
+
+        return runtime
+
+    return data[CASES_KEY].get(
+        _get_case_key(
+            runnable.class_name(runnable_object),
+            runnable.method_name(runnable_object),
+        ),
+    )
+
+
+def sort_by_runtime(objects, file_path):
+    """
+    Longest processing time first.
+    Objects without history are going first
+    because their runtime is unpredictable.
+    """
+    data = load(file_path)
+
+    unknown = []
+    known = []
+
+    for obj in objects:
+        runtime = get_runtime(data, obj)
+
+        if runtime is None:
+            unknown.append(obj)
+        else:
+            known.append((runtime, obj))
+
+    known.sort(key=lambda item: item[0], reverse=True)
+
+    return unknown + [obj for _, obj in known]
@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+
+"""
+Load mode of program.
+Selected cases are run by virtual users for duration of load.
+Latency of each iteration and of each step goes to histograms
+instead of records of result, so memory is not growing with
+number of iterations.
+"""
+
+import os
+import sys
+import json
+import logging
+import traceback
+from collections import defaultdict
+from timeit import default_timer
+
+from .exceptions import Skip
+
+
+logger = logging.getLogger(__name__)
+
+
+# values are counted in microseconds,
+# relative error of histogram is less than 1%
+# (1 / 2 ** (SUB_BUCKET_BITS - 1) is about 0.8%)
+UNIT = 1000000
+SUB_BUCKET_BITS = 8
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF_BITS = SUB_BUCKET_BITS - 1
+
+PERCENTILES = (50, 90, 95, 99, 99.9)
+
+ITERATIONS = 'load_iterations'
+ERRORS = 'load_errors'
+RATE = 'load_rate'
+P50 = 'load_p50'
+P95 = 'load_p95'
+P99 = 'load_p99'
+MAX = 'load_max'
+
+
+_stats = {}
+_info = {}
+
+
+def get_bucket(value):
+    if value < SUB_BUCKET_COUNT:
+        return value
+
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return (shift << SUB_BUCKET_HALF_BITS) + (value >> shift)
+
+
+def get_lowest_value(bucket):
+    if bucket < SUB_BUCKET_COUNT:
+        return bucket
+
+    shift = (bucket >> SUB_BUCKET_HALF_BITS) - 1
+    return (bucket - (shift << SUB_BUCKET_HALF_BITS)) << shift
+
+
+def get_highest_value(bucket):
+    return get_lowest_value(bucket + 1) - 1
+
+
+class Histogram(object):
+    """
+    Log-linear histogram in HDR style.
+    Buckets are growing with value, so histogram is
+    small for any range of values and can be merged.
+    """
+
+    def __init__(self):
+        self.__counts = defaultdict(int)
+        self.__count = 0
+        self.__total = 0
+        self.__min = None
+        self.__max = 0
+
+    @property
+    def count(self):
+        return self.__count
+
+    @property
+    def min(self):
+        if self.__min is None:
+            return None
+        return float(self.__min) / UNIT
+
+    @property
+    def max(self):
+        if not self.__count:
+            return None
+        return float(self.__max) / UNIT
+
+    @property
+    def mean(self):
+        if not self.__count:
+            return None
+        return float(self.__total) / self.__count / UNIT
+
+    def record(self, seconds):
+        value = max(int(seconds * UNIT), 0)
+
+        self.__counts[get_bucket(value)] += 1
+        self.__count += 1
+        self.__total += value
+
+        if self.__min is None or value < self.__min:
+            self.__min = value
+
+        if value > self.__max:
+            self.__max = value
+
+    def merge(self, other):
+        for bucket, count in other.__counts.items():
+            self.__counts[bucket] += count
+
+        self.__count += other.__count
+        self.__total += other.__total
+
+        if other.__min is not None and (self.__min is None or other.__min < self.__min):
+            self.__min = other.__min
+
+        self.__max = max(self.__max, other.__max)
+
+    def percentile(self, percent):
+        if not self.__count:
+            return None
+
+        rank = max(percent / 100.0 * self.__count, 1)
+        seen = 0
+
+        for bucket in sorted(self.__counts):
+            seen += self.__counts[bucket]
+
+            if seen >= rank:
+                value = min(get_highest_value(bucket), self.__max)
+                return float(value) / UNIT
+
+        return float(self.__max) / UNIT
+
+    def to_dict(self):
+        return {
+            'count': self.__count,
+            'total': self.__total,
+            'min': self.__min,
+            'max': self.__max,
+            'buckets': dict((str(b), c) for b, c in self.__counts.items()),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+
+        histogram.__count = data['count']
+        histogram.__total = data['total']
+        histogram.__min = data['min']
+        histogram.__max = data['max']
+
+        for bucket, count in data['buckets'].items():
+            histogram.__counts[int(bucket)] = count
+
+        return histogram
+
+
+class Stats(object):
+    """
+    Latency and errors of one name
+    """
+
+    def __init__(self):
+        self.histogram = Histogram()
+        self.errors = 0
+        self.first_error = None
+
+    def add_error(self, exc, tb):
+        self.errors += 1
+
+        if self.first_error is None:
+            self.first_error = (exc, tb)
+
+    def merge(self, other):
+        self.histogram.merge(other.histogram)
+        self.errors += other.errors
+
+        if self.first_error is None:
+            self.first_error = other.first_error
+
+
+class Measurement(object):
+
+    __slots__ = ('__recorder', '__name', '__args', '__start')
+
+    def __init__(self, recorder, name, args):
+        self.__recorder = recorder
+        self.__name = name
+        self.__args = args
+        self.__start = None
+
+    def __enter__(self):
+        self.__start = default_timer()
+
+    def __exit__(self, exc_type, exc, tb):
+        runtime = default_timer() - self.__start
+
+        if exc_type is not None and issubclass(exc_type, Skip):
+            return
+
+        name = self.__name.format(*self.__args) if self.__args else self.__name
+        stats = self.__recorder.get(name)
+
+        stats.histogram.record(runtime)
+
+        if exc_type is not None:
+            stats.add_error(exc, ''.join(traceback.format_exception(exc_type, exc, tb)))
+
+
+class NullMeasurement(object):
+
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *args, **kwargs):
+        pass
+
+
+NULL_MEASUREMENT = NullMeasurement()
+
+
+class Recorder(object):
+    """
+    Stats of one virtual user.
+    Users are not sharing recorder,
+    so recording does not need a lock.
+    """
+
+    def __init__(self):
+        self.stats = {}
+
+    def get(self, name):
+        try:
+            return self.stats[name]
+        except KeyError:
+            stats = self.stats[name] = Stats()
+            return stats
+
+    def measure(self, name, *args):
+        """
+        Context manager of measured block.
+        Name is formatted by args on exit only.
+        """
+        return Measurement(self, name, args)
+
+    def merge(self, other):
+        for name, stats in other.stats.items():
+            self.get(name).merge(stats)
+
+
+def get_iteration_name(class_name, method_name):
+    return '{}:{}'.format(class_name, method_name)
+
+
+def measure_step(case, step_name):
+    """
+    Step is measured if case is run by virtual user
+    """
+    recorder = getattr(case, '_load_recorder', None)
+
+    if recorder is None:
+        return NULL_MEASUREMENT
+
+    return recorder.measure('{}:{}.{}', case.__class_name__(), case._method_name, step_name)
+
+
+def clear():
+    _stats.clear()
+    _info.clear()
+
+
+def collect(recorders, **info):
+    """
+    Merge recorders of users to stats of program
+    """
+    for recorder in recorders:
+        for name, stats in recorder.stats.items():
+            _stats.setdefault(name, Stats()).merge(stats)
+
+    _info.update(info)
+
+    return _stats
+
+
+def get_stats(name=None):
+    if name is None:
+        return _stats
+    return _stats.get(name)
+
+
+def get_summary(stats, duration):
+    histogram = stats.histogram
+
+    return {
+        ITERATIONS: histogram.count,
+        ERRORS: stats.errors,
+        RATE: float(histogram.count) / duration if duration else None,
+        P50: histogram.percentile(50),
+        P95: histogram.percentile(95),
+        P99: histogram.percentile(99),
+        MAX: histogram.max,
+    }
+
+
+def export(file_path):
+    duration = _info.get('duration')
+    data = {
+        'info': _info,
+        'stats': {},
+    }
+
+    for name, stats in _stats.items():
+        histogram = stats.histogram
+
+        data['stats'][name] = {
+            'count': histogram.count,
+            'errors': stats.errors,
+            'rate': float(histogram.count) / duration if duration else None,
+            'min': histogram.min,
+            'mean': histogram.mean,
+            'max': histogram.max,
+            'percentiles': dict(
+                (str(p), histogram.percentile(p)) for p in PERCENTILES
+            ),
+            'histogram': histogram.to_dict(),
+        }
+
+    logger.debug(
+        'Export stats of load to "{}"'.format(file_path),
+    )
+
+    tmp_path = '{}.tmp'.format(file_path)
+
+    with open(tmp_path, 'w') as fp:
+        json.dump(data, fp, indent=2, sort_keys=True)
+
+    os.rename(tmp_path, file_path)
+
+
+def format_time(value):
+    if value is None:
+        return '-'
+    return '{:.6f}'.format(value)
+
+
+def print_report(stream=None):
+    stream = stream or sys.stdout
+
+    if not _stats:
+        return
+
+    duration = _info.get('duration')
+    header = ('name', 'count', 'errors', 'rate', 'min', 'mean') + tuple(
+        'p{:g}'.format(p) for p in PERCENTILES
+    ) + ('max', )
+    rows = []
+
+    for name, stats in sorted(_stats.items()):
+        histogram = stats.histogram
+
+        rows.append((
+            name,
+            str(histogram.count),
+            str(stats.errors),
+            '{:.1f}/s'.format(histogram.count / duration) if duration else '-',
+            format_time(histogram.min),
+            format_time(histogram.mean),
+        ) + tuple(
+            format_time(histogram.percentile(p)) for p in PERCENTILES
+        ) + (
+            format_time(histogram.max),
+        ))
+
+    widths = [
+        max(len(row[i]) for row in rows + [header]) for i in range(len(header))
+    ]
+
+    stream.write(
+        '\nLoad: {} users for {:.1f}s\n'.format(_info.get('users', '-'), duration or 0.0),
+    )
+
+    for row in [header] + rows:
+        stream.write(
+            '  {}\n'.format('  '.join(v.ljust(w) for v, w in zip(row, widths))),
+        )
+
+    stream.write('\n')
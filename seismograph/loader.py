@@ -86,16 +86,26 @@ def load_tests_from_case(
         box_class=None,
         method_name=None,
         test_name_prefix=None,
-        default_test_name=None):
+        default_test_name=None,
+        descriptor_class=None):
+    """
+    :param descriptor_class: descriptors of tests will be
+      loaded instead of cases if it's given
+    """
     logger.debug(
         'Load test from case "{}.{}"'.format(
             cls.__module__, cls.__name__,
         ),
     )
 
+    def create(name):
+        if descriptor_class:
+            return descriptor_class(cls, name, config=config)
+        return cls(name, config=config)
+
     if method_name:
         for name in filter(lambda n: n == method_name, dir(cls)):
-            case = cls(name, config=config)
+            case = create(name)
             if box_class:
                 yield box_class((case, ))
             else:
@@ -119,13 +129,13 @@ def load_tests_from_case(
 
             for name in names:
                 cases.append(
-                    cls(name, config=config)
+                    create(name)
                 )
 
             yield box_class(cases)
         else:
             for name in names:
-                yield cls(name, config=config)
+                yield create(name)
 
 
 def load_suite_by_name(name, suites):
@@ -169,7 +179,13 @@ def load_suites_from_module(module, suite_class):
             yield value
 
 
-def load_suites_from_path(path_to_dir, suite_class, package=None, recursive=True):
+def load_suites_from_path(path_to_dir, suite_class, package=None, recursive=True, index=None, is_selected=None):
+    """
+    :param index: discovery index, module will not be imported
+      if names of suites are known from it and nothing is selected
+    :param is_selected: function which gets names of suites
+      from module and returns bool
+    """
     logger.debug(
         'Load suites from path "{}"'.format(path_to_dir),
     )
@@ -182,9 +198,24 @@ def load_suites_from_path(path_to_dir, suite_class, package=None, recursive=True
     modules = (n.replace('.py', '') for n in lst_dir if is_py_module(n))
 
     for module_name in modules:
+        if index is not None:
+            file_path = full_path('{}.py'.format(module_name))
+            full_module_name = '{}.{}'.format(package, module_name) if package else module_name
+            suite_names = index.get(file_path, full_module_name)
+
+            if suite_names is not None and is_selected and not is_selected(suite_names):
+                logger.debug(
+                    'Module "{}" is skipped by discovery index'.format(full_module_name),
+                )
+                continue
+
         module = load_module(module_name, package=package)
+        suites = list(load_suites_from_module(module, suite_class))
+
+        if index is not None:
+            index.update(file_path, full_module_name, suites)
 
-        for suite in load_suites_from_module(module, suite_class):
+        for suite in suites:
             yield suite
 
     if recursive:
@@ -196,7 +227,9 @@ def load_suites_from_path(path_to_dir, suite_class, package=None, recursive=True
                     full_path(pack),
                     suite_class,
                     recursive=recursive,
-                    package='{}.{}'.format(package, pack) if package else pack):
+                    package='{}.{}'.format(package, pack) if package else pack,
+                    index=index,
+                    is_selected=is_selected):
                 yield suite
 
 
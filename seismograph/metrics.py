@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+"""
+Metrics of case run.
+Case is measured by phases with --metrics option,
+values are going to record of result and xunit report.
+"""
+
+import time
+import logging
+from timeit import default_timer
+
+from .utils import pyv
+
+
+logger = logging.getLogger(__name__)
+
+
+ROUND_METRICS = 6
+
+# phases, values are wall time in seconds
+SETUP = 'setup'
+TEST = 'test'
+TEARDOWN = 'teardown'
+# hook of layer, name of class and hook are formatted in
+LAYER = 'layer {}.{}'
+
+# totals of case
+WALL = 'wall'
+CPU = 'cpu'
+# wall time which is not counted by phases
+OVERHEAD = 'overhead'
+# peak of allocated bytes, with --metrics-memory option only
+MEMORY_PEAK = 'memory_peak'
+
+
+if hasattr(time, 'thread_time'):
+    # cases of threading groups are not mixed
+    cpu_timer = time.thread_time
+elif hasattr(time, 'process_time'):
+    cpu_timer = time.process_time
+else:  # please python 2
+    cpu_timer = time.clock
+
+
+_tracemalloc = None
+
+
+def start_memory_tracing():
+    global _tracemalloc
+
+    if pyv.IS_PYTHON_2:
+        logger.warning('Memory metrics are not supported on python 2')
+        return
+
+    import tracemalloc
+
+    if not hasattr(tracemalloc, 'reset_peak'):
+        logger.warning('Memory metrics are supported from python 3.9')
+        return
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    _tracemalloc = tracemalloc
+
+
+class Phase(object):
+
+    __slots__ = ('__metrics', '__name', '__args', '__start')
+
+    def __init__(self, metrics, name, args):
+        self.__metrics = metrics
+        self.__name = name
+        self.__args = args
+        self.__start = None
+
+    def __enter__(self):
+        self.__start = default_timer()
+
+    def __exit__(self, *args, **kwargs):
+        name = self.__name.format(*self.__args) if self.__args else self.__name
+        self.__metrics.add(name, default_timer() - self.__start)
+
+
+class NullPhase(object):
+
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *args, **kwargs):
+        pass
+
+
+NULL_PHASE = NullPhase()
+
+
+class Metrics(object):
+    """
+    Measurement of one run of case.
+    Values are taken on to_dict, so phases
+    which are going after record of result
+    (teardown of failed case) are not counted.
+    """
+
+    def __init__(self):
+        self.__phases = {}
+        self.__values = {}
+
+        self.__wall = default_timer()
+        self.__cpu = cpu_timer()
+        self.__memory = None
+
+        if _tracemalloc is not None:
+            # peak is global for process, so it's
+            # exact if cases are not run concurrently
+            _tracemalloc.reset_peak()
+            self.__memory = _tracemalloc.get_traced_memory()[0]
+
+    @property
+    def phases(self):
+        return self.__phases
+
+    def measure(self, name, *args):
+        """
+        Context manager for adding time of phase.
+        Name is formatted by args on exit only.
+        """
+        return Phase(self, name, args)
+
+    def add(self, name, value):
+        self.__phases[name] = self.__phases.get(name, 0.0) + value
+
+    def set(self, name, value):
+        """
+        Value which is not a phase of case
+        """
+        self.__values[name] = value
+
+    def to_dict(self):
+        wall = default_timer() - self.__wall
+
+        data = dict(
+            (name, round(value, ROUND_METRICS))
+            for name, value in self.__phases.items()
+        )
+
+        data[WALL] = round(wall, ROUND_METRICS)
+        data[CPU] = round(cpu_timer() - self.__cpu, ROUND_METRICS)
+        data[OVERHEAD] = round(max(wall - sum(self.__phases.values()), 0.0), ROUND_METRICS)
+
+        if self.__memory is not None:
+            data[MEMORY_PEAK] = max(_tracemalloc.get_traced_memory()[1] - self.__memory, 0)
+
+        data.update(self.__values)
+
+        return data
+
+
+class NullMetrics(object):
+    """
+    Case is not measured
+    """
+
+    __slots__ = ()
+
+    def measure(self, name, *args):
+        return NULL_PHASE
+
+    def add(self, name, value):
+        pass
+
+    def set(self, name, value):
+        pass
+
+    def to_dict(self):
+        return None
+
+
+NULL = NullMetrics()
+
+
+def create(config):
+    # statistic of benchmark and load is going with metrics
+    if config is not None and (
+            config.METRICS or config.METRICS_MEMORY or config.BENCHMARK or config.LOAD):
+        return Metrics()
+    return NULL
+
+
+def of(runnable_object):
+    return getattr(runnable_object, '_metrics', NULL)
@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+
+"""
+Profiling of cases with --profile option.
+Stats of each case are dumped to directory of its suite,
+so workers of multiprocessing are writing them by self and
+report is merged from files when program is done.
+"""
+
+import os
+import re
+import sys
+import time
+import pstats
+import logging
+import itertools
+import threading
+from collections import defaultdict
+
+try:
+    import cProfile as _profile
+except ImportError:  # please pypy
+    import profile as _profile
+
+from . import case as _case
+from .layers import CaseLayer
+
+
+logger = logging.getLogger(__name__)
+
+
+CPROFILE = 'cprofile'
+SAMPLING = 'sampling'
+
+MODES = (
+    CPROFILE,
+    SAMPLING,
+)
+
+STATS_EXTENSION = '.pstats'
+PROGRAM_STATS = 'program' + STATS_EXTENSION
+
+UNSAFE_SYMBOLS_REGEXP = re.compile(r'[^\w.-]+')
+
+
+_counter = itertools.count()
+
+
+def safe_name(name):
+    return UNSAFE_SYMBOLS_REGEXP.sub('_', name)
+
+
+def get_thread_ident():
+    if hasattr(threading, 'get_ident'):
+        return threading.get_ident()
+    return threading.current_thread().ident  # please python 2
+
+
+class Sampler(object):
+    """
+    Statistic profiler of one thread.
+    Stacks are taken by SamplingThread, so profiled code
+    is not slowed down by tracing. Object is compatible with
+    pstats.Stats, numbers of calls are numbers of samples.
+    """
+
+    def __init__(self, thread_ident, base_frame, interval):
+        self.stats = {}
+
+        self.__interval = interval
+        self.__thread_ident = thread_ident
+        self.__stacks = defaultdict(int)
+
+        # frames of runner are not part of case
+        self.__base_frames = set()
+
+        while base_frame is not None:
+            self.__base_frames.add(base_frame)
+            base_frame = base_frame.f_back
+
+    @property
+    def thread_ident(self):
+        return self.__thread_ident
+
+    @property
+    def is_empty(self):
+        return not self.__stacks
+
+    @staticmethod
+    def get_func(frame):
+        code = frame.f_code
+        return code.co_filename, code.co_firstlineno, code.co_name
+
+    def sample(self, frame):
+        stack = []
+
+        while frame is not None and frame not in self.__base_frames:
+            stack.append(self.get_func(frame))
+            frame = frame.f_back
+
+        if stack:
+            self.__stacks[tuple(stack)] += 1
+
+    def create_stats(self):
+        stats = {}
+
+        for stack, count in self.__stacks.items():
+            runtime = count * self.__interval
+            seen = set()
+
+            # stack is starting from the innermost frame
+            for index, func in enumerate(stack):
+                entry = stats.setdefault(func, [0, 0, 0.0, 0.0, {}])
+
+                if index == 0:
+                    entry[2] += runtime
+
+                # cumulative time of recursive function
+                # is counted by the outer frame only
+                if func in seen:
+                    continue
+
+                seen.add(func)
+
+                entry[0] += count
+                entry[1] += count
+                entry[3] += runtime
+
+                if index + 1 < len(stack):
+                    caller = stack[index + 1]
+                    cc, nc, tt, ct = entry[4].get(caller, (0, 0, 0.0, 0.0))
+                    entry[4][caller] = (
+                        cc + count,
+                        nc + count,
+                        tt + (runtime if index == 0 else 0.0),
+                        ct + runtime,
+                    )
+
+        self.stats = dict((func, tuple(entry)) for func, entry in stats.items())
+
+
+class SamplingThread(threading.Thread):
+    """
+    One thread is sampling all of profiled threads of process
+    """
+
+    def __init__(self, interval):
+        super(SamplingThread, self).__init__()
+
+        self.daemon = True
+        self.interval = interval
+
+        self.__lock = threading.Lock()
+        self.__samplers = {}
+
+    def add(self, sampler):
+        with self.__lock:
+            self.__samplers[sampler.thread_ident] = sampler
+
+    def remove(self, thread_ident):
+        with self.__lock:
+            self.__samplers.pop(thread_ident, None)
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+
+            with self.__lock:
+                samplers = list(self.__samplers.values())
+
+            if not samplers:
+                continue
+
+            frames = sys._current_frames()
+
+            for sampler in samplers:
+                frame = frames.get(sampler.thread_ident)
+
+                if frame is not None:
+                    sampler.sample(frame)
+
+
+class ProfileCaseLayer(CaseLayer):
+    """
+    Case is profiled from setup of layers till teardown.
+    Only one case of thread is profiled at the same time,
+    concurrent cases of the same event loop are skipped.
+    """
+
+    def __init__(self, directory=None, mode=CPROFILE, interval=0.005):
+        super(ProfileCaseLayer, self).__init__()
+
+        self.__lock = threading.Lock()
+        # state of profiled cases is changed from several threads
+        self.__state_lock = threading.Lock()
+        # case id -> (thread ident, profile)
+        self.__active = {}
+        # threads which have profiled case
+        self.__busy_threads = set()
+        self.__sampling_thread = None
+        self.__sampling_pid = None
+
+        self.configure(directory, mode=mode, interval=interval)
+
+    def configure(self, directory, mode=CPROFILE, interval=0.005):
+        if mode not in MODES:
+            raise ValueError(
+                'Unknown profile mode "{}". Allowed: {}'.format(mode, ', '.join(MODES)),
+            )
+
+        self.directory = directory
+        self.mode = mode
+        self.interval = interval
+
+    def __get_sampling_thread(self):
+        with self.__lock:
+            # thread is not living in forked worker
+            if self.__sampling_pid != os.getpid():
+                self.__sampling_thread = SamplingThread(self.interval)
+                self.__sampling_thread.start()
+                self.__sampling_pid = os.getpid()
+
+            return self.__sampling_thread
+
+    def __start(self, thread_ident):
+        if self.mode == SAMPLING:
+            # frame of hook is the base, caller of layers is above it
+            sampler = Sampler(thread_ident, sys._getframe(2), self.interval)
+            self.__get_sampling_thread().add(sampler)
+            return sampler
+
+        profile = _profile.Profile()
+
+        try:
+            profile.enable()
+        except ValueError:
+            # python 3.12 allows one active profiler only
+            logger.warning(
+                'Case can not be profiled while other profiler is active', exc_info=True,
+            )
+            return None
+
+        return profile
+
+    def __stop(self, case):
+        with self.__state_lock:
+            active = self.__active.pop(id(case), None)
+
+            if active is None:
+                return
+
+            thread_ident, profile = active
+            self.__busy_threads.discard(thread_ident)
+
+        if self.mode == SAMPLING:
+            self.__get_sampling_thread().remove(thread_ident)
+
+            # case was faster than interval
+            if profile.is_empty:
+                return
+        else:
+            profile.disable()
+
+        try:
+            self.dump(case, pstats.Stats(profile))
+        except BaseException:
+            logger.warning(
+                'Stats of case "{}" can not be dumped'.format(case), exc_info=True,
+            )
+
+    def dump(self, case, stats):
+        directory = os.path.join(
+            self.directory, safe_name(case.__mount_data__.suite_name),
+        )
+
+        try:
+            os.makedirs(directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+
+        file_name = '{}.{}.{}.{}{}'.format(
+            safe_name(case.__class__.__name__),
+            safe_name(case._method_name),
+            os.getpid(),
+            next(_counter),
+            STATS_EXTENSION,
+        )
+
+        stats.dump_stats(os.path.join(directory, file_name))
+
+    def on_setup(self, case):
+        thread_ident = get_thread_ident()
+
+        with self.__state_lock:
+            if thread_ident in self.__busy_threads:
+                return
+
+            self.__busy_threads.add(thread_ident)
+
+        profile = self.__start(thread_ident)
+
+        with self.__state_lock:
+            if profile is None:
+                self.__busy_threads.discard(thread_ident)
+            else:
+                self.__active[id(case)] = (thread_ident, profile)
+
+    def on_teardown(self, case):
+        self.__stop(case)
+
+    def on_any_error(self, error, case, result, tb, timer):
+        # teardown is not called if context was not started
+        self.__stop(case)
+
+
+_layer = None
+
+
+def clear_stats(directory):
+    for root, _, file_names in os.walk(directory):
+        for file_name in file_names:
+            if file_name.endswith(STATS_EXTENSION):
+                os.remove(os.path.join(root, file_name))
+
+
+def install(config):
+    """
+    Stats of previous run are removed from directory
+    """
+    global _layer
+
+    clear_stats(config.PROFILE)
+
+    if _layer is None:
+        _layer = ProfileCaseLayer()
+        _case.DEFAULT_LAYERS.append(_layer)
+        _case.changed_layers()
+
+    _layer.configure(
+        config.PROFILE,
+        mode=config.PROFILE_MODE,
+        interval=config.PROFILE_INTERVAL,
+    )
+
+    return _layer
+
+
+def get_stats_files(directory):
+    """
+    Stats files by names of suites
+    """
+    stats_files = {}
+
+    if not os.path.isdir(directory):
+        return stats_files
+
+    for suite_name in sorted(os.listdir(directory)):
+        suite_directory = os.path.join(directory, suite_name)
+
+        if not os.path.isdir(suite_directory):
+            continue
+
+        file_paths = [
+            os.path.join(suite_directory, file_name)
+            for file_name in sorted(os.listdir(suite_directory))
+            if file_name.endswith(STATS_EXTENSION)
+        ]
+
+        if file_paths:
+            stats_files[suite_name] = file_paths
+
+    return stats_files
+
+
+def print_report(directory, limit=20, stream=None):
+    """
+    Print top of cumulative functions by suites
+    and save merged stats of program to directory
+    """
+    stream = stream or sys.stdout
+    stats_files = get_stats_files(directory)
+
+    if not stats_files:
+        stream.write('\nProfile: no stats in "{}"\n'.format(directory))
+        return
+
+    stream.write('\nProfile by suites:\n')
+
+    for suite_name, file_paths in sorted(stats_files.items()):
+        stream.write('\n{} ({} stats files)\n'.format(suite_name, len(file_paths)))
+
+        stats = pstats.Stats(*file_paths, stream=stream)
+        # list of files is too long for report
+        stats.files = []
+        stats.sort_stats('cumulative').print_stats(limit)
+
+    program_stats = pstats.Stats(
+        *itertools.chain.from_iterable(stats_files.values())
+    )
+    program_stats.dump_stats(os.path.join(directory, PROGRAM_STATS))
+
+    stream.write(
+        'Merged stats of program: {}\n\n'.format(os.path.join(directory, PROGRAM_STATS)),
+    )
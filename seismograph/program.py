@@ -8,6 +8,11 @@ import traceback
 from . import ext
 from . import config
 from . import loader
+from . import tracer
+from . import metrics
+from . import load
+from . import benchmark
+from . import startup
 from . import runnable
 from .utils import pyv
 from . import collector
@@ -16,8 +21,11 @@ from .suite import Suite
 from .result import Result
 from .utils.common import measure_time
 from .utils.common import call_to_chain
+from .groups import adaptive
+from .groups import executor
 from .groups.default import DefaultSuiteGroup
 from .exceptions import ALLOW_RAISED_EXCEPTIONS
+from .exceptions import ConfigError
 from .exceptions import ExtensionNotRequired
 
 
@@ -35,6 +43,7 @@ class ProgramContext(runnable.ContextOfRunnableObject):
         self.__require = []
 
         self.__extensions = {}
+        self.__pooled = []
 
         self.__setup_callbacks = [setup]
         self.__teardown_callbacks = [teardown]
@@ -70,9 +79,24 @@ class ProgramContext(runnable.ContextOfRunnableObject):
 
     def install_extensions(self):
         for ext_name in self.__require:
-            if ext_name not in self.__extensions:
+            if ext_name in self.__extensions or ext_name in self.__pooled:
+                continue
+
+            if extensions.is_pooled(ext_name):
+                self.__pooled.append(ext_name)
+            else:
                 self.__extensions[ext_name] = extensions.get(ext_name)
 
+    def acquire_extensions(self, program):
+        extensions.acquire(
+            self.__pooled, self.__extensions, program, level=extensions.SCOPE_PROGRAM,
+        )
+
+    def release_extensions(self, program):
+        extensions.release(
+            self.__pooled, self.__extensions, program, level=extensions.SCOPE_PROGRAM,
+        )
+
     def start_context(self, program):
         logger.debug(
             'Start context of program "{}"'.format(
@@ -178,7 +202,8 @@ class Program(runnable.RunnableObject):
         self.__context.install_extensions()
 
         if self.suites_path:
-            self.load_suites()
+            with startup.measure(startup.DISCOVERY):
+                self.load_suites()
 
         if not self.__suites and not self.__scripts:
             raise RuntimeError(
@@ -189,13 +214,41 @@ class Program(runnable.RunnableObject):
             self.__suites, self.__config,
         )
 
+        if self.__config.PROFILE_STARTUP:
+            # suites are building on first iteration
+            with startup.measure(startup.BUILD):
+                self.__suites = list(self.__suites)
+
+            startup.print_report()
+
         if self.__config.TREE:
             from .tree import print_tree
             print_tree(self.__suites)
 
+        if self.__config.METRICS_MEMORY:
+            metrics.start_memory_tracing()
+
+        if self.__config.PROFILE:
+            from . import profiler
+            profiler.install(self.__config)
+
+        if self.__config.TRACE:
+            tracer.enable(self.__config.TRACE)
+
+        if self.__config.BENCHMARK:
+            if self.__config.BENCHMARK_SAVE and not self.__config.BENCHMARK_BASELINE:
+                raise ConfigError(
+                    'Path to baseline of benchmark is not given',
+                )
+
+            benchmark.load_baseline(self.__config.BENCHMARK_BASELINE)
+
+        if self.__config.ADAPTIVE or self.__config.MEMORY_LIMIT:
+            adaptive.start(self.__config)
+
         group = self._make_group()
 
-        with self.__result:
+        with self.__result, runnable.trace(self, tracer.PROGRAM):
             try:
                 self.__context.on_run(self)
 
@@ -215,6 +268,34 @@ class Program(runnable.RunnableObject):
                     self, tb, timer(), error,
                 )
 
+        # cases are created on demand while
+        # suites are running, it's safe from here
+        extensions.clear()
+        executor.shutdown()
+        adaptive.stop()
+
+        if self.__config.TRACE:
+            tracer.save()
+            tracer.disable()
+
+        if self.__config.BENCHMARK:
+            benchmark.print_report(self.__result)
+
+            if self.__config.BENCHMARK_SAVE:
+                benchmark.save_baseline(self.__config.BENCHMARK_BASELINE, self.__result)
+
+        if self.__config.LOAD:
+            load.print_report()
+
+            if self.__config.LOAD_REPORT:
+                load.export(self.__config.LOAD_REPORT)
+
+        if self.__config.PROFILE:
+            from . import profiler
+            profiler.print_report(
+                self.__config.PROFILE, limit=self.__config.PROFILE_TOP,
+            )
+
         if self.__exit:
             sys.exit(not self.__result.current_state.was_success)
 
@@ -257,6 +338,8 @@ class Program(runnable.RunnableObject):
         if layers:
             self.__context.add_layers(layers)
 
+        startup.start(startup.CONFIG)
+
         parser = config.create_option_parser()
         self.__context.on_option_parser(parser)
 
@@ -297,6 +380,8 @@ class Program(runnable.RunnableObject):
         if scripts:
             self.register_scripts(scripts)
 
+        startup.stop(startup.CONFIG)
+
         self.__context.on_init(self)
 
     @property
@@ -337,6 +422,17 @@ class Program(runnable.RunnableObject):
                 self.__suites, self.__config,
             )
 
+        if self.config.LOAD:
+            logger.debug(
+                'Use "LoadSuiteGroup" to making suite group',
+            )
+
+            from .groups.load import LoadSuiteGroup
+
+            return LoadSuiteGroup(
+                self.__suites, self.__config,
+            )
+
         if self.config.GEVENT:
             logger.debug(
                 'Use "GeventSuiteGroup" to making suite group',
@@ -348,6 +444,17 @@ class Program(runnable.RunnableObject):
                 self.__suites, self.__config,
             )
 
+        if self.config.ASYNCIO:
+            logger.debug(
+                'Use "AsyncioSuiteGroup" to making suite group',
+            )
+
+            from .groups.asyncio import AsyncioSuiteGroup
+
+            return AsyncioSuiteGroup(
+                self.__suites, self.__config,
+            )
+
         if self.config.THREADING:
             logger.debug(
                 'Use "ThreadingSuiteGroup" to making suite group',
@@ -359,6 +466,15 @@ class Program(runnable.RunnableObject):
                 self.__suites, self.__config,
             )
 
+        if self.config.MULTIPROCESSING and self.config.MP_GRANULARITY == 'case':
+            logger.debug(
+                'Use "DefaultSuiteGroup" to making suite group, cases will be run by processes',
+            )
+
+            return DefaultSuiteGroup(
+                self.__suites, self.__config,
+            )
+
         if self.config.MULTIPROCESSING:
             logger.debug(
                 'Use "MultiprocessingSuiteGroup" to making suite group',
@@ -417,34 +533,64 @@ class Program(runnable.RunnableObject):
         return f
 
     @staticmethod
-    def shared_data(name, data):
-        extensions.set(data, name, is_data=True)
+    def shared_data(name, data, copy=None):
+        """
+        :param copy: "deep", "shallow", "none" or "frozen".
+          Frozen data is read only proxy which is copied on first write.
+        """
+        extensions.set(data, name, is_data=True, copy=copy)
 
     @staticmethod
-    def shared_extension(name, ext, singleton=False, args=None, kwargs=None):
+    def shared_extension(name,
+                         ext,
+                         singleton=False,
+                         args=None,
+                         kwargs=None,
+                         scope=None,
+                         pool_size=None,
+                         idle_timeout=None,
+                         check=None,
+                         close=None):
+        """
+        :param scope: "case", "suite", "worker" or "program".
+          Instance is acquired from pool by context of scope
+          and it's shared by all users of the scope.
+        :param pool_size: max count of instances in pool
+        :param idle_timeout: idle instance is closed after it
+        :param check: health check, it gets instance and returns bool
+        :param close: function for closing of instance
+        """
         extensions.set(
             ext,
             name,
             is_data=False,
             singleton=singleton,
             args=args, kwargs=kwargs,
+            scope=scope,
+            pool_size=pool_size,
+            idle_timeout=idle_timeout,
+            check=check,
+            close=close,
         )
 
-    def suite_is_valid(self, suite):
+    def suite_name_is_valid(self, suite_name):
         is_valid = True
 
         if self.__config.INCLUDE_SUITES_PATTERN:
             is_valid = bool(
-                re.search(self.__config.INCLUDE_SUITES_PATTERN, suite.name),
+                re.search(self.__config.INCLUDE_SUITES_PATTERN, suite_name),
             )
 
         if self.__config.EXCLUDE_SUITE_PATTERN:
             is_valid = not bool(
-                re.search(self.__config.EXCLUDE_SUITE_PATTERN, suite.name),
+                re.search(self.__config.EXCLUDE_SUITE_PATTERN, suite_name),
             )
 
         return is_valid
 
+    def suite_is_valid(self, suite):
+        return self.suite_name_is_valid(suite.name)
+
     def register_scripts(self, scripts):
         for script in scripts:
             self.register_script(script)
@@ -486,14 +632,33 @@ class Program(runnable.RunnableObject):
                 if path not in sys.path:
                     sys.path.append(path)
 
+                index = None
+                is_selected = None
+
+                if self.__config.DISCOVERY_INDEX:
+                    from .discovery import DiscoveryIndex
+
+                    index = DiscoveryIndex(self.__config.DISCOVERY_INDEX)
+                    selected = collector.get_selected_suite_names(self.__config)
+
+                    is_selected = lambda names: any(
+                        (selected is None or n in selected) and self.suite_name_is_valid(n)
+                        for n in names
+                    )
+
                 self.register_suites(
                     loader.load_suites_from_path(
                         path,
                         self.__suite_class__,
                         recursive=self.recursive_load,
+                        index=index,
+                        is_selected=is_selected,
                     ),
                 )
 
+                if index is not None:
+                    index.save()
+
     def run_scripts(self, result=None, run_point=None):
         if run_point:
             scripts = filter(
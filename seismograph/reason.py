@@ -14,7 +14,8 @@ def format_reason_to_output(reason):
 
 class Reason(object):
 
-    def __init__(self, runnable_object, reason, config):
+    def __init__(self, runnable_object, reason, config, state=None):
+        self.__state = state
         self.__config = config
         self.__runnable_object = runnable_object
         self.__reason = pyv.unicode_string(reason)
@@ -32,7 +33,12 @@ class Reason(object):
         return self.__config
 
     def __format_reason__(self):
-        if self.__runnable_object.__create_reason__:
+        if self.__state is not None:
+            formatted_reason = (
+                self.__state[1],
+                self.__reason,
+            )
+        elif self.__runnable_object.__create_reason__:
             formatted_reason = (
                 runnable.reason(self.__runnable_object),
                 self.__reason,
@@ -47,7 +53,10 @@ class Reason(object):
     def __format_reason_to_output__(self):
         tmp = []
 
-        runnable_repr = repr(self.__runnable_object)
+        if self.__state is not None:
+            runnable_repr = self.__state[0]
+        else:
+            runnable_repr = repr(self.__runnable_object)
         sep_line = ''.join(
             '=' for _ in pyv.xrange(
                 len(runnable_repr),
@@ -66,6 +75,23 @@ def create(runnable_object, reason, config=None):
     return Reason(runnable_object, reason, config)
 
 
+def capture(runnable_object, reason, config=None):
+    """
+    Reason of failure which is formatted later.
+    State of runnable object is taken now, because
+    it's changed by next run, strings are joined later.
+    """
+    if runnable_object.__create_reason__:
+        runnable_reason = runnable.reason(runnable_object)
+    else:
+        runnable_reason = u''
+
+    return Reason(
+        runnable_object, reason, config,
+        state=(repr(runnable_object), runnable_reason),
+    )
+
+
 def item(name, desc, *args):
     return u'{} ({}): \n{}\n\n'.format(
         name, desc, u'\n'.join(u'  {}'.format(s) for s in args),
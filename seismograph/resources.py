@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+
+"""
+Named resources of cases and suites.
+Resource is exclusive or shared with capacity. Concurrent groups
+do not run objects together if their resources are conflicting,
+other objects are running in parallel as usual.
+
+    @suite.register(resources=['db.users', resources.shared('mock', 3)])
+    def test_user(case):
+        ...
+
+Resources of suite are held while suite is running,
+its cases are not waiting for them. Suite with resources
+reserves resources of its cases too, so its cases are
+not waiting for others while suite is holding something
+and two suites can not wait for each other. Cases of the
+suite are sharing reserved resources by their capacity.
+"""
+
+import logging
+import threading
+
+from .utils import pyv
+
+
+logger = logging.getLogger(__name__)
+
+
+RESOURCES_ATTRIBUTE_NAME = '__resources__'
+
+
+class Resource(object):
+
+    __slots__ = ('__name', '__capacity')
+
+    def __init__(self, name, capacity=None):
+        if not isinstance(name, pyv.basestring):
+            raise TypeError(
+                'Name of resource should be a string, not "{}"'.format(type(name).__name__),
+            )
+
+        if capacity is not None and capacity < 1:
+            raise ValueError(
+                'Capacity of resource "{}" should be positive'.format(name),
+            )
+
+        self.__name = name
+        self.__capacity = capacity
+
+    def __repr__(self):
+        if self.is_exclusive:
+            return '<Resource {} exclusive>'.format(self.__name)
+        return '<Resource {} capacity={}>'.format(self.__name, self.__capacity)
+
+    def __eq__(self, other):
+        return isinstance(other, Resource) and \
+            (self.__name, self.__capacity) == (other.name, other.capacity)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.__name, self.__capacity))
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+    @property
+    def is_exclusive(self):
+        return self.__capacity is None
+
+
+def exclusive(name):
+    return Resource(name)
+
+
+def shared(name, capacity):
+    return Resource(name, capacity=capacity)
+
+
+def parse(specs):
+    """
+    Resources from declaration.
+    String is a name of exclusive resource.
+    """
+    if not specs:
+        return ()
+
+    if isinstance(specs, (pyv.basestring, Resource)):
+        specs = (specs, )
+
+    resources = []
+
+    for spec in specs:
+        if isinstance(spec, pyv.basestring):
+            spec = exclusive(spec)
+        elif not isinstance(spec, Resource):
+            raise TypeError(
+                'Resource should be a string or Resource, not "{}"'.format(type(spec).__name__),
+            )
+
+        if spec not in resources:
+            resources.append(spec)
+
+    return tuple(resources)
+
+
+def of(runnable_object):
+    """
+    Resources of case, case box or suite.
+    Case box is holding resources of all its cases.
+    """
+    from .case import CaseBox
+    from .case import get_case_class
+
+    if isinstance(runnable_object, CaseBox):
+        resources = []
+
+        for case in runnable_object:
+            resources.extend(r for r in of(case) if r not in resources)
+
+        return tuple(resources)
+
+    return parse(
+        getattr(get_case_class(runnable_object), RESOURCES_ATTRIBUTE_NAME, None),
+    )
+
+
+def get_parent(case):
+    """
+    Name of suite which owns case
+    """
+    from .case import CaseBox
+    from .case import get_case_class
+
+    if isinstance(case, CaseBox):
+        case = next(iter(case), None)
+
+    mount_data = getattr(get_case_class(case), '__mount_data__', None)
+    return getattr(mount_data, 'suite_name', None)
+
+
+class ResourceManager(object):
+    """
+    Holders of resources in process.
+    Resources of one object are acquired all together or none of them.
+    """
+
+    def __init__(self):
+        self.__condition = threading.Condition()
+
+        self.__exclusive = {}
+        self.__shared = {}
+        self.__owners = {}
+        # owner -> manager of reserved resources for its children
+        self.__reservations = {}
+        # child -> parent which has reserved resources for it
+        self.__parents = {}
+
+    def is_free(self, resource):
+        if resource.name in self.__exclusive:
+            return False
+
+        if resource.is_exclusive:
+            return not self.__shared.get(resource.name)
+
+        return self.__shared.get(resource.name, 0) < resource.capacity
+
+    def get_held(self, owner):
+        return self.__owners.get(owner, ())
+
+    def get_reserved(self, owner):
+        reservation = self.__reservations.get(owner)
+        return reservation[1] if reservation else ()
+
+    def try_acquire(self, owner, resources, parent=None, reserved=()):
+        """
+        Reserved resources are taken by whole capacity,
+        they are acquired by children of owner only
+        """
+        with self.__condition:
+            children_manager = None
+
+            if parent is not None:
+                # suite is holding them for own cases
+                held = set(r.name for r in self.get_held(parent))
+                resources = [r for r in resources if r.name not in held]
+
+                if parent in self.__reservations:
+                    children_manager, names = self.__reservations[parent]
+                    names = set(r.name for r in names)
+                    children_resources = [r for r in resources if r.name in names]
+                    resources = [r for r in resources if r.name not in names]
+
+            if not all(self.is_free(r) for r in resources):
+                return False
+
+            if not all(self.is_free(exclusive(r.name)) for r in reserved):
+                return False
+
+            if children_manager is not None:
+                if not children_manager.try_acquire(owner, children_resources):
+                    return False
+
+                self.__parents[owner] = parent
+
+            for resource in resources:
+                if resource.is_exclusive:
+                    self.__exclusive[resource.name] = owner
+                else:
+                    self.__shared[resource.name] = self.__shared.get(resource.name, 0) + 1
+
+            for resource in reserved:
+                self.__exclusive[resource.name] = owner
+
+            self.__owners[owner] = tuple(resources)
+
+            if reserved:
+                self.__reservations[owner] = (ResourceManager(), tuple(reserved))
+
+            return True
+
+    def acquire(self, owner, resources, parent=None, reserved=()):
+        with self.__condition:
+            while not self.try_acquire(owner, resources, parent=parent, reserved=reserved):
+                self.__condition.wait()
+
+    def release(self, owner):
+        with self.__condition:
+            for resource in self.__owners.pop(owner, ()):
+                if resource.is_exclusive:
+                    self.__exclusive.pop(resource.name, None)
+                else:
+                    self.__shared[resource.name] -= 1
+
+                    if not self.__shared[resource.name]:
+                        del self.__shared[resource.name]
+
+            reservation = self.__reservations.pop(owner, None)
+
+            if reservation is not None:
+                for resource in reservation[1]:
+                    self.__exclusive.pop(resource.name, None)
+
+            parent = self.__parents.pop(owner, None)
+
+            if parent in self.__reservations:
+                self.__reservations[parent][0].release(owner)
+
+            self.__condition.notify_all()
+
+
+class Lock(object):
+    """
+    Resources of runnable object for groups
+    """
+
+    __slots__ = ('__owner', '__resources', '__parent', '__reserved', '__manager')
+
+    def __init__(self, owner, resources, parent=None, reserved=(), manager=None):
+        self.__owner = owner
+        self.__resources = resources
+        self.__parent = parent
+        self.__reserved = reserved
+        self.__manager = manager or _manager
+
+    def try_acquire(self):
+        return self.__manager.try_acquire(
+            self.__owner, self.__resources, parent=self.__parent, reserved=self.__reserved,
+        )
+
+    def acquire(self):
+        self.__manager.acquire(
+            self.__owner, self.__resources, parent=self.__parent, reserved=self.__reserved,
+        )
+
+    def release(self):
+        self.__manager.release(self.__owner)
+
+    def __enter__(self):
+        self.acquire()
+
+    def __exit__(self, *args, **kwargs):
+        self.release()
+
+
+_manager = ResourceManager()
+
+
+def get_manager():
+    return _manager
+
+
+def of_cases(suite, resources):
+    """
+    Resources of cases which are not held by suite itself
+    """
+    names = set(r.name for r in resources)
+    reserved = []
+
+    for case in suite:
+        for resource in of(case):
+            if resource.name not in names:
+                names.add(resource.name)
+                reserved.append(resource)
+
+    return tuple(reserved)
+
+
+def lock_of_suite(suite):
+    resources = of(suite)
+
+    if not resources:
+        return None
+
+    return Lock(suite.name, resources, reserved=of_cases(suite, resources))
+
+
+def lock_of_case(case):
+    resources = of(case)
+
+    if not resources:
+        return None
+
+    return Lock(case, resources, parent=get_parent(case))
@@ -3,13 +3,17 @@
 import sys
 import logging
 from threading import Lock
+from itertools import islice
+from collections import OrderedDict
 from contextlib import contextmanager
 
 from . import xunit
 from . import reason
+from . import history
 from . import runnable
 from .utils import pyv
 from .utils import colors
+from .utils import mp
 from .utils.mp import MPSupportedValue
 
 
@@ -63,6 +67,128 @@ def get_runtime_from_storage(storage):
     return rt
 
 
+class ResultStorage(object):
+    """
+    Storage of (runnable object, xunit data) items.
+    It's working as list, but items are indexed by
+    runnable object and runtime of items is counted
+    on adding, so lookups and summary are not scanning.
+    """
+
+    def __init__(self, iterable=None):
+        self.__lock = Lock()
+        self.__sequence = 0
+        self.__runtime = float()
+        self.__items = OrderedDict()
+        # id of runnable object -> sequence numbers of items
+        self.__index = {}
+
+        if iterable:
+            self.extend(iterable)
+
+    def __iter__(self):
+        return iter(list(self.__items.values()))
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __nonzero__(self):
+        return bool(self.__items)
+
+    def __bool__(self):  # please python 3
+        return self.__nonzero__()
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            return list(islice(self.__items.values(), start, stop, step))
+
+        if item < 0:
+            item += len(self)
+
+        if item == len(self) - 1:
+            return self.__items[next(reversed(self.__items))]
+
+        if not 0 <= item < len(self):
+            raise IndexError('storage index out of range')
+
+        return next(islice(self.__items.values(), item, None))
+
+    def __delitem__(self, item):
+        if isinstance(item, slice):
+            deleted = set(range(*item.indices(len(self))))
+        else:
+            deleted = {item + len(self) if item < 0 else item}
+
+        items = [i for n, i in enumerate(self) if n not in deleted]
+
+        self.clear()
+        self.extend(items)
+
+    @property
+    def runtime(self):
+        return self.__runtime
+
+    def __remove(self, runnable_object):
+        with self.__lock:
+            sequences = self.__index.get(id(runnable_object))
+
+            if not sequences:
+                return None
+
+            sequence = sequences.pop(0)
+
+            if not sequences:
+                del self.__index[id(runnable_object)]
+
+            item = self.__items.pop(sequence)
+            self.__runtime -= get_xunit_data_from_storage_item(item).runtime
+
+            return item
+
+    def append(self, item):
+        runnable_object, xunit_data = item
+
+        with self.__lock:
+            self.__sequence += 1
+            self.__items[self.__sequence] = item
+            self.__index.setdefault(id(runnable_object), []).append(self.__sequence)
+            self.__runtime += xunit_data.runtime
+
+    def extend(self, iterable):
+        for item in iterable:
+            self.append(item)
+
+    def clear(self):
+        with self.__lock:
+            self.__items.clear()
+            self.__index.clear()
+            self.__runtime = float()
+
+    def get(self, runnable_object):
+        sequences = self.__index.get(id(runnable_object))
+
+        if sequences:
+            return get_xunit_data_from_storage_item(
+                self.__items[sequences[0]],
+            )
+
+        return None
+
+    def replace(self, runnable_object, xunit_data):
+        assert isinstance(xunit_data, xunit.XUnitData)
+
+        if self.__remove(runnable_object) is None:
+            return False
+
+        self.append((runnable_object, xunit_data))
+
+        return True
+
+
 class CaptureStream(object):
 
     def __init__(self):
@@ -281,9 +407,9 @@ class State(object):
         self.__result = result
         self.__should_stop = MPSupportedValue(should_stop)
 
-    def support_mp(self, manager):
+    def support_mp(self):
         self.__should_stop.set(
-            manager.Value('b', self.should_stop)
+            mp.shared_flag(self.should_stop),
         )
 
     @property
@@ -310,7 +436,7 @@ class State(object):
                 self.__result.skipped,
                 self.__result.failures,
                 self.__result.successes):
-            runtime += get_runtime_from_storage(storage)
+            runtime += storage.runtime
 
         return round(runtime, xunit.ROUND_RUNTIME)
 
@@ -343,11 +469,17 @@ class Result(object):
 
     __marker_class__ = Markers
 
-    def __init__(self, config, name=None, stream=None, current_state=None, is_proxy=False):
-        self.errors = []
-        self.skipped = []
-        self.failures = []
-        self.successes = []
+    def __init__(self,
+                 config,
+                 name=None,
+                 stream=None,
+                 current_state=None,
+                 is_proxy=False,
+                 xunit_writer=None):
+        self.errors = ResultStorage()
+        self.skipped = ResultStorage()
+        self.failures = ResultStorage()
+        self.successes = ResultStorage()
 
         self.proxies = []
 
@@ -362,6 +494,7 @@ class Result(object):
         self.__timer = None
         self.__runtime = None
         self.__capture = None
+        self.__xunit_writer = xunit_writer
         self.__console = Console(
             self._stream,
             verbose=self.__config.VERBOSE,
@@ -372,6 +505,9 @@ class Result(object):
 
             self.__capture = LogCapture(config)
 
+            if self.__config.XUNIT_REPORT:
+                self.__xunit_writer = xunit.XUnitWriter(self.__config.XUNIT_REPORT)
+
             if self.__config.GEVENT:
                 from gevent.lock import Semaphore
 
@@ -389,9 +525,14 @@ class Result(object):
     def __exit__(self, *args, **kwargs):
         self.final()
 
-        if self.__config.XUNIT_REPORT:
+        if self.__xunit_writer:
+            self.__xunit_writer.close(self)
+        elif self.__config.XUNIT_REPORT:
             self.create_report(self.__config.XUNIT_REPORT)
 
+        if self.__config.RUNTIME_HISTORY:
+            history.save(self.__config.RUNTIME_HISTORY, self)
+
     def __repr__(self):
         state = self.get_state()
         return '<Result(tests={}, failures={}, errors={}, skipped={} success={})>'.format(
@@ -422,6 +563,10 @@ class Result(object):
     def console(self):
         return self.__console
 
+    @property
+    def xunit_writer(self):
+        return self.__xunit_writer
+
     @property
     def runtime(self):
         return self.__runtime
@@ -434,8 +579,22 @@ class Result(object):
     def current_state(self):
         return self.__current_state
 
-    def support_mp(self, manager):
-        self.__current_state.support_mp(manager)
+    def support_mp(self):
+        self.__current_state.support_mp()
+
+    def set_stream(self, stream):
+        """
+        Proxies which will be created after
+        are writing output to this stream.
+        """
+        self._stream = stream
+
+    def set_xunit_writer(self, writer):
+        """
+        Proxies which will be created after
+        are using this writer of xunit report.
+        """
+        self.__xunit_writer = writer
 
     def set_timer(self, timer):
         self.__timer = timer
@@ -447,6 +606,11 @@ class Result(object):
     def create_proxy(self, **kwargs):
         logger.debug('Create proxy to result')
 
+        # test cases of report are going to proxies of suites,
+        # others are extended to them and should not be written
+        if kwargs.get('name') is not None:
+            kwargs.setdefault('xunit_writer', self.__xunit_writer)
+
         return self.__class__(
             self.__config,
             is_proxy=True,
@@ -458,17 +622,27 @@ class Result(object):
     def extend(self, result):
         assert result.is_proxy, 'result can not be extended from no proxy'
 
-        logger.debug(
-            'Extend result "{}" from proxy "{}"'.format(
-                self.name, result.name
-            ),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Extend result "{}" from proxy "{}"'.format(
+                    self.name, result.name
+                ),
+            )
 
         self.errors.extend(result.errors)
         self.skipped.extend(result.skipped)
         self.failures.extend(result.failures)
         self.successes.extend(result.successes)
 
+        if self.__xunit_writer:
+            if result.xunit_writer:
+                self.__xunit_writer.finish(result)
+            else:
+                for storage_name, _ in xunit.TESTCASE_RENDERS:
+                    self.__xunit_writer.write(
+                        self, storage_name, getattr(result, storage_name),
+                    )
+
     @contextmanager
     def proxy(self, runnable_object=None, timer=None):
         if runnable_object:
@@ -500,62 +674,74 @@ class Result(object):
         )
 
     def get_fail_by(self, runnable_object):
-        return get_xunit_data_from_storage(self.failures, runnable_object)
+        return self.failures.get(runnable_object)
 
     def reset_fail(self, runnable_object, xunit_data):
-        return reset_item_of_storage(self.failures, runnable_object, xunit_data)
+        if self.__xunit_writer:
+            self.__xunit_writer.invalidate(self)
+        return self.failures.replace(runnable_object, xunit_data)
 
     def get_error_by(self, runnable_object):
-        return get_xunit_data_from_storage(self.errors, runnable_object)
+        return self.errors.get(runnable_object)
 
     def reset_error(self, runnable_object, xunit_data):
-        return reset_item_of_storage(self.errors, runnable_object, xunit_data)
+        if self.__xunit_writer:
+            self.__xunit_writer.invalidate(self)
+        return self.errors.replace(runnable_object, xunit_data)
 
     def get_skip_by(self, runnable_object):
-        return get_xunit_data_from_storage(self.skipped, runnable_object)
+        return self.skipped.get(runnable_object)
 
     def reset_skip(self, runnable_object, xunit_data):
-        return reset_item_of_storage(self.skipped, runnable_object, xunit_data)
+        if self.__xunit_writer:
+            self.__xunit_writer.invalidate(self)
+        return self.skipped.replace(runnable_object, xunit_data)
 
     def get_success_by(self, runnable_object):
-        return get_xunit_data_from_storage(self.successes, runnable_object)
+        return self.successes.get(runnable_object)
 
     def reset_success(self, runnable_object, xunit_data):
-        return reset_item_of_storage(self.successes, runnable_object, xunit_data)
+        if self.__xunit_writer:
+            self.__xunit_writer.invalidate(self)
+        return self.successes.replace(runnable_object, xunit_data)
 
     def add_error(self, runnable_object, traceback, runtime, exc):
-        error_reason = reason.create(
+        error_reason = reason.capture(
             runnable_object, traceback, config=self.__config,
         )
 
         xunit_data = xunit.XUnitData(
             exc=exc,
             runtime=runtime,
-            reason=reason.format_reason(error_reason),
+            reason=error_reason,
             class_name=runnable.class_name(runnable_object),
             method_name=runnable.stopped_on(runnable_object),
+            metrics=runnable.metrics(runnable_object),
         )
 
         self.errors.append((runnable_object, xunit_data))
+        self.__write_xunit('errors', runnable_object, xunit_data)
         self.finish(self._marker.error())
 
         if self.__config.STOP:
             self.__current_state.should_stop = True
 
     def add_fail(self, runnable_object, traceback, runtime, exc):
-        fail_reason = reason.create(
+        fail_reason = reason.capture(
             runnable_object, traceback, config=self.__config,
         )
 
         xunit_data = xunit.XUnitData(
             exc=exc,
             runtime=runtime,
-            reason=reason.format_reason(fail_reason),
+            reason=fail_reason,
             class_name=runnable.class_name(runnable_object),
             method_name=runnable.stopped_on(runnable_object),
+            metrics=runnable.metrics(runnable_object),
         )
 
         self.failures.append((runnable_object, xunit_data))
+        self.__write_xunit('failures', runnable_object, xunit_data)
         self.finish(self._marker.fail())
 
         if self.__config.STOP:
@@ -566,9 +752,11 @@ class Result(object):
             runtime=runtime,
             class_name=runnable.class_name(runnable_object),
             method_name=runnable.method_name(runnable_object),
+            metrics=runnable.metrics(runnable_object),
         )
 
         self.successes.append((runnable_object, xunit_data))
+        self.__write_xunit('successes', runnable_object, xunit_data)
         self.finish(self._marker.success())
 
     def add_skip(self, runnable_object, reason, runtime):
@@ -577,11 +765,19 @@ class Result(object):
             runtime=runtime,
             class_name=runnable.class_name(runnable_object),
             method_name=runnable.method_name(runnable_object),
+            metrics=runnable.metrics(runnable_object),
         )
 
         self.skipped.append((runnable_object, xunit_data))
+        self.__write_xunit('skipped', runnable_object, xunit_data)
         self.finish(self._marker.skip(reason))
 
+    def __write_xunit(self, storage_name, runnable_object, xunit_data):
+        if self.__xunit_writer:
+            self.__xunit_writer.write(
+                self, storage_name, [(runnable_object, xunit_data)],
+            )
+
     def create_report(self, file_path):
         if self.__is_proxy:
             raise RuntimeError(
@@ -1,12 +1,13 @@
 # -*- coding: utf-8 -*-
 
 import sys
+import itertools
 from functools import wraps
 from collections import OrderedDict
 from contextlib import contextmanager
 
+from . import tracer
 from .utils import pyv
-from .utils.mp import MPSupportedValue
 
 
 def run(runnable, *args, **kwargs):
@@ -37,6 +38,22 @@ def set_debug_if_allowed(config):
         pdb.post_mortem(tb)
 
 
+def metrics(runnable):
+    return runnable.__metrics__()
+
+
+def trace(runnable, category):
+    """
+    Span of runnable object for trace
+    """
+    if not tracer.is_enabled():
+        return tracer.NULL_SPAN
+
+    return tracer.span(
+        '{}:{}'.format(class_name(runnable), method_name(runnable)), category,
+    )
+
+
 def is_run(runnable):
     return runnable.__is_run__()
 
@@ -93,17 +110,22 @@ def build_method(f):
 
 class RunnableObject(object):
 
+    # category of span in trace, run
+    # is not traced by __call__ if it's None
+    __trace__ = None
     __create_reason__ = False
 
     def __init__(self):
         self.__id = id(self)
-        self.__stopped_on = MPSupportedValue(
-            method_name(self),
-        )
+        self.__stopped_on = method_name(self)
         self.__reason_storage = OrderedDict()
 
     def __call__(self, *args, **kwargs):
-        return self.__run__(*args, **kwargs)
+        if self.__trace__ is None:
+            return self.__run__(*args, **kwargs)
+
+        with trace(self, self.__trace__):
+            return self.__run__(*args, **kwargs)
 
     def __repr__(self):
         class_path = '{}.{}'.format(
@@ -117,13 +139,21 @@ class RunnableObject(object):
     def id(self):
         return self.__id
 
+    @property
+    def _id(self):
+        return self.__id
+
+    @_id.setter
+    def _id(self, value):
+        self.__id = value
+
     @property
     def _stopped_on(self):
-        return self.__stopped_on.value
+        return self.__stopped_on
 
     @_stopped_on.setter
     def _stopped_on(self, value):
-        self.__stopped_on.value = value
+        self.__stopped_on = value
 
     @property
     def reason_storage(self):
@@ -152,6 +182,12 @@ class RunnableObject(object):
             self.__class__.__module__, self.__class__.__name__,
         )
 
+    def __metrics__(self):
+        """
+        Dictionary of measurements for record of result
+        """
+        return None
+
     def __run__(self, *args, **kwargs):
         raise NotImplementedError(
             'Method "run" not implemented in "{}"'.format(
@@ -159,11 +195,6 @@ class RunnableObject(object):
             ),
         )
 
-    def support_mp(self, manager):
-        self.__stopped_on.set(
-            manager.Value('s', self._stopped_on),
-        )
-
 
 class BuildObjectMixin(object):
 
@@ -189,12 +220,16 @@ class ContextOfRunnableObject(object):
 
     @contextmanager
     def __call__(self, runnable):
-        self.start_context(runnable)
+        self.acquire_extensions(runnable)
         try:
-            yield
+            self.start_context(runnable)
+            try:
+                yield
+            finally:
+                if stopped_on(runnable) != 'start_context':
+                    self.stop_context(runnable)
         finally:
-            if stopped_on(runnable) != 'start_context':
-                self.stop_context(runnable)
+            self.release_extensions(runnable)
 
     @property
     def layers(self):
@@ -234,6 +269,16 @@ class ContextOfRunnableObject(object):
             ),
         )
 
+    def acquire_extensions(self, obj, blocking=True):
+        """
+        Pooled extensions are held while context is living.
+        False is returned if it's not blocking and pool is exhausted.
+        """
+        return True
+
+    def release_extensions(self, obj):
+        pass
+
 
 class LayerOfRunnableObject(object):
 
@@ -241,6 +286,69 @@ class LayerOfRunnableObject(object):
         self.enabled = True
 
 
+def is_hook_overridden(layer, hook_name, base_class):
+    """
+    Hooks of base class of layers are empty,
+    layer can be skipped if it's not overriding them.
+    """
+    if not isinstance(layer, base_class) or hook_name in getattr(layer, '__dict__', {}):
+        return True
+
+    method = getattr(layer.__class__, hook_name, None)
+    base_method = getattr(base_class, hook_name, None)
+
+    return getattr(method, '__func__', method) is not getattr(base_method, '__func__', base_method)
+
+
+class LayerChains(object):
+    """
+    Layers of runnable objects which are overriding hooks.
+    Chain is computed once for the same own layers of context
+    and class of object. Version is changed on registration of
+    default or matched layers, so chains are computed again.
+    Layer can be disabled at any time, so it's checked on call.
+    """
+
+    def __init__(self, base_class, default_layers, match_to_layer):
+        self.__base_class = base_class
+        self.__default_layers = default_layers
+        self.__match_to_layer = match_to_layer
+
+        self.__chains = {}
+        self.__version = 0
+
+    def changed(self):
+        self.__version += 1
+        self.__chains = {}
+
+    def get(self, layers, runnable_object, hook_name):
+        key = (
+            hook_name,
+            layers,
+            self.__version,
+            # matched layers are depending on class of object
+            runnable_object.__class__ if self.__match_to_layer else None,
+        )
+        chains = self.__chains
+
+        try:
+            return chains[key]
+        except KeyError:
+            pass
+
+        matched_layers = [
+            layer for cls, layer in list(self.__match_to_layer.items())
+            if isinstance(runnable_object, cls)
+        ]
+
+        chain = chains[key] = tuple(
+            layer for layer in itertools.chain(layers, self.__default_layers, matched_layers)
+            if is_hook_overridden(layer, hook_name, self.__base_class)
+        )
+
+        return chain
+
+
 class RunnableGroup(RunnableObject):
 
     def __init__(self, objects, config):
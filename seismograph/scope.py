@@ -12,6 +12,7 @@ import seismograph.result as _result
 import seismograph.loader as _loader
 import seismograph.program as _program
 import seismograph.runnable as _runnable
+import seismograph.extensions as _extensions
 
 
 _empty_value = object()
@@ -30,18 +31,22 @@ def add_extension(extension):
 
 def match_suite_to_layer(cls, layer):
     _suite.MATCH_SUITE_TO_LAYER[cls] = layer
+    _suite.changed_layers()
 
 
 def match_case_to_layer(cls, layer):
     _case.MATCH_CASE_TO_LAYER[cls] = layer
+    _case.changed_layers()
 
 
 def set_default_case_layers(*layers):
     _case.DEFAULT_LAYERS.extend(layers)
+    _case.changed_layers()
 
 
 def set_default_suite_layers(*layers):
     _suite.DEFAULT_LAYERS.extend(layers)
+    _suite.changed_layers()
 
 
 def set_default_program_layers(*layers):
@@ -59,7 +64,8 @@ def configure(
         default_test_name=None,
         skip_attribute_name=None,
         skip_why_attribute_name=None,
-        use_static_test_functions=False):
+        use_static_test_functions=False,
+        shared_data_copy=None):
     """
     Configure global context
 
@@ -74,6 +80,7 @@ def configure(
     :param skip_attribute_name:
     :param skip_why_attribute_name:
     :param use_static_test_functions:
+    :param shared_data_copy: default copy policy of shared data
     """
     if start_message:
         _result.START_MESSAGE = start_message
@@ -110,3 +117,7 @@ def configure(
     if suite_group_class:
         assert issubclass(suite_group_class, _runnable.RunnableGroup)
         _program.Program.__suite_group_class__ = suite_group_class
+
+    if shared_data_copy:
+        assert shared_data_copy in _extensions.COPY_POLICIES
+        _extensions.DEFAULT_COPY = shared_data_copy
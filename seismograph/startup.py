@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+"""
+Time of startup phases.
+Report is printed with --profile-startup option.
+"""
+
+import sys
+from timeit import default_timer
+from contextlib import contextmanager
+from collections import OrderedDict
+
+
+IMPORT = 'import'
+CONFIG = 'config'
+DISCOVERY = 'discovery'
+BUILD = 'build'
+
+# time of import extension is part
+# of phase where it was required
+EXTENSION = 'extension {}'
+
+
+_timers = {}
+_phases = OrderedDict()
+
+
+def start(phase):
+    _timers[phase] = default_timer()
+
+
+def stop(phase):
+    runtime = default_timer() - _timers.pop(phase)
+    _phases[phase] = _phases.get(phase, 0.0) + runtime
+
+
+@contextmanager
+def measure(phase):
+    start(phase)
+    try:
+        yield
+    finally:
+        stop(phase)
+
+
+def get_phases():
+    return OrderedDict(_phases)
+
+
+def print_report(stream=None):
+    stream = stream or sys.stdout
+    width = max(len(p) for p in _phases) if _phases else 0
+
+    stream.write('\nStartup profile:\n')
+
+    for phase, runtime in _phases.items():
+        stream.write(
+            '  {} {:.4f}s\n'.format(phase.ljust(width), runtime),
+        )
+
+    stream.write('\n')
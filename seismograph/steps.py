@@ -4,7 +4,9 @@ import sys
 import inspect
 from functools import wraps
 
+from . import load
 from . import loader
+from . import tracer
 from . import runnable
 from .utils import pyv
 
@@ -128,7 +130,15 @@ def _perform_prompt(case, method, exit_code=None):
         sys.exit(exit_code or 0)
 
 
-def _run_step(case, method, flow=None):
+def _call_to_step(case, method, flow=None):
+    with load.measure_step(case, pyv.get_func_name(method)):
+        if flow is not None:
+            method(case, flow)
+        else:
+            method(case)
+
+
+def _run_step(case, method, flow=None, traced=False):
     if case.config.STEP_BY_STEP:
         _perform_prompt(case, method)
 
@@ -136,10 +146,11 @@ def _run_step(case, method, flow=None):
         case.log(_step_log(case, method, flow))
 
     try:
-        if flow is not None:
-            method(case, flow)
+        if traced:
+            with tracer.span('{}', tracer.STEP, pyv.get_func_name(method)):
+                _call_to_step(case, method, flow=flow)
         else:
-            method(case)
+            _call_to_step(case, method, flow=flow)
     except BaseException:
         runnable.stopped_on(case, pyv.get_func_name(method))
         raise
@@ -181,6 +192,7 @@ def _call_to_finish_method_if_exist(case, flow=None):
 def _make_run_test():
     def run_test(self):
         run_test.__doc__ = self.__doc__
+        traced = tracer.is_enabled()
 
         if self.__flows__:
 
@@ -202,7 +214,7 @@ def _make_run_test():
                         _create_history_line(step_method),
                     )
 
-                    _run_step(self, step_method, flow=flow)
+                    _run_step(self, step_method, flow=flow, traced=traced)
                 else:
                     setattr(self, STEPS_HISTORY_ATTRIBUTE_NAME, [])
 
@@ -224,7 +236,7 @@ def _make_run_test():
                     _create_history_line(step_method),
                 )
 
-                _run_step(self, step_method)
+                _run_step(self, step_method, traced=traced)
 
             _call_to_finish_method_if_exist(self)
 
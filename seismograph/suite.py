@@ -7,9 +7,12 @@ from types import FunctionType
 from . import case
 from . import reason
 from . import loader
+from . import tracer
 from . import runnable
 from .utils import pyv
 from . import extensions
+from .layers import SuiteLayer
+from . import resources as _resources
 from .utils.common import measure_time
 from .utils.common import call_to_chain
 from .groups.default import DefaultCaseGroup
@@ -23,6 +26,16 @@ logger = logging.getLogger(__name__)
 DEFAULT_LAYERS = []
 MATCH_SUITE_TO_LAYER = {}
 
+_layer_chains = runnable.LayerChains(SuiteLayer, DEFAULT_LAYERS, MATCH_SUITE_TO_LAYER)
+
+
+def changed_layers():
+    """
+    Should be called after change of
+    DEFAULT_LAYERS or MATCH_SUITE_TO_LAYER
+    """
+    _layer_chains.changed()
+
 
 def with_match_layers(context, suite):
     for layer in context.layers:
@@ -90,10 +103,11 @@ class BuildRule(object):
 class SuiteContext(runnable.ContextOfRunnableObject):
 
     def __init__(self, setup, teardown):
-        self.__layers = []
+        self.__layers = ()
         self.__require = []
 
         self.__extensions = {}
+        self.__pooled = []
         self.__build_rules = []
 
         self.__setup_callbacks = [setup]
@@ -130,13 +144,38 @@ class SuiteContext(runnable.ContextOfRunnableObject):
                 yield layer
 
     def add_layers(self, layers):
-        self.__layers.extend(layers)
+        self.__layers += tuple(layers)
+
+    def layers_of_hook(self, suite, hook_name):
+        """
+        Enabled layers of suite which are overriding the hook
+        """
+        for layer in _layer_chains.get(self.__layers, suite, hook_name):
+            if layer.enabled:
+                yield layer
 
     def install_extensions(self):
         for ext_name in self.__require:
-            if ext_name not in self.__extensions:
+            if ext_name in self.__extensions or ext_name in self.__pooled:
+                continue
+
+            if extensions.is_pooled(ext_name):
+                self.__pooled.append(ext_name)
+            else:
                 self.__extensions[ext_name] = extensions.get(ext_name)
 
+    def acquire_extensions(self, suite, blocking=True):
+        return extensions.acquire(
+            self.__pooled, self.__extensions, suite,
+            suite_name=suite.name, level=extensions.SCOPE_SUITE, blocking=blocking,
+        )
+
+    def release_extensions(self, suite):
+        extensions.release(
+            self.__pooled, self.__extensions, suite,
+            suite_name=suite.name, level=extensions.SCOPE_SUITE,
+        )
+
     def start_context(self, suite):
         logger.debug(
             'Start context of suite "{}"'.format(
@@ -146,7 +185,7 @@ class SuiteContext(runnable.ContextOfRunnableObject):
 
         try:
             call_to_chain(
-                with_match_layers(self, suite), 'on_setup', suite,
+                self.layers_of_hook(suite, 'on_setup'), 'on_setup', suite,
             )
             call_to_chain(self.__setup_callbacks, None)
         except BaseException:
@@ -162,7 +201,7 @@ class SuiteContext(runnable.ContextOfRunnableObject):
 
         try:
             call_to_chain(
-                with_match_layers(self, suite), 'on_teardown', suite,
+                self.layers_of_hook(suite, 'on_teardown'), 'on_teardown', suite,
             )
             call_to_chain(self.__teardown_callbacks, None)
         except BaseException:
@@ -177,7 +216,7 @@ class SuiteContext(runnable.ContextOfRunnableObject):
         )
 
         call_to_chain(
-            with_match_layers(self, suite), 'on_init', suite,
+            self.layers_of_hook(suite, 'on_init'), 'on_init', suite,
         )
 
     def on_require(self, suite):
@@ -188,7 +227,7 @@ class SuiteContext(runnable.ContextOfRunnableObject):
         )
 
         call_to_chain(
-            with_match_layers(self, suite), 'on_require', self.__require,
+            self.layers_of_hook(suite, 'on_require'), 'on_require', self.__require,
         )
 
     def on_build_rule(self, suite, rule):
@@ -199,7 +238,7 @@ class SuiteContext(runnable.ContextOfRunnableObject):
         )
 
         call_to_chain(
-            with_match_layers(self, suite), 'on_build_rule', suite, rule,
+            self.layers_of_hook(suite, 'on_build_rule'), 'on_build_rule', suite, rule,
         )
 
     def on_mount(self, suite, program):
@@ -210,7 +249,7 @@ class SuiteContext(runnable.ContextOfRunnableObject):
         )
 
         call_to_chain(
-            with_match_layers(self, suite), 'on_mount', suite, program,
+            self.layers_of_hook(suite, 'on_mount'), 'on_mount', suite, program,
         )
 
     def on_run(self, suite):
@@ -222,7 +261,7 @@ class SuiteContext(runnable.ContextOfRunnableObject):
 
         try:
             call_to_chain(
-                with_match_layers(self, suite), 'on_run', suite,
+                self.layers_of_hook(suite, 'on_run'), 'on_run', suite,
             )
         except BaseException:
             runnable.stopped_on(suite, 'on_run')
@@ -237,7 +276,7 @@ class SuiteContext(runnable.ContextOfRunnableObject):
 
         try:
             call_to_chain(
-                with_match_layers(self, suite), 'on_error', error, suite, result, tb, timer,
+                self.layers_of_hook(suite, 'on_error'), 'on_error', error, suite, result, tb, timer,
             )
         except BaseException:
             runnable.stopped_on(suite, 'on_error')
@@ -248,10 +287,14 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
 
     __layers__ = None
     __require__ = None
+    __timeout__ = None
+    __resources__ = None
+    __trace__ = tracer.SUITE
     __create_reason__ = True
     __case_class__ = case.Case
     __case_group_class__ = None
     __case_box_class__ = case.CaseBox
+    __case_descriptor_class__ = case.CaseDescriptor
 
     #
     # Base components of runnable object
@@ -391,6 +434,7 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
                     config=self.config,
                     method_name=test_name,
                     box_class=self.__case_box_class__,
+                    descriptor_class=self.__case_descriptor_class__,
                 ),
             )
 
@@ -411,6 +455,9 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
     def context(self):
         return self.__context
 
+    def _set_run_state(self):
+        self.__is_run = True
+
     def _make_group(self):
         if self.__case_group_class__:
             logger.debug(
@@ -432,6 +479,28 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
                 self.__case_instances, self.config,
             )
 
+        if self.config.ASYNCIO:
+            logger.debug(
+                'Use "AsyncioCaseGroup" to making case group',
+            )
+
+            from .groups.asyncio import AsyncioCaseGroup
+
+            return AsyncioCaseGroup(
+                self.__case_instances, self.config,
+            )
+
+        if self.config.MULTIPROCESSING and self.config.MP_GRANULARITY == 'case':
+            logger.debug(
+                'Use "MultiprocessingCaseGroup" to making case group',
+            )
+
+            from .groups.multiprocessing import MultiprocessingCaseGroup
+
+            return MultiprocessingCaseGroup(
+                self.__case_instances, self.config,
+            )
+
         if self.config.THREADING or self.config.MULTIPROCESSING:
             logger.debug(
                 'Use "ThreadingCaseGroup" to making case group',
@@ -535,6 +604,8 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
                 layers=None,
                 static=False,
                 require=None,
+                timeout=None,
+                resources=None,
                 case_class=None,
                 always_success=False,
                 assertion_class=None):
@@ -569,6 +640,12 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
             if assertion_class:
                 setattr(_class, '__assertion_class__', assertion_class)
 
+            if timeout:
+                case.timeout(timeout)(_class)
+
+            if resources:
+                setattr(_class, _resources.RESOURCES_ATTRIBUTE_NAME, _resources.parse(resources))
+
             self.__case_classes.append(
                 _class.mount_to(
                     self,
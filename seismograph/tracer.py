@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+
+"""
+Timeline of run in format of chrome trace events.
+It's written with --trace option and can be opened
+by chrome://tracing or https://ui.perfetto.dev.
+
+Events are buffered in memory of process. Workers of
+multiprocessing are dumping own events to part files
+near the trace file, they are merged by main process.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from timeit import default_timer
+
+
+logger = logging.getLogger(__name__)
+
+
+# categories of spans
+PROGRAM = 'program'
+SUITE = 'suite'
+CASE = 'case'
+CLASS_FIXTURE = 'class_fixture'
+STEP = 'step'
+HOOK = 'hook'
+
+PART_EXTENSION = '.part'
+
+
+_file_path = None
+_events = []
+_named_tracks = set()
+
+
+def is_enabled():
+    return _file_path is not None
+
+
+def enable(file_path):
+    global _file_path
+
+    _file_path = file_path
+    del _events[:]
+    _named_tracks.clear()
+
+    for part_path in get_part_paths(file_path):
+        os.remove(part_path)
+
+
+def disable():
+    global _file_path
+
+    _file_path = None
+    del _events[:]
+    _named_tracks.clear()
+
+
+def get_part_paths(file_path):
+    directory = os.path.dirname(os.path.abspath(file_path))
+    prefix = '{}.'.format(os.path.basename(file_path))
+
+    if not os.path.isdir(directory):
+        return []
+
+    return [
+        os.path.join(directory, file_name)
+        for file_name in os.listdir(directory)
+        if file_name.startswith(prefix) and file_name.endswith(PART_EXTENSION)
+    ]
+
+
+def get_track():
+    """
+    Identifier of thread, or of task if
+    it's called inside of asyncio task.
+    Tasks of one loop are going in parallel,
+    so they are shown as own tracks.
+    """
+    asyncio = sys.modules.get('asyncio')
+
+    if asyncio is not None:
+        current_task = getattr(asyncio, 'current_task', None)
+
+        if current_task is not None:
+            try:
+                task = current_task()
+            except RuntimeError:  # loop is not running
+                task = None
+
+            if task is not None:
+                return id(task), 'task {}'.format(id(task))
+
+    thread = threading.current_thread()
+    return thread.ident, thread.name
+
+
+def add_event(event):
+    # append of list is thread safe
+    _events.append(event)
+
+
+class Span(object):
+
+    __slots__ = ('__name', '__category', '__args', '__start', '__ts', '__track')
+
+    def __init__(self, name, category, args):
+        self.__name = name
+        self.__category = category
+        self.__args = args
+        self.__start = None
+        self.__ts = None
+        self.__track = None
+
+    def __enter__(self):
+        self.__track = get_track()
+        self.__ts = time.time()
+        self.__start = default_timer()
+
+    def __exit__(self, *args, **kwargs):
+        duration = default_timer() - self.__start
+        pid = os.getpid()
+        tid, track_name = self.__track
+
+        if (pid, tid) not in _named_tracks:
+            _named_tracks.add((pid, tid))
+            add_event({
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': pid,
+                'tid': tid,
+                'args': {'name': track_name},
+            })
+
+        add_event({
+            'name': self.__name.format(*self.__args) if self.__args else self.__name,
+            'cat': self.__category,
+            'ph': 'X',
+            # wall clock is the same for all processes
+            'ts': int(self.__ts * 1000000),
+            'dur': int(duration * 1000000),
+            'pid': pid,
+            'tid': tid,
+        })
+
+
+class NullSpan(object):
+
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *args, **kwargs):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+def span(name, category, *args):
+    """
+    Context manager of traced block.
+    Name is formatted by args on exit only.
+    """
+    if _file_path is None:
+        return NULL_SPAN
+    return Span(name, category, args)
+
+
+def get_events(pid=None):
+    if pid is None:
+        return list(_events)
+    # events of parent are copied to forked worker
+    return [e for e in _events if e['pid'] == pid]
+
+
+def dump_part():
+    """
+    Should be called by worker process before exit
+    """
+    if _file_path is None:
+        return
+
+    pid = os.getpid()
+    part_path = '{}.{}{}'.format(_file_path, pid, PART_EXTENSION)
+
+    with open(part_path, 'w') as fp:
+        json.dump(get_events(pid=pid), fp)
+
+
+def save():
+    """
+    Merge events of main process and
+    workers and write trace file
+    """
+    if _file_path is None:
+        return
+
+    events = get_events(pid=os.getpid())
+
+    for part_path in get_part_paths(_file_path):
+        try:
+            with open(part_path) as fp:
+                events.extend(json.load(fp))
+        except (IOError, ValueError):
+            logger.warning('Part of trace "{}" can not be read'.format(part_path), exc_info=True)
+
+        os.remove(part_path)
+
+    events.sort(key=lambda e: e.get('ts', 0))
+
+    with open(_file_path, 'w') as fp:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, fp)
@@ -2,7 +2,9 @@
 
 import sys
 import time
+from timeit import default_timer
 from . import pyv
+from .. import tracer
 
 from ..exceptions import TimeoutException
 
@@ -40,16 +42,42 @@ def waiting_for(func, timeout=None, exc_cls=None, message=None, delay=None, args
 
 
 def call_to_chain(chain, method_name, *args, **kwargs):
+    if not method_name:
+        for obj in chain:
+            obj(*args, **kwargs)
+        return
+
+    if not tracer.is_enabled():
+        for obj in chain:
+            getattr(obj, method_name)(*args, **kwargs)
+        return
+
     for obj in chain:
-        if method_name:
+        with tracer.span('{}.{}', tracer.HOOK, obj.__class__.__name__, method_name):
             getattr(obj, method_name)(*args, **kwargs)
-        else:
-            obj(*args, **kwargs)
+
+
+def run_if_awaitable(value):
+    """
+    Coroutine of case can be run by sync group.
+    It will be run to complete on own event loop.
+    """
+    if hasattr(value, '__await__'):
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+
+        try:
+            return loop.run_until_complete(value)
+        finally:
+            loop.close()
+
+    return value
 
 
 def measure_time():
-    start_time = time.time()
-    return lambda: time.time() - start_time
+    start_time = default_timer()
+    return lambda: default_timer() - start_time
 
 
 def pythonpaths(*paths):
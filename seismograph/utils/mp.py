@@ -4,6 +4,8 @@
 Multiprocessing utils
 """
 
+import marshal
+
 
 class MPSupportedValue(object):
 
@@ -27,3 +29,37 @@ class MPSupportedValue(object):
 
     def set(self, value):
         self._value = value
+
+
+def shared_flag(value=False):
+    """
+    Flag in shared memory, no lock and no server
+    process are needed for reading and writing of byte.
+    """
+    from multiprocessing.sharedctypes import RawValue
+
+    return RawValue('b', bool(value))
+
+
+def pack_record(record):
+    return marshal.dumps(record)
+
+
+def unpack_record(data):
+    return marshal.loads(data)
+
+
+def wait(connections, timeout=None):
+    """
+    Wait for readable connections.
+    Python 2 does not have multiprocessing.connection.wait.
+    """
+    try:
+        from multiprocessing.connection import wait as _wait
+    except ImportError:
+        from select import select
+
+        readable, _, _ = select(connections, [], [], timeout)
+        return readable
+
+    return _wait(connections, timeout=timeout)
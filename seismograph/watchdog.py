@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+
+"""
+Hard timeouts of cases.
+Case of main thread is interrupted by SIGALRM, case of other
+thread is interrupted by watchdog which raises exception in
+thread of case asynchronously. Exception is carrying stack
+of hung case. Case which is hung in C code can not be
+interrupted, pool of processes kills and replaces such worker.
+
+    @seismograph.timeout(30)
+    def test_something(case):
+        ...
+
+Timeout is taken from test method, class of case, suite
+and from config by this order.
+"""
+
+import os
+import sys
+import heapq
+import signal
+import logging
+import threading
+import itertools
+import traceback
+from timeit import default_timer
+
+from . import runnable
+from .exceptions import CaseTimeout
+
+
+logger = logging.getLogger(__name__)
+
+
+TIMEOUT_ATTRIBUTE_NAME = '__timeout__'
+
+
+# thread which is blocked in C code does not get
+# exception, it's reported once after this delay
+INTERRUPT_GRACE = 5.0
+
+
+_watchdog = None
+_listener = None
+_watchdog_lock = threading.Lock()
+
+# thread id -> message of timeout
+# which was not raised yet
+_messages = {}
+
+
+def get_thread_id():
+    return threading.current_thread().ident
+
+
+def is_main_thread():
+    return isinstance(threading.current_thread(), threading._MainThread)
+
+
+def get_timeout(case):
+    method = getattr(case, runnable.method_name(case), None)
+    seconds = getattr(method, TIMEOUT_ATTRIBUTE_NAME, None)
+
+    if seconds is None:
+        seconds = getattr(case, TIMEOUT_ATTRIBUTE_NAME, None)
+
+    if seconds is None:
+        seconds = getattr(getattr(case, '__mount_data__', None), 'timeout', None)
+
+    if seconds is None:
+        seconds = getattr(case.config, 'CASE_TIMEOUT', None)
+
+    return seconds or None
+
+
+def get_message(case, seconds, stack):
+    return u'Case "{}" was timed out after {} sec. Stack of hung case:\n{}'.format(
+        case, seconds, stack,
+    )
+
+
+def format_stack(thread_id):
+    frame = sys._current_frames().get(thread_id)
+
+    if frame is None:
+        return 'Stack is not available'
+
+    return ''.join(traceback.format_stack(frame))
+
+
+def set_async_exc(thread_id, exc_class):
+    """
+    Raise exception in thread or cancel it if class is None
+    """
+    try:
+        import ctypes
+        set_exc = ctypes.pythonapi.PyThreadState_SetAsyncExc
+    except (ImportError, AttributeError):
+        return False
+
+    exc = ctypes.py_object(exc_class) if exc_class is not None else None
+
+    return set_exc(ctypes.c_ulong(thread_id), exc) == 1
+
+
+def set_listener(listener):
+    """
+    Listener of worker process is notifying
+    parent about running cases with timeout
+    """
+    global _listener
+    _listener = listener
+
+
+def get_listener():
+    return _listener
+
+
+class AsyncCaseTimeout(CaseTimeout):
+    """
+    Raised in thread of case by watchdog.
+    It's created without arguments in that thread.
+    """
+
+    def __init__(self, message=None):
+        if message is None:
+            message = _messages.pop(get_thread_id(), None)
+
+        super(AsyncCaseTimeout, self).__init__(message)
+
+
+class Guard(object):
+    """
+    Timeout of one run of case
+    """
+
+    def __init__(self, case, seconds):
+        self.case = case
+        self.seconds = seconds
+        self.deadline = None
+        self.fired = False
+        self.thread_id = get_thread_id()
+
+        self.__active = False
+        self.__lock = threading.Lock()
+        self.__gevent_timeout = None
+        self.__previous_handler = None
+
+        if getattr(case.config, 'GEVENT', False):
+            self.__mode = 'gevent'
+        elif hasattr(signal, 'setitimer') and is_main_thread():
+            self.__mode = 'signal'
+        else:
+            self.__mode = 'thread'
+
+    def __enter__(self):
+        self.__active = True
+
+        if _listener is not None:
+            _listener.on_case_started(self.case, self.seconds)
+
+        if self.__mode == 'gevent':
+            from gevent import Timeout
+
+            # greenlet is interrupted right where
+            # it's hung, so traceback shows the place
+            self.__gevent_timeout = Timeout(
+                self.seconds, CaseTimeout(get_message(self.case, self.seconds, 'see traceback')),
+            )
+            self.__gevent_timeout.start()
+        elif self.__mode == 'signal':
+            self.__previous_handler = signal.signal(signal.SIGALRM, self.__on_signal)
+            signal.setitimer(signal.ITIMER_REAL, self.seconds)
+        else:
+            get_watchdog().add(self)
+
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        if self.__mode == 'gevent':
+            self.__active = False
+            self.__gevent_timeout.cancel()
+        elif self.__mode == 'signal':
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            self.__active = False
+            signal.signal(signal.SIGALRM, self.__previous_handler or signal.SIG_DFL)
+        else:
+            with self.__lock:
+                self.__active = False
+
+                # case was done right after timeout, exception is not needed
+                if self.fired and _messages.pop(self.thread_id, None) is not None:
+                    set_async_exc(self.thread_id, None)
+
+            get_watchdog().remove(self)
+
+        if _listener is not None:
+            _listener.on_case_stopped(self.case)
+
+    def __on_signal(self, signum, frame):
+        if not self.__active:
+            return
+
+        self.fired = True
+
+        raise CaseTimeout(
+            get_message(self.case, self.seconds, ''.join(traceback.format_stack(frame))),
+        )
+
+    def fire(self):
+        """
+        It's called by watchdog thread
+        """
+        with self.__lock:
+            if not self.__active:
+                return
+
+            if self.fired:
+                logger.warning(
+                    'Case "{}" was not interrupted, it is blocked:\n{}'.format(
+                        self.case, format_stack(self.thread_id),
+                    ),
+                )
+                return
+
+            self.fired = True
+            message = get_message(self.case, self.seconds, format_stack(self.thread_id))
+
+            if _listener is not None:
+                _listener.on_case_hung(self.case, message)
+
+            _messages[self.thread_id] = message
+
+            if set_async_exc(self.thread_id, AsyncCaseTimeout):
+                get_watchdog().add(self, delay=INTERRUPT_GRACE)
+            else:
+                _messages.pop(self.thread_id, None)
+
+                logger.warning(
+                    'Case "{}" was timed out, but its thread can not be interrupted'.format(
+                        self.case,
+                    ),
+                )
+
+
+class NullGuard(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        pass
+
+
+NULL_GUARD = NullGuard()
+
+
+class Watchdog(threading.Thread):
+    """
+    Thread which fires guards of cases by deadlines.
+    Removed guards are dropped when they are on top of heap.
+    """
+
+    def __init__(self):
+        super(Watchdog, self).__init__(name='seismograph watchdog')
+
+        self.daemon = True
+
+        self.__heap = []
+        self.__counter = itertools.count()
+        self.__condition = threading.Condition()
+
+    def add(self, guard, delay=None):
+        with self.__condition:
+            guard.deadline = default_timer() + (delay or guard.seconds)
+            heapq.heappush(self.__heap, (guard.deadline, next(self.__counter), guard))
+            self.__condition.notify()
+
+    def remove(self, guard):
+        with self.__condition:
+            guard.deadline = None
+
+    def __next_guard(self):
+        with self.__condition:
+            while True:
+                while self.__heap and self.__heap[0][2].deadline is None:
+                    heapq.heappop(self.__heap)
+
+                if not self.__heap:
+                    self.__condition.wait()
+                    continue
+
+                timeout = self.__heap[0][0] - default_timer()
+
+                if timeout <= 0:
+                    guard = heapq.heappop(self.__heap)[2]
+                    guard.deadline = None
+                    return guard
+
+                self.__condition.wait(timeout)
+
+    def run(self):
+        while True:
+            guard = self.__next_guard()
+
+            try:
+                guard.fire()
+            except BaseException:
+                logger.warning('Watchdog was failed on guard of case', exc_info=True)
+
+
+def get_watchdog():
+    """
+    Thread of watchdog is not living after fork
+    """
+    global _watchdog
+
+    with _watchdog_lock:
+        if _watchdog is None or _watchdog[0] != os.getpid():
+            watchdog = Watchdog()
+            watchdog.start()
+            _watchdog = (os.getpid(), watchdog)
+
+        return _watchdog[1]
+
+
+def guard(case):
+    seconds = get_timeout(case)
+
+    if not seconds:
+        return NULL_GUARD
+
+    return Guard(case, seconds)
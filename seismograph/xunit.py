@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
 
+import os
 import json
 import pickle
 import marshal
+import tempfile
+from threading import Lock
 
 from .utils import pyv
+from .reason import Reason
+from .reason import format_reason
 
 
 XML_VERSION = '1.0'
@@ -14,6 +19,21 @@ ROUND_RUNTIME = 3
 
 
 class XUnitData(object):
+    """
+    Record of result for runnable object.
+    Reason can be given as reason object,
+    it will be formatted on first access only.
+    """
+
+    __slots__ = (
+        '__reason',
+        '__metrics',
+        '__runtime',
+        '__exc_type',
+        '__class_name',
+        '__method_name',
+        '__exc_message',
+    )
 
     def __init__(self,
                  exc=None,
@@ -22,7 +42,8 @@ class XUnitData(object):
                  exc_type=None,
                  class_name=None,
                  method_name=None,
-                 exc_message=None):
+                 exc_message=None,
+                 metrics=None):
         if exc:
             self.parse_exc(exc)
         else:
@@ -30,6 +51,7 @@ class XUnitData(object):
             self.__exc_message = exc_message
 
         self.__reason = reason
+        self.__metrics = metrics
         self.__runtime = runtime
         self.__class_name = class_name
         self.__method_name = method_name
@@ -52,6 +74,8 @@ class XUnitData(object):
 
     @property
     def reason(self):
+        if isinstance(self.__reason, Reason):
+            self.__reason = format_reason(self.__reason)
         return self.__reason
 
     @reason.setter
@@ -62,6 +86,10 @@ class XUnitData(object):
     def runtime(self):
         return round(self.__runtime, ROUND_RUNTIME)
 
+    @property
+    def metrics(self):
+        return self.__metrics
+
     @property
     def exc_type(self):
         return self.__exc_type
@@ -84,7 +112,8 @@ class XUnitData(object):
 
     def to_dict(self):
         return {
-            'reason': self.__reason,
+            'reason': self.reason,
+            'metrics': self.__metrics,
             'runtime': self.__runtime,
             'exc_type': self.__exc_type,
             'class_name': self.__class_name,
@@ -143,88 +172,137 @@ def to_xml_tag(tag_name, contains, **attributes):
         tag_name, dict_to_tag_attributes(attributes))
 
 
-def create_xml_document(result):
-    def render_result_proxy(result_proxy):
-        cases_report = []
+def format_metric(value):
+    if isinstance(value, float):
+        return '{:f}'.format(value)
+    return value
+
+
+def properties_to_xml(xunit_data):
+    if not xunit_data.metrics:
+        return u''
+
+    return to_xml_tag('properties',
+                      u''.join(
+                          to_xml_tag('property', None, name=name, value=format_metric(value))
+                          for name, value in sorted(xunit_data.metrics.items())
+                      ),
+                      )
+
+
+def success_to_xml(xunit_data):
+    return to_xml_tag('testcase',
+                      properties_to_xml(xunit_data),
+                      time=xunit_data.runtime,
+                      name=xunit_data.method_name,
+                      classname=xunit_data.class_name,
+                      )
+
+
+def skip_to_xml(xunit_data):
+    return to_xml_tag('testcase',
+                      properties_to_xml(xunit_data) +
+                      to_xml_tag('skipped',
+                                 cdata(xunit_data.reason),
+                                 ),
+                      time=xunit_data.runtime,
+                      name=xunit_data.method_name,
+                      classname=xunit_data.class_name,
+                      )
+
+
+def failure_to_xml(xunit_data):
+    return to_xml_tag('testcase',
+                      properties_to_xml(xunit_data) +
+                      to_xml_tag('failure',
+                                 cdata(xunit_data.reason),
+                                 type=xunit_data.exc_type,
+                                 message=xunit_data.exc_message,
+                                 ),
+                      time=xunit_data.runtime,
+                      name=xunit_data.method_name,
+                      classname=xunit_data.class_name,
+                      )
+
+
+def error_to_xml(xunit_data):
+    return to_xml_tag('testcase',
+                      properties_to_xml(xunit_data) +
+                      to_xml_tag('error',
+                                 cdata(xunit_data.reason),
+                                 type=xunit_data.exc_type,
+                                 message=xunit_data.exc_message,
+                                 ),
+                      time=xunit_data.runtime,
+                      name=xunit_data.method_name,
+                      classname=xunit_data.class_name,
+                      )
+
+
+# storage of result and render of its item
+# in order of test cases inside test suite
+TESTCASE_RENDERS = (
+    ('successes', success_to_xml),
+    ('skipped', skip_to_xml),
+    ('failures', failure_to_xml),
+    ('errors', error_to_xml),
+)
+RENDER_BY_STORAGE = dict(TESTCASE_RENDERS)
+
+
+def testsuite_attributes(result_proxy):
+    state = result_proxy.get_state()
+
+    return dict(
+        name=result_proxy.name,
+        tests=state.tests,
+        time=state.runtime,
+        skip=state.skipped,
+        errors=state.errors,
+        failures=state.failures,
+    )
 
-        for _, xunit_data in result_proxy.successes:
-            cases_report.append(
-                to_xml_tag('testcase', None,
-                           time=xunit_data.runtime,
-                           name=xunit_data.method_name,
-                           classname=xunit_data.class_name,
-                           ),
-            )
 
-        for _, xunit_data in result_proxy.skipped:
-            cases_report.append(
-                to_xml_tag('testcase',
-                           to_xml_tag('skipped',
-                                      cdata(xunit_data.reason),
-                                      ),
-                           time=xunit_data.runtime,
-                           name=xunit_data.method_name,
-                           classname=xunit_data.class_name,
-                           ),
-            )
+def testsuites_attributes(result):
+    return dict(
+        name=result.name,
+        tests=result.current_state.tests,
+        time=result.current_state.runtime,
+        skip=result.current_state.skipped,
+        errors=result.current_state.errors,
+        failures=result.current_state.failures,
+    )
 
-        for _, xunit_data in result_proxy.failures:
-            cases_report.append(
-                to_xml_tag('testcase',
-                           to_xml_tag('failure',
-                                      cdata(xunit_data.reason),
-                                      type=xunit_data.exc_type,
-                                      message=xunit_data.exc_message,
-                                      ),
-                           time=xunit_data.runtime,
-                           name=xunit_data.method_name,
-                           classname=xunit_data.class_name,
-                           ),
-            )
 
-        for _, xunit_data in result_proxy.errors:
-            cases_report.append(
-                to_xml_tag('testcase',
-                           to_xml_tag('error',
-                                      cdata(xunit_data.reason),
-                                      type=xunit_data.exc_type,
-                                      message=xunit_data.exc_message,
-                                      ),
-                           time=xunit_data.runtime,
-                           name=xunit_data.method_name,
-                           classname=xunit_data.class_name,
-                           ),
-            )
+def xml_declaration():
+    return u'<?xml version="{version}" encoding="{encoding}"?>'.format(
+        version=XML_VERSION,
+        encoding=XML_ENCODING,
+    )
 
-        state = result_proxy.get_state()
+
+def create_xml_document(result):
+    def render_result_proxy(result_proxy):
+        cases_report = []
+
+        for storage_name, render in TESTCASE_RENDERS:
+            for _, xunit_data in getattr(result_proxy, storage_name):
+                cases_report.append(render(xunit_data))
 
         return to_xml_tag('testsuite',
                           u''.join(cases_report),
-                          name=result_proxy.name,
-                          tests=state.tests,
-                          time=state.runtime,
-                          skip=state.skipped,
-                          errors=state.errors,
-                          failures=state.failures,
+                          **testsuite_attributes(result_proxy)
                           )
 
     data = u''.join(
         (
-            u'<?xml version="{version}" encoding="{encoding}"?>'.format(
-                version=XML_VERSION,
-                encoding=XML_ENCODING,
-            ),
+            xml_declaration(),
             to_xml_tag('testsuites',
                        u''.join(
                            map(render_result_proxy, result.proxies),
                        )
                        if result.proxies else render_result_proxy(result),
-                       name=result.name,
-                       tests=result.current_state.tests,
-                       time=result.current_state.runtime,
-                       skip=result.current_state.skipped,
-                       errors=result.current_state.errors,
-                       failures=result.current_state.failures,
+                       **testsuites_attributes(result)
                        ),
         ),
     )
@@ -233,3 +311,151 @@ def create_xml_document(result):
         return data.encode('utf-8')
 
     return data
+
+
+class XUnitWriter(object):
+    """
+    Streaming writer of xunit report.
+
+    Test cases are spooled to temporary file as they
+    are added to result, test suite is rendered when it's
+    done and document is assembled on close in order of
+    result proxies. Document is the same as from
+    create_xml_document, but it's never kept in memory.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, file_path):
+        self.__lock = Lock()
+        self.__file_path = file_path
+
+        self.__cases = tempfile.TemporaryFile()
+        self.__suites = tempfile.TemporaryFile()
+
+        # result -> {storage name: [[offset, length], ...]}
+        self.__segments = {}
+        # result -> {storage name: count of written items}
+        self.__written = {}
+        # result -> (offset, length) of rendered test suite
+        self.__rendered = {}
+        self.__invalid = set()
+
+    @staticmethod
+    def __append(fp, string):
+        fp.seek(0, os.SEEK_END)
+        offset = fp.tell()
+        data = string.encode('utf-8')
+        fp.write(data)
+        return offset, len(data)
+
+    def __copy(self, source, offset, length, target):
+        source.seek(offset)
+
+        while length > 0:
+            chunk = source.read(min(length, self.CHUNK_SIZE))
+
+            if not chunk:
+                break
+
+            target.write(chunk)
+            length -= len(chunk)
+
+    def __write(self, result, storage_name, storage):
+        segments = self.__segments.setdefault(result, {}).setdefault(storage_name, [])
+        written = self.__written.setdefault(result, {})
+
+        for _, xunit_data in storage:
+            offset, length = self.__append(
+                self.__cases, RENDER_BY_STORAGE[storage_name](xunit_data),
+            )
+
+            # cases of one suite are going one by one
+            # if suites are not run concurrently
+            if segments and sum(segments[-1]) == offset:
+                segments[-1][1] += length
+            else:
+                segments.append([offset, length])
+
+            written[storage_name] = written.get(storage_name, 0) + 1
+
+    def __render(self, result):
+        if result in self.__invalid:
+            # storage was changed after writing,
+            # so test suite is rendered from it
+            self.__invalid.discard(result)
+            self.__segments.pop(result, None)
+            self.__written.pop(result, None)
+
+        written = self.__written.get(result, {})
+
+        # items can be extended to storage directly,
+        # they were not written yet
+        for storage_name, _ in TESTCASE_RENDERS:
+            storage = getattr(result, storage_name)
+            self.__write(result, storage_name, storage[written.get(storage_name, 0):])
+
+        self.__written.pop(result, None)
+        segments = self.__segments.pop(result, {})
+
+        attributes = testsuite_attributes(result)
+
+        if not any(segments.values()):
+            self.__rendered[result] = self.__append(
+                self.__suites, to_xml_tag('testsuite', None, **attributes),
+            )
+            return
+
+        self.__suites.seek(0, os.SEEK_END)
+        offset = self.__suites.tell()
+
+        self.__suites.write(
+            u'<testsuite{}>'.format(dict_to_tag_attributes(attributes)).encode('utf-8'),
+        )
+
+        for storage_name, _ in TESTCASE_RENDERS:
+            for segment_offset, segment_length in segments.get(storage_name, []):
+                self.__copy(self.__cases, segment_offset, segment_length, self.__suites)
+
+        self.__suites.seek(0, os.SEEK_END)
+        self.__suites.write(u'</testsuite>'.encode('utf-8'))
+
+        self.__rendered[result] = (offset, self.__suites.tell() - offset)
+
+    def write(self, result, storage_name, storage):
+        with self.__lock:
+            self.__write(result, storage_name, storage)
+
+    def invalidate(self, result):
+        with self.__lock:
+            self.__invalid.add(result)
+
+    def finish(self, result):
+        with self.__lock:
+            if result not in self.__rendered:
+                self.__render(result)
+
+    def close(self, result):
+        with self.__lock:
+            suites = result.proxies or [result]
+
+            for result_proxy in suites:
+                if result_proxy not in self.__rendered:
+                    self.__render(result_proxy)
+
+            with open(self.__file_path, 'wb') as fp:
+                fp.write(xml_declaration().encode('utf-8'))
+                fp.write(
+                    u'<testsuites{}>'.format(
+                        dict_to_tag_attributes(testsuites_attributes(result)),
+                    ).encode('utf-8'),
+                )
+
+                for result_proxy in suites:
+                    offset, length = self.__rendered[result_proxy]
+                    self.__copy(self.__suites, offset, length, fp)
+
+                fp.write(u'</testsuites>'.encode('utf-8'))
+
+            self.__cases.close()
+            self.__suites.close()
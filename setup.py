@@ -116,7 +116,7 @@ def install_package():
         name='seismograph',
         version=__version__,
         url='https://github.com/trifonovmixail/seismograph',
-        packages=find_packages(exclude=('example*', 'tests*')),
+        packages=find_packages(exclude=('example*', 'tests*', 'benchmarks*')),
         author='Mikhail Trifonov',
         author_email='trifonovmixail@ya.ru',
         license='GNU LGPL',
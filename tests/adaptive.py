@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+import mock
+
+from seismograph.groups import adaptive
+from seismograph.groups import multiprocessing as mp
+
+from .lib.case import BaseTestCase
+from .lib.factories import config_factory
+
+
+MB = 1024 * 1024
+
+
+class FakeProbe(object):
+
+    def __init__(self, cpu=None, memory=None, available=None):
+        self.cpu = cpu
+        self.memory = memory
+        self.available = available
+
+    def get_cpu_utilization(self):
+        return self.cpu
+
+    def get_memory_usage(self):
+        return self.memory
+
+    def get_available_memory(self):
+        return self.available
+
+
+class FakeTarget(object):
+
+    def __init__(self):
+        self.limits = []
+
+    def set_limit(self, limit):
+        self.limits.append(limit)
+
+
+class TestController(BaseTestCase):
+
+    def create(self, limit=4, **kwargs):
+        controller = adaptive.Controller(8, **kwargs)
+        controller.limit = limit
+        return controller
+
+    def test_cpu(self):
+        controller = self.create()
+
+        self.assertEqual(controller.decide(0.2, None, None, None), 5)
+        self.assertEqual(controller.decide(0.8, None, None, None), 4)
+        self.assertEqual(controller.decide(0.99, None, None, None), 3)
+
+        controller.limit = 8
+        self.assertEqual(controller.decide(0.2, None, None, None), 8)
+
+    def test_memory_limit(self):
+        controller = self.create(memory_limit=100 * MB)
+
+        self.assertEqual(controller.decide(0.2, 120 * MB, None, None), 2)
+        # one more worker would be over headroom
+        self.assertEqual(controller.decide(0.2, 80 * MB, None, None), 4)
+        self.assertEqual(controller.decide(0.2, 40 * MB, None, None), 5)
+
+    def test_available_memory(self):
+        controller = self.create()
+
+        self.assertEqual(controller.decide(0.2, None, 0.01, None), 3)
+
+    def test_latency(self):
+        controller = self.create()
+
+        self.assertEqual(controller.decide(0.2, None, None, 1.0), 5)
+        self.assertEqual(controller.decide(0.2, None, None, 2.0), 4)
+
+    def test_memory_only(self):
+        controller = self.create(memory_limit=100 * MB, by_load=False)
+
+        self.assertEqual(controller.decide(0.99, 40 * MB, None, None), 5)
+        self.assertEqual(controller.decide(0.2, 120 * MB, None, None), 2)
+
+    def test_tick(self):
+        target = FakeTarget()
+        controller = adaptive.Controller(8, probe=FakeProbe(cpu=0.1))
+        controller.limit = 2
+        controller.add_target(target)
+
+        controller.observe(0.5)
+        controller.observe(1.5)
+        self.assertEqual(controller.pop_latency(), 1.0)
+        self.assertIsNone(controller.pop_latency())
+
+        controller.tick()
+
+        self.assertEqual(controller.limit, 3)
+        self.assertEqual(target.limits, [2, 3])
+
+
+class TestSystemProbe(BaseTestCase):
+
+    def test_memory(self):
+        probe = adaptive.SystemProbe()
+        memory = probe.get_memory_usage()
+
+        if memory is not None:
+            self.assertGreater(memory, 0)
+
+        available = probe.get_available_memory()
+
+        if available is not None:
+            self.assertTrue(0 <= available <= 1)
+
+
+class TestMPLimit(BaseTestCase):
+
+    def test_limit(self):
+        mp.import_mp()
+
+        limit = mp.MPLimit(4)
+        limit.set_limit(10)
+        self.assertEqual(limit.limit.value, 4)
+
+        limit.set_limit(1)
+        limit.acquire()
+        self.assertEqual(limit.running.value, 1)
+
+        limit.release()
+        self.assertEqual(limit.running.value, 0)
+
+
+class TestMaxThreads(BaseTestCase):
+
+    def test_explicit(self):
+        config = config_factory.create(MAX_THREADS=3, ASYNC_SUITES=4, ASYNC_TESTS=4)
+        self.assertEqual(adaptive.get_max_threads(config), 3)
+
+    def test_default_covers_quotas(self):
+        config = config_factory.create(ASYNC_SUITES=2, ASYNC_TESTS=4)
+
+        with mock.patch('multiprocessing.cpu_count', return_value=1), \
+                mock.patch.object(adaptive, 'cpu_count', return_value=1):
+            self.assertEqual(adaptive.get_max_threads(config), 8)
+
+            config.ADAPTIVE = True
+            self.assertEqual(adaptive.get_max_threads(config), adaptive.THREADS_PER_CPU)
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import shutil
+import tempfile
+
+from seismograph import benchmark
+
+from .lib.factories import case_factory
+from .lib.case import (
+    BaseTestCase,
+    ResultTestCaseMixin,
+)
+
+
+class TestStats(BaseTestCase):
+
+    def test_get_stats(self):
+        stats = benchmark.get_stats([0.4, 0.1, 0.3, 0.2])
+
+        self.assertEqual(stats[benchmark.MIN], 0.1)
+        self.assertAlmostEqual(stats[benchmark.MEDIAN], 0.25)
+        self.assertAlmostEqual(stats[benchmark.MEAN], 0.25)
+        self.assertEqual(stats[benchmark.P95], 0.4)
+        self.assertEqual(stats[benchmark.ITERATIONS], 4)
+        self.assertAlmostEqual(stats[benchmark.STDDEV], 0.129099, places=5)
+
+    def test_empty(self):
+        self.assertEqual(benchmark.get_stats([]), {})
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(benchmark.percentile(values, 95), 95)
+        self.assertEqual(benchmark.percentile(values, 0), 1)
+        self.assertIsNone(benchmark.percentile([], 95))
+
+
+class TestBenchmark(ResultTestCaseMixin, BaseTestCase):
+
+    __config_options__ = {
+        'BENCHMARK': True,
+        'BENCHMARK_WARMUP': 2,
+        'BENCHMARK_ITERATIONS': 5,
+    }
+
+    class CaseClass(case_factory.FakeCase):
+
+        calls = []
+
+        def test(self):
+            self.calls.append(None)
+
+    def setUp(self):
+        super(TestBenchmark, self).setUp()
+
+        del self.CaseClass.calls[:]
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, 'baseline.json')
+
+    def tearDown(self):
+        super(TestBenchmark, self).tearDown()
+
+        benchmark.load_baseline(None)
+        shutil.rmtree(self.tmp_dir)
+
+    def run_case(self):
+        case = self.CaseClass('test', config=self.config)
+        case(self.result)
+        return benchmark.get_case_key(case.__class_name__(), 'test')
+
+    def test_iterations(self):
+        self.run_case()
+
+        self.assertEqual(len(self.CaseClass.calls), 7)
+
+        _, xunit_data = self.result.successes[0]
+
+        self.assertEqual(xunit_data.metrics[benchmark.ITERATIONS], 5)
+        self.assertNotIn(benchmark.BASELINE, xunit_data.metrics)
+
+    def test_time_budget(self):
+        self.config.BENCHMARK_TIME = 0.01
+        self.run_case()
+
+        _, xunit_data = self.result.successes[0]
+
+        self.assertGreaterEqual(xunit_data.metrics[benchmark.ITERATIONS], 1)
+
+    def test_regression(self):
+        key = self.run_case()
+        benchmark.save_baseline(self.file_path, self.result)
+
+        with open(self.file_path) as fp:
+            data = json.load(fp)
+
+        self.assertIn(key, data)
+
+        data[key][benchmark.MEDIAN] = 0.0
+
+        with open(self.file_path, 'w') as fp:
+            json.dump(data, fp)
+
+        benchmark.load_baseline(self.file_path)
+        self.make_result()
+        self.run_case()
+
+        self.assertEqual(len(self.result.failures), 1)
+
+        _, xunit_data = self.result.failures[0]
+
+        self.assertIn('Benchmark regression', xunit_data.exc_message)
+        self.assertEqual(xunit_data.metrics[benchmark.BASELINE], 0.0)
+
+        # regressed case is not saved
+        benchmark.save_baseline(self.file_path, self.result)
+
+        with open(self.file_path) as fp:
+            self.assertEqual(json.load(fp)[key][benchmark.MEDIAN], 0.0)
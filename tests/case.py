@@ -5,7 +5,9 @@ from collections import OrderedDict
 
 import seismograph
 from seismograph import case
+from seismograph import scope
 from seismograph import xunit
+from seismograph import metrics
 from seismograph import result
 from seismograph.utils import pyv
 from seismograph.steps import step
@@ -17,6 +19,7 @@ from .lib.factories import config_factory
 from .lib.case import (
     BaseTestCase,
     CaseTestCaseMixin,
+    ResultTestCaseMixin,
     RunCaseTestCaseMixin,
 )
 from .lib import layers
@@ -213,6 +216,75 @@ class TestCaseContext(BaseTestCase):
         self.assertIsInstance(context.extensions, dict)
 
 
+class TestLayerChain(BaseTestCase):
+
+    class OnRunLayer(seismograph.CaseLayer):
+
+        def on_run(self, case):
+            pass
+
+    def setUp(self):
+        self.case = case_factory.create()
+        self.base_layer = seismograph.CaseLayer()
+        self.on_run_layer = self.OnRunLayer()
+
+    def test_skip_not_overridden(self):
+        layers = (self.base_layer, self.on_run_layer)
+
+        self.assertEqual(
+            case.get_layer_chain(layers, self.case, 'on_run'), (self.on_run_layer, ),
+        )
+        self.assertEqual(
+            case.get_layer_chain(layers, self.case, 'on_setup'), (),
+        )
+
+    def test_disabled_layer(self):
+        context = case.CaseContext(
+            lambda: None,
+            lambda: None,
+            layers=[layers.CaseLayer()],
+        )
+        layer = list(context.layers)[0]
+
+        layer.enabled = False
+        context.on_run(self.case)
+        self.assertEqual(layer.counter, 0)
+
+        layer.enabled = True
+        context.on_run(self.case)
+        self.assertEqual(layer.counter, 1)
+
+    def test_match_layer(self):
+        scope.match_case_to_layer(case_factory.FakeCase, self.on_run_layer)
+
+        try:
+            self.assertEqual(
+                case.get_layer_chain((), self.case, 'on_run'), (self.on_run_layer, ),
+            )
+        finally:
+            del case.MATCH_CASE_TO_LAYER[case_factory.FakeCase]
+            case.changed_layers()
+
+        self.assertEqual(case.get_layer_chain((), self.case, 'on_run'), ())
+
+    def test_replace_match_layer(self):
+        other_layer = self.OnRunLayer()
+        scope.match_case_to_layer(case_factory.FakeCase, self.on_run_layer)
+
+        try:
+            case.get_layer_chain((), self.case, 'on_run')
+
+            # number of matched layers is the same
+            scope.match_case_to_layer(case_factory.FakeCase, other_layer)
+
+            self.assertEqual(
+                case.get_layer_chain((), self.case, 'on_run'), (other_layer, ),
+            )
+        finally:
+            del case.MATCH_CASE_TO_LAYER[case_factory.FakeCase]
+            case.changed_layers()
+
+
 class TestAssertion(BaseTestCase):
 
     def test_unit_test(self):
@@ -765,3 +837,92 @@ class TestShouldStop(CaseTestCaseMixin, BaseTestCase):
         self.assertFalse(self.result.errors)
         self.assertFalse(self.result.failures)
         self.assertFalse(self.result.successes)
+
+
+class TestCaseDescriptor(ResultTestCaseMixin, BaseTestCase):
+
+    class CaseClass(case_factory.FakeCase):
+
+        created = []
+
+        def __init__(self, *args, **kwargs):
+            super(TestCaseDescriptor.CaseClass, self).__init__(*args, **kwargs)
+            self.created.append(self)
+            self.context.extensions['data'] = object()
+
+    def setUp(self):
+        super(TestCaseDescriptor, self).setUp()
+        del self.CaseClass.created[:]
+
+    def test_case_is_created_on_run(self):
+        descriptor = case.CaseDescriptor(self.CaseClass, 'test', config=self.config)
+
+        self.assertEqual(self.CaseClass.created, [])
+        self.assertEqual(descriptor.__class_name__(), self.CaseClass('test').__class_name__())
+        self.assertEqual(descriptor.__method_name__(), 'test')
+        del self.CaseClass.created[:]
+
+        case.CaseBox([descriptor])(self.result)
+
+        self.assertEqual(len(self.CaseClass.created), 1)
+        self.assertEqual(len(self.result.successes), 1)
+
+        created = self.CaseClass.created[0]
+        self.assertEqual(created.id, descriptor.id)
+        self.assertEqual(created.context.extensions, {})
+
+    def test_run_without_box(self):
+        descriptor = case.CaseDescriptor(self.CaseClass, 'test', config=self.config)
+        descriptor(self.result)
+
+        self.assertTrue(descriptor.__is_run__())
+        self.assertEqual(len(self.result.successes), 1)
+        self.assertEqual(self.CaseClass.created[0].context.extensions, {})
+
+    def test_has_class_fixtures(self):
+        descriptor = case.CaseDescriptor(self.CaseClass, 'test')
+        self.assertFalse(case.has_class_fixtures(descriptor))
+
+
+class TestCaseMetrics(ResultTestCaseMixin, BaseTestCase):
+
+    __config_options__ = {'METRICS': True}
+
+    class CaseClass(case_factory.FakeCase):
+
+        __layers__ = [layers.CaseLayer()]
+
+        def test(self):
+            pass
+
+        def test_fail(self):
+            self.assertion.fail('fail')
+
+    def test_phases_in_record(self):
+        self.CaseClass('test', config=self.config)(self.result)
+
+        _, xunit_data = self.result.successes[0]
+        data = xunit_data.metrics
+
+        for name in (metrics.SETUP, metrics.TEST, metrics.TEARDOWN, metrics.WALL, metrics.CPU, metrics.OVERHEAD):
+            self.assertIn(name, data)
+
+        self.assertIn(metrics.LAYER.format('CaseLayer', 'on_teardown'), data)
+        self.assertNotIn(metrics.MEMORY_PEAK, data)
+        self.assertGreaterEqual(data[metrics.WALL], data[metrics.TEST])
+
+    def test_fail_record(self):
+        self.CaseClass('test_fail', config=self.config)(self.result)
+
+        _, xunit_data = self.result.failures[0]
+
+        self.assertIn(metrics.TEST, xunit_data.metrics)
+        self.assertIn(metrics.LAYER.format('CaseLayer', 'on_fail'), xunit_data.metrics)
+
+    def test_disabled(self):
+        self.config.METRICS = False
+        self.CaseClass('test', config=self.config)(self.result)
+
+        _, xunit_data = self.result.successes[0]
+
+        self.assertIsNone(xunit_data.metrics)
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+from seismograph import loader
+from seismograph import discovery
+from seismograph.suite import Suite
+
+
+SCANNED_MODULE = """
+import seismograph
+
+suite = seismograph.Suite('discovery_scanned')
+
+
+@suite.register
+class CaseClass(seismograph.Case):
+
+    def test_one(self):
+        pass
+
+    def helper(self):
+        pass
+
+
+@suite.register
+def test_function(case):
+    pass
+"""
+
+DYNAMIC_MODULE = """
+import seismograph
+
+suite = seismograph.Suite('discovery_{}'.format('dynamic'))
+"""
+
+FACTORY_MODULE = """
+import seismograph
+
+suite = seismograph.Suite('discovery_static')
+
+
+def make_suite(name):
+    return seismograph.Suite(name)
+
+
+other = make_suite('discovery_factory')
+
+for name in ('a', 'b'):
+    globals()[name] = seismograph.Suite(name)
+"""
+
+
+BASE_MODULE = """
+import seismograph
+
+suite = seismograph.Suite('discovery_shared')
+"""
+
+REGISTERING_MODULE = """
+import seismograph
+
+from _discovery_base import suite
+
+local = seismograph.Suite('discovery_local')
+
+
+@suite.register
+class SharedCase(seismograph.Case):
+
+    def test(self):
+        pass
+"""
+
+
+class TestScanModule(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_module(self, name, source):
+        file_path = os.path.join(self.tmp_dir, '{}.py'.format(name))
+
+        with open(file_path, 'w') as fp:
+            fp.write(source)
+
+        return file_path
+
+    def test_scan(self):
+        file_path = self.write_module('scanned', SCANNED_MODULE)
+
+        self.assertEqual(
+            discovery.scan_module(file_path, 'scanned'),
+            {
+                'discovery_scanned': {
+                    'CaseClass': ['test_one'],
+                    'test_function': ['test'],
+                },
+            },
+        )
+
+    def test_name_from_module_name(self):
+        file_path = self.write_module('named', 'suite = Suite(__name__)\n')
+
+        self.assertEqual(
+            discovery.scan_module(file_path, 'package.named'),
+            {'package.named': {}},
+        )
+
+    def test_not_conclusive(self):
+        file_path = self.write_module('dynamic', DYNAMIC_MODULE)
+        self.assertIsNone(discovery.scan_module(file_path, 'dynamic'))
+
+    def test_factory(self):
+        file_path = self.write_module('factory', FACTORY_MODULE)
+        self.assertIsNone(discovery.scan_module(file_path, 'factory'))
+
+    def test_inert_statements(self):
+        source = '\n'.join((
+            '"""docstring"""',
+            'import seismograph',
+            'VALUE = [1, 2]',
+            'suite = seismograph.Suite("discovery_inert")',
+            'if __name__ == "__main__":',
+            '    seismograph.main()',
+        ))
+        file_path = self.write_module('inert', source)
+
+        self.assertEqual(
+            discovery.scan_module(file_path, 'inert'), {'discovery_inert': {}},
+        )
+
+    def test_register_in_suite_of_other_module(self):
+        file_path = self.write_module('registering', REGISTERING_MODULE)
+        self.assertIsNone(discovery.scan_module(file_path, 'registering'))
+
+
+class TestDiscoveryIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.suites_dir = os.path.join(self.tmp_dir, 'suites')
+        self.index_path = os.path.join(self.tmp_dir, 'index.json')
+
+        os.mkdir(self.suites_dir)
+
+        for name, source in (('discovery_scanned', SCANNED_MODULE), ('discovery_dynamic', DYNAMIC_MODULE)):
+            with open(os.path.join(self.suites_dir, '{}.py'.format(name)), 'w') as fp:
+                fp.write(source)
+
+        sys.path.append(self.suites_dir)
+
+    def tearDown(self):
+        sys.path.remove(self.suites_dir)
+        shutil.rmtree(self.tmp_dir)
+
+    def load(self, selected):
+        index = discovery.DiscoveryIndex(self.index_path)
+
+        suites = list(
+            loader.load_suites_from_path(
+                self.suites_dir,
+                Suite,
+                index=index,
+                is_selected=lambda names: any(n in selected for n in names),
+            ),
+        )
+        index.save()
+
+        return sorted(s.name for s in suites)
+
+    def test_skip_not_selected_module(self):
+        self.assertEqual(
+            self.load({'discovery_dynamic'}),
+            ['discovery_dynamic'],
+        )
+
+    def test_module_is_imported_once_for_index(self):
+        # suites of unknown module are loaded, program will filter them
+        self.assertEqual(self.load({'discovery_scanned'}), ['discovery_dynamic', 'discovery_scanned'])
+
+        with open(self.index_path) as fp:
+            modules = json.load(fp)['modules']
+
+        dynamic_path = os.path.join(self.suites_dir, 'discovery_dynamic.py')
+        self.assertEqual(
+            modules[os.path.abspath(dynamic_path)]['suites'],
+            {'discovery_dynamic': {}},
+        )
+
+        # names of dynamic suites are known now
+        self.assertEqual(self.load({'discovery_scanned'}), ['discovery_scanned'])
+        self.assertEqual(self.load({'nothing'}), [])
+
+    def test_changed_module_is_scanned_again(self):
+        self.load({'discovery_scanned'})
+
+        with open(os.path.join(self.suites_dir, 'discovery_scanned.py'), 'a') as fp:
+            fp.write('\nother = seismograph.Suite("discovery_other")\n')
+
+        self.assertEqual(self.load({'discovery_other'}), ['discovery_other', 'discovery_scanned'])
+
+    def test_cases_are_registered_from_other_module(self):
+        for name, source in (('_discovery_base', BASE_MODULE), ('discovery_cases', REGISTERING_MODULE)):
+            with open(os.path.join(self.suites_dir, '{}.py'.format(name)), 'w') as fp:
+                fp.write(source)
+
+        self.load({'discovery_shared'})
+
+        with open(self.index_path) as fp:
+            modules = json.load(fp)['modules']
+
+        cases_path = os.path.join(self.suites_dir, 'discovery_cases.py')
+        self.assertEqual(
+            modules[os.path.abspath(cases_path)]['suites']['discovery_shared'],
+            {'SharedCase': ['test']},
+        )
+
+        # module with cases is not skipped for suite of other module
+        self.assertIn('discovery_local', self.load({'discovery_shared'}))
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+
+import mock
+
+from seismograph.groups import executor
+from seismograph.groups import adaptive
+from seismograph.groups import get_pool_size_of_value
+from seismograph.groups.executor import Executor
+
+from .lib.case import BaseTestCase
+from .lib.factories import config_factory
+
+
+class Counter(object):
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.max = 0
+
+    def __call__(self, delay=0.01):
+        with self.lock:
+            self.current += 1
+            self.max = max(self.max, self.current)
+
+        time.sleep(delay)
+
+        with self.lock:
+            self.current -= 1
+
+
+class TestExecutor(BaseTestCase):
+
+    def setUp(self):
+        self.executor = Executor(2)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_global_limit(self):
+        counter = Counter()
+        queues = [self.executor.queue() for _ in range(3)]
+
+        for queue in queues:
+            for _ in range(4):
+                queue.submit(counter)
+
+        for queue in queues:
+            queue.join()
+
+        self.assertEqual(len(self.executor.workers), 2)
+        # thread of join is running own tasks in the limit
+        self.assertLessEqual(counter.max, 2)
+
+    def test_quota(self):
+        counter = Counter()
+        queue = self.executor.queue(quota=1)
+
+        for _ in range(4):
+            queue.submit(counter)
+
+        queue.join()
+
+        self.assertEqual(counter.max, 1)
+
+    def test_round_robin(self):
+        executor = Executor(1)
+        calls = []
+        first, second = executor.queue(), executor.queue()
+        gate, done = threading.Event(), threading.Event()
+
+        def call(name):
+            calls.append(name)
+
+            if len(calls) == 6:
+                done.set()
+
+        # worker is busy until all tasks are submitted
+        first.submit(gate.wait)
+
+        for _ in range(3):
+            first.submit(call, 'first')
+            second.submit(call, 'second')
+
+        gate.set()
+
+        # join of second would run its tasks by self
+        self.assertTrue(done.wait(5))
+        first.join()
+        second.join()
+        executor.shutdown()
+
+        self.assertEqual(calls, ['second', 'first'] * 3)
+
+    def test_nested_groups(self):
+        executor = Executor(1)
+        calls = []
+
+        def suite(name):
+            queue = executor.queue(quota=2)
+
+            for i in range(2):
+                queue.submit(calls.append, (name, i))
+
+            queue.join()
+
+        queue = executor.queue()
+
+        for name in ('a', 'b', 'c'):
+            queue.submit(suite, name)
+
+        queue.join()
+        executor.shutdown()
+
+        self.assertEqual(len(calls), 6)
+
+    def test_error(self):
+        queue = self.executor.queue()
+
+        queue.submit(lambda: 1 / 0)
+        queue.submit(lambda: None)
+
+        with self.assertRaises(ZeroDivisionError):
+            queue.join()
+
+    def test_set_limit(self):
+        counter = Counter()
+        queues = [self.executor.queue() for _ in range(2)]
+
+        self.executor.set_limit(1)
+
+        for queue in queues:
+            for _ in range(3):
+                queue.submit(counter)
+
+        # joining thread is waiting for slot of worker
+        queues[1].join()
+        queues[0].join()
+
+        self.assertEqual(counter.max, 1)
+
+    def test_nested_group_in_limit(self):
+        counter = Counter()
+
+        def suite():
+            queue = self.executor.queue()
+
+            for _ in range(3):
+                queue.submit(counter)
+
+            queue.join()
+
+        queue = self.executor.queue()
+
+        for _ in range(3):
+            queue.submit(suite)
+
+        queue.join()
+
+        # thread of suite lends own slot to its cases
+        self.assertLessEqual(counter.max, 2)
+
+
+class TestExecutorOfConfig(BaseTestCase):
+
+    def setUp(self):
+        executor.shutdown()
+
+    def tearDown(self):
+        executor.shutdown()
+
+    def test_quota_is_honored(self):
+        config = config_factory.create(ASYNC_TESTS=4)
+        counter = Counter()
+
+        # quota is not cut by num of cpu
+        with mock.patch('multiprocessing.cpu_count', return_value=1), \
+                mock.patch.object(adaptive, 'cpu_count', return_value=1):
+            queue = executor.get_executor(config).queue(
+                quota=get_pool_size_of_value(config.ASYNC_TESTS, in_two=True),
+            )
+
+            for _ in range(8):
+                queue.submit(counter, 0.05)
+
+            queue.join()
+
+        self.assertEqual(counter.max, 4)
@@ -1,12 +1,23 @@
+import time
 import inspect
+import unittest
+from threading import Thread
 
 from seismograph import extensions
 from seismograph import program
 from seismograph import exceptions
+from seismograph.utils import pyv
+from seismograph.datastructures import DictObject
+from seismograph.datastructures import CopyOnWriteProxy
 from copy import deepcopy
+from collections import deque
 
+from .lib.factories import case_factory
+from .lib.factories import suite_factory
+from .lib.factories import config_factory
 from .lib.case import (
     BaseTestCase,
+    ResultTestCaseMixin,
 )
 
 
@@ -101,3 +112,370 @@ class TestSharedSingletonExtension(BaseTestCase):
 
     def tearDown(self):
         extensions._TMP.pop('test_extension', None)
+
+
+class TestLazyExtension(BaseTestCase):
+    ex_tmp = extensions._TMP
+
+    def setUp(self):
+        self.installed = []
+
+        def install():
+            self.installed.append(True)
+            program.Program.shared_extension('test_extension', TestExtension, args=args)
+
+        extensions.set(install, 'test_extension', lazy=True)
+
+    def test_install_on_first_usage(self):
+        self.assertEqual(self.installed, [])
+        self.assertEqual(extensions.get('test_extension').args, args)
+        self.assertEqual(extensions.get('test_extension').args, args)
+        self.assertEqual(self.installed, [True])
+
+    def test_not_installed(self):
+        extensions.set(lambda: None, 'test_extension', lazy=True)
+        self.assertRaises(exceptions.ExtensionNotFound, extensions.get, 'test_extension')
+
+    def test_extension_is_not_imported_if_not_used(self):
+        from mock import Mock
+        from optparse import OptionParser
+        from seismograph.ext import LazyExtension
+        from seismograph.ext.options import add_seisma_options
+
+        extension = LazyExtension(
+            'not_existing', names=('test_extension', ), add_options=add_seisma_options,
+        )
+        extension.__add_options__(OptionParser())
+
+        fake_program = Mock(context=Mock(require=[]), config=config_factory.create())
+        self.assertFalse(extension.is_used(fake_program))
+
+        fake_program.config.SEISMA_URL = 'http://localhost'
+        self.assertTrue(extension.is_used(fake_program))
+
+        fake_program.config.SEISMA_URL = None
+        extension.__install__(fake_program)
+
+        self.assertFalse(extension.is_loaded)
+        self.assertIsInstance(self.ex_tmp['test_extension'], extensions.LazyExtensionContainer)
+
+    def tearDown(self):
+        extensions._TMP.pop('test_extension', None)
+
+
+class TestSharedDataCopy(BaseTestCase):
+
+    def setUp(self):
+        self.data = {'users': [{'name': 'one'}], 'count': 1}
+
+    def tearDown(self):
+        extensions._TMP.pop('test_data', None)
+
+    def test_deep_by_default(self):
+        program.Program.shared_data('test_data', self.data)
+        value = extensions.get('test_data')
+
+        self.assertEqual(value, self.data)
+        self.assertIsNot(value['users'], self.data['users'])
+
+    def test_shallow(self):
+        program.Program.shared_data('test_data', self.data, copy=extensions.COPY_SHALLOW)
+        value = extensions.get('test_data')
+
+        self.assertIsNot(value, self.data)
+        self.assertIs(value['users'], self.data['users'])
+
+    def test_none(self):
+        program.Program.shared_data('test_data', self.data, copy=extensions.COPY_NONE)
+        self.assertIs(extensions.get('test_data'), self.data)
+
+    def test_unknown_policy(self):
+        self.assertRaises(ValueError, program.Program.shared_data, 'test_data', self.data, copy='fast')
+
+    def test_frozen(self):
+        program.Program.shared_data('test_data', self.data, copy=extensions.COPY_FROZEN)
+
+        one = extensions.get('test_data')
+        two = extensions.get('test_data')
+
+        self.assertEqual(one['users'][0]['name'], 'one')
+        self.assertEqual(one, self.data)
+
+        one['users'][0]['name'] = 'two'
+        one['users'].append({'name': 'three'})
+        one['count'] += 1
+
+        self.assertEqual(one['users'][0]['name'], 'two')
+        self.assertEqual(len(one['users']), 2)
+        self.assertEqual(one['count'], 2)
+
+        self.assertEqual(two, self.data)
+        self.assertEqual(self.data, {'users': [{'name': 'one'}], 'count': 1})
+
+
+class TestCopyOnWriteProxy(BaseTestCase):
+
+    def test_read(self):
+        data = DictObject(a=[1, 2], b=DictObject(c='d'))
+        proxy = CopyOnWriteProxy(data)
+
+        self.assertEqual(proxy.b.c, 'd')
+        self.assertEqual(list(proxy.a), [1, 2])
+        self.assertEqual(proxy.get('a'), [1, 2])
+        self.assertEqual(proxy.get('x', 1), 1)
+        self.assertIn('a', proxy)
+        self.assertEqual(len(proxy), 2)
+        self.assertEqual(sorted(proxy.keys()), ['a', 'b'])
+
+    def test_write_by_attribute(self):
+        data = DictObject(b=DictObject(c='d'))
+        proxy = CopyOnWriteProxy(data)
+
+        proxy.b.c = 'e'
+        del proxy.b
+
+        self.assertNotIn('b', proxy)
+        self.assertEqual(data.b.c, 'd')
+
+    def test_nested_values_are_not_changed(self):
+        data = {'a': {'b': []}}
+        proxy = CopyOnWriteProxy(data)
+
+        for value in proxy.values():
+            value['b'].append(1)
+
+        self.assertEqual(proxy, {'a': {'b': [1]}})
+        self.assertEqual(data, {'a': {'b': []}})
+
+    def test_augmented_assignment(self):
+        data = {'a': [1]}
+        proxy = CopyOnWriteProxy(data)
+
+        proxy['a'] += [2]
+        proxy['b'] = proxy['a']
+
+        self.assertEqual(proxy, {'a': [1, 2], 'b': [1, 2]})
+        self.assertEqual(data, {'a': [1]})
+
+    def test_any_method_is_called_on_copy(self):
+        class Storage(object):
+
+            def __init__(self):
+                self.items = []
+
+            def put(self, item):
+                self.items.append(item)
+
+        data = {'queue': deque([1]), 'storage': Storage()}
+        proxy = CopyOnWriteProxy(data)
+
+        proxy['queue'].appendleft(0)
+        proxy['storage'].put(1)
+
+        self.assertEqual(list(proxy['queue']), [0, 1])
+        self.assertEqual(list(data['queue']), [1])
+        self.assertEqual(list(proxy['storage'].items), [1])
+        self.assertEqual(data['storage'].items, [])
+
+    def test_copy_is_real_object(self):
+        data = {'a': [1]}
+        value = deepcopy(CopyOnWriteProxy(data))
+
+        self.assertIsInstance(value, dict)
+        self.assertEqual(value, data)
+        self.assertIsNot(value['a'], data['a'])
+
+
+class Resource(object):
+
+    created = []
+
+    def __init__(self):
+        self.is_closed = False
+        self.created.append(self)
+
+    def close(self):
+        self.is_closed = True
+
+
+class SlowResource(Resource):
+
+    def __init__(self):
+        time.sleep(0.05)
+        super(SlowResource, self).__init__()
+
+
+class TestPooledExtension(BaseTestCase):
+
+    def setUp(self):
+        del Resource.created[:]
+
+    def tearDown(self):
+        for name in ('test_pool', 'test_pool_a', 'test_pool_b'):
+            extensions._TMP.pop(name, None)
+
+    def make_container(self, **kwargs):
+        program.Program.shared_extension('test_pool', Resource, close=Resource.close, **kwargs)
+        return extensions._TMP['test_pool']
+
+    def test_pool_size(self):
+        from threading import Thread
+
+        container = self.make_container(pool_size=2)
+        errors = []
+
+        def target(number):
+            try:
+                for _ in range(20):
+                    instance = container.acquire(('case', number))
+                    self.assertFalse(instance.is_closed)
+                    container.release(('case', number))
+            except BaseException as error:
+                errors.append(error)
+
+        threads = [Thread(target=target, args=(i, )) for i in range(8)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(Resource.created), 2)
+
+        container.shutdown()
+        self.assertTrue(all(r.is_closed for r in Resource.created))
+
+    def test_scope_is_shared(self):
+        container = self.make_container(scope=extensions.SCOPE_SUITE)
+
+        one = container.acquire(container.get_key(object(), suite_name='suite'))
+        two = container.acquire(container.get_key(object(), suite_name='suite'))
+        other = container.acquire(container.get_key(object(), suite_name='other'))
+
+        self.assertIs(one, two)
+        self.assertIsNot(one, other)
+
+    def test_health_check(self):
+        container = self.make_container(pool_size=1, check=lambda r: not r.is_closed)
+
+        instance = container.acquire('key')
+        container.release('key')
+        instance.is_closed = True
+
+        self.assertIsNot(container.acquire('key'), instance)
+        self.assertEqual(container.size, 1)
+
+    def test_idle_timeout(self):
+        container = self.make_container(scope=extensions.SCOPE_CASE, idle_timeout=0.001)
+
+        instance = container.acquire('key')
+        container.release('key')
+        time.sleep(0.01)
+
+        self.assertIsNot(container.acquire('key'), instance)
+        self.assertTrue(instance.is_closed)
+
+    def test_acquire_by_case_context(self):
+        self.make_container(pool_size=1)
+
+        case = case_factory.create()
+        case.context.require.append('test_pool')
+        case.context.install_extensions()
+
+        self.assertNotIn('test_pool', case.context.extensions)
+
+        with case.context(case):
+            instance = case.ext('test_pool')
+            self.assertIsInstance(instance, Resource)
+
+        self.assertNotIn('test_pool', case.context.extensions)
+
+        with case.context(case):
+            self.assertIs(case.ext('test_pool'), instance)
+
+    def test_require_in_other_order(self):
+        for name in ('test_pool_a', 'test_pool_b'):
+            program.Program.shared_extension(name, SlowResource, close=Resource.close, pool_size=1)
+
+        errors = []
+
+        def target(require):
+            try:
+                case = case_factory.create()
+                case.context.require.extend(require)
+                case.context.install_extensions()
+
+                for _ in range(5):
+                    with case.context(case):
+                        for name in require:
+                            self.assertIsInstance(case.ext(name), Resource)
+            except BaseException as error:
+                errors.append(error)
+
+        threads = [
+            Thread(target=target, args=(['test_pool_a', 'test_pool_b'], )),
+            Thread(target=target, args=(['test_pool_b', 'test_pool_a'], )),
+        ]
+
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        self.assertFalse(any(t.is_alive() for t in threads), 'Cases were deadlocked on pools')
+        self.assertEqual(errors, [])
+        self.assertEqual(len(Resource.created), 2)
+
+
+class PooledCase(case_factory.FakeCase):
+
+    __require__ = ['test_pool']
+
+    def test(self):
+        self.assertion.is_instance(self.ext('test_pool'), Resource)
+
+    def test_other(self):
+        self.assertion.is_instance(self.ext('test_pool'), Resource)
+
+
+class TestPooledExtensionOfSuite(ResultTestCaseMixin, BaseTestCase):
+
+    def setUp(self):
+        super(TestPooledExtensionOfSuite, self).setUp()
+
+        del Resource.created[:]
+        program.Program.shared_extension('test_pool', Resource, close=Resource.close, pool_size=1)
+
+    def tearDown(self):
+        super(TestPooledExtensionOfSuite, self).tearDown()
+
+        extensions._TMP.pop('test_pool', None)
+
+    def run_suite(self):
+        suite = suite_factory.create(require=['test_pool'], config=self.config)
+        suite.cases.append(PooledCase)
+        suite.build()
+
+        thread = Thread(target=suite, args=(self.result, ))
+        thread.daemon = True
+        thread.start()
+        thread.join(timeout=10)
+
+        self.assertFalse(thread.is_alive(), 'Suite was hung on pool')
+        self.assertEqual(len(self.result.successes), 2)
+
+    def test_sequential(self):
+        self.run_suite()
+
+        # instance of suite is out of pool
+        self.assertEqual(len(Resource.created), 2)
+        self.assertTrue(Resource.created[0].is_closed)
+
+    @unittest.skipIf(pyv.IS_PYTHON_2, 'asyncio is not available')
+    def test_asyncio(self):
+        self.config.ASYNCIO = True
+        self.config.ASYNC_TESTS = 2
+
+        self.run_suite()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import shutil
+import tempfile
+
+from seismograph import history
+from seismograph.case import CaseBox
+
+from .lib.factories import case_factory
+from .lib.case import (
+    BaseTestCase,
+    ResultTestCaseMixin,
+)
+
+
+class CaseClass(case_factory.FakeCase):
+
+    def test_one(self):
+        pass
+
+    def test_two(self):
+        pass
+
+
+class TestSortByRuntime(BaseTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, 'history.json')
+
+        with open(self.file_path, 'w') as fp:
+            json.dump(
+                {
+                    history.SUITES_KEY: {},
+                    history.CASES_KEY: {
+                        '{}.CaseClass.test'.format(case_factory.__name__): 1.0,
+                        '{}.CaseClass.test_one'.format(case_factory.__name__): 3.0,
+                    },
+                },
+                fp,
+            )
+
+    def tearDown(self):
+        history._HISTORY.pop(self.file_path, None)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_longest_first(self):
+        test = CaseClass('test')
+        test_one = CaseClass('test_one')
+
+        self.assertEqual(
+            history.sort_by_runtime([test, test_one], self.file_path),
+            [test_one, test],
+        )
+
+    def test_unknown_first(self):
+        test = CaseClass('test')
+        test_two = CaseClass('test_two')
+
+        self.assertEqual(
+            history.sort_by_runtime([test, test_two], self.file_path),
+            [test_two, test],
+        )
+
+    def test_case_box(self):
+        box = CaseBox([CaseClass('test'), CaseClass('test_one')])
+        data = history.load(self.file_path)
+
+        self.assertEqual(history.get_runtime(data, box), 4.0)
+
+
+class TestSave(ResultTestCaseMixin, BaseTestCase):
+
+    def setUp(self):
+        super(TestSave, self).setUp()
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, 'history.json')
+
+    def tearDown(self):
+        super(TestSave, self).tearDown()
+
+        history._HISTORY.pop(self.file_path, None)
+        shutil.rmtree(self.tmp_dir)
+
+    def runTest(self):
+        case = CaseClass('test_one', config=self.config)
+        self.result.add_success(case, 2.0)
+
+        history.save(self.file_path, self.result)
+
+        with open(self.file_path) as fp:
+            data = json.load(fp)
+
+        self.assertEqual(
+            data[history.CASES_KEY],
+            {'{}.CaseClass.test_one'.format(case_factory.__name__): 2.0},
+        )
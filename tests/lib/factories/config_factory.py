@@ -7,11 +7,19 @@ class FakeConfig(object):
 
     def __init__(self):
         self.XUNIT_REPORT = None
+        self.METRICS = False
+        self.METRICS_MEMORY = False
         self.VERBOSE = False
         self.OUTPUT = None
         self.NO_CAPTURE = False
         self.SUITE_DETAIL = False
         self.TREE = False
+        self.PROFILE_STARTUP = False
+        self.TRACE = None
+        self.PROFILE = None
+        self.PROFILE_MODE = 'cprofile'
+        self.PROFILE_INTERVAL = 0.005
+        self.PROFILE_TOP = 20
         self.NO_COLOR = False
         self.STEPS_LOG = False
         self.FLOWS_LOG = False
@@ -26,8 +34,31 @@ class FakeConfig(object):
         self.NO_SCRIPTS = False
         self.ASYNC_SUITES = 0
         self.ASYNC_TESTS = 0
+        self.MAX_THREADS = 0
+        self.ADAPTIVE = False
+        self.ADAPTIVE_INTERVAL = 1.0
+        self.MEMORY_LIMIT = None
+        self.CASE_TIMEOUT = None
         self.MULTIPROCESSING_TIMEOUT = 1800.0
+        self.MP_GRANULARITY = 'suite'
+        self.BENCHMARK = False
+        self.BENCHMARK_WARMUP = 1
+        self.BENCHMARK_ITERATIONS = 10
+        self.BENCHMARK_TIME = None
+        self.BENCHMARK_BASELINE = None
+        self.BENCHMARK_SAVE = False
+        self.BENCHMARK_THRESHOLD = 0.2
+        self.LOAD = False
+        self.LOAD_USERS = 10
+        self.LOAD_DURATION = 60.0
+        self.LOAD_RAMP_UP = 0.0
+        self.LOAD_RATE = None
+        self.LOAD_ITERATIONS = None
+        self.LOAD_REPORT = None
+        self.RUNTIME_HISTORY = None
+        self.DISCOVERY_INDEX = None
         self.GEVENT = False
+        self.ASYNCIO = False
         self.THREADING = False
         self.MULTIPROCESSING = False
         self.PDB = False
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import shutil
+import tempfile
+import itertools
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+from seismograph import load
+from seismograph.steps import step
+from seismograph.groups.load import Schedule
+from seismograph.groups.load import LoadSuiteGroup
+
+from .lib.factories import case_factory
+from .lib.factories import suite_factory
+from .lib.case import (
+    BaseTestCase,
+    ResultTestCaseMixin,
+)
+
+
+class TestHistogram(BaseTestCase):
+
+    def test_buckets(self):
+        for value in (0, 1, 127, 128, 255, 256, 257, 511, 512, 1000, 123456, 10 ** 9):
+            bucket = load.get_bucket(value)
+
+            self.assertLessEqual(load.get_lowest_value(bucket), value)
+            self.assertGreaterEqual(load.get_highest_value(bucket), value)
+            self.assertLess(
+                load.get_highest_value(bucket) - load.get_lowest_value(bucket),
+                max(value / 100.0, 1),
+            )
+
+    def test_percentile(self):
+        histogram = load.Histogram()
+
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000.0)
+
+        self.assertEqual(histogram.count, 1000)
+        self.assertEqual(histogram.min, 0.001)
+        self.assertEqual(histogram.max, 1.0)
+        self.assertAlmostEqual(histogram.mean, 0.5005, places=4)
+        self.assertAlmostEqual(histogram.percentile(50), 0.5, delta=0.005)
+        self.assertAlmostEqual(histogram.percentile(99), 0.99, delta=0.01)
+        self.assertEqual(histogram.percentile(100), 1.0)
+        self.assertIsNone(load.Histogram().percentile(50))
+
+    def test_merge_and_dict(self):
+        first, second = load.Histogram(), load.Histogram()
+
+        first.record(0.001)
+        second.record(0.5)
+
+        first.merge(second)
+        restored = load.Histogram.from_dict(json.loads(json.dumps(first.to_dict())))
+
+        self.assertEqual(restored.count, 2)
+        self.assertEqual(restored.min, 0.001)
+        self.assertEqual(restored.max, 0.5)
+        self.assertEqual(restored.percentile(100), first.percentile(100))
+
+
+class TestSchedule(BaseTestCase):
+
+    def test_iterations(self):
+        schedule = Schedule(2, 60, iterations=3)
+        schedule.start()
+
+        self.assertEqual([schedule.next() for _ in range(4)], [0.0, 0.0, 0.0, None])
+
+    def test_rate(self):
+        schedule = Schedule(1, 1, rate=2)
+        schedule.start()
+
+        delays = [schedule.next() for _ in range(3)]
+
+        self.assertEqual(delays[0], 0.0)
+        self.assertAlmostEqual(delays[1], 0.5, places=2)
+        self.assertIsNone(delays[2])
+
+    def test_ramp_up(self):
+        schedule = Schedule(4, 60, ramp_up=2)
+
+        self.assertEqual(
+            [schedule.get_start_delay(i) for i in range(4)], [0.0, 0.5, 1.0, 1.5],
+        )
+
+
+class TestLoadSuiteGroup(ResultTestCaseMixin, BaseTestCase):
+
+    __config_options__ = {
+        'LOAD': True,
+        'LOAD_USERS': 3,
+        'LOAD_ITERATIONS': 12,
+    }
+
+    class StepCase(case_factory.FakeCase):
+
+        calls = []
+
+        @step(1, 'first')
+        def first(self):
+            self.calls.append(self)
+            self.number = next(self.counter)
+
+        @step(2, 'second')
+        def second(self):
+            self.assertion.true(self.number % 4 != 3)
+
+    def setUp(self):
+        super(TestLoadSuiteGroup, self).setUp()
+
+        del self.StepCase.calls[:]
+        self.StepCase.counter = itertools.count()
+
+        self.tmp_dir = tempfile.mkdtemp()
+
+        suite = suite_factory.create(config=self.config)
+        suite.cases.append(self.StepCase)
+        suite.build()
+
+        LoadSuiteGroup([suite], self.config)(self.result)
+
+    def tearDown(self):
+        super(TestLoadSuiteGroup, self).tearDown()
+
+        load.clear()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_iterations(self):
+        # instance of case is created for each iteration
+        self.assertEqual(len(set(self.StepCase.calls)), 12)
+
+    def test_stats(self):
+        name = load.get_iteration_name(
+            '{}.StepCase'.format(self.StepCase.__mount_data__.suite_name), 'test',
+        )
+        stats = load.get_stats(name)
+
+        self.assertEqual(stats.histogram.count, 12)
+        self.assertEqual(stats.errors, 3)
+        self.assertEqual(load.get_stats('{}.second'.format(name)).errors, 3)
+        self.assertEqual(load.get_stats('{}.first'.format(name)).histogram.count, 12)
+
+    def test_one_record_of_case(self):
+        self.assertEqual(len(self.result.failures), 1)
+        self.assertEqual(len(self.result.successes), 0)
+
+        _, xunit_data = self.result.failures[0]
+
+        self.assertEqual(xunit_data.metrics[load.ITERATIONS], 12)
+        self.assertEqual(xunit_data.metrics[load.ERRORS], 3)
+        self.assertIn('3 of 12 iterations', xunit_data.reason)
+
+    def test_report(self):
+        stream = StringIO()
+        load.print_report(stream=stream)
+
+        self.assertIn('p99.9', stream.getvalue())
+
+        file_path = os.path.join(self.tmp_dir, 'load.json')
+        load.export(file_path)
+
+        with open(file_path) as fp:
+            data = json.load(fp)
+
+        self.assertEqual(data['info']['users'], 3)
+        self.assertEqual(len(data['stats']), 3)
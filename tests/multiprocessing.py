@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+import os
+import signal
+import unittest
+import threading
+
+import mock
+
+from seismograph import case
+from seismograph.exceptions import CaseTimeout
+from seismograph.exceptions import WorkerError
+from seismograph.groups import multiprocessing as mp
+
+from .lib.factories import case_factory
+from .lib.factories import suite_factory
+from .lib.case import (
+    BaseTestCase,
+    ResultTestCaseMixin,
+)
+
+
+class SuccessCase(case_factory.FakeCase):
+
+    def test(self):
+        pass
+
+    def test_other(self):
+        pass
+
+
+class FailCase(case_factory.FakeCase):
+
+    def test(self):
+        self.assertion.true(False)
+
+
+class ErrorCase(case_factory.FakeCase):
+
+    def test(self):
+        raise ValueError('error')
+
+
+class CrashCase(case_factory.FakeCase):
+
+    def test(self):
+        os._exit(3)
+
+
+class BlockedCase(case_factory.FakeCase):
+
+    __timeout__ = 0.1
+
+    def test(self):
+        # case can not be interrupted in worker
+        signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGALRM])
+        threading.Event().wait()
+
+
+class FixturesCase(case_factory.FakeCase):
+
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    def test(self):
+        pass
+
+    def test_other(self):
+        pass
+
+
+class MultiprocessingTestCase(ResultTestCaseMixin, BaseTestCase):
+
+    __config_options__ = {
+        'MULTIPROCESSING': True,
+        'MULTIPROCESSING_TIMEOUT': 30.0,
+        'ASYNC_SUITES': 2,
+        'ASYNC_TESTS': 2,
+    }
+
+    def setUp(self):
+        super(MultiprocessingTestCase, self).setUp()
+
+        mp.import_mp()
+
+    def create_suite(self, *case_classes):
+        suite = suite_factory.create(config=self.config)
+
+        for case_class in case_classes:
+            suite.cases.append(case_class)
+
+        suite.build()
+
+        return suite
+
+    def run_suites(self, *suites):
+        mp.MultiprocessingSuiteGroup(suites, self.config)(self.result)
+
+    def get_counts(self):
+        return (
+            len(self.result.successes),
+            len(self.result.failures),
+            len(self.result.errors),
+        )
+
+
+class TestSuiteGranularity(MultiprocessingTestCase):
+
+    def test_merge(self):
+        self.run_suites(
+            self.create_suite(SuccessCase, FailCase),
+            self.create_suite(ErrorCase),
+            self.create_suite(SuccessCase),
+        )
+
+        self.assertEqual(self.get_counts(), (4, 1, 1))
+        # records are merged to proxies of suites
+        self.assertEqual(len(self.result.proxies), 3)
+
+        _, xunit_data = self.result.errors[0]
+        self.assertIn('ValueError', xunit_data.reason)
+
+    def test_stop(self):
+        self.config.STOP = True
+        self.config.ASYNC_SUITES = 1
+
+        suites = [self.create_suite(FailCase)]
+        suites.extend(self.create_suite(SuccessCase) for _ in range(3))
+
+        self.run_suites(*suites)
+
+        self.assertTrue(self.result.current_state.should_stop)
+        self.assertEqual(self.get_counts(), (0, 1, 0))
+
+    def test_worker_crash(self):
+        self.config.ASYNC_SUITES = 1
+
+        self.run_suites(
+            self.create_suite(SuccessCase, CrashCase),
+            self.create_suite(SuccessCase),
+        )
+
+        # cases of the crashed task are errors,
+        # next suite is run by new worker
+        self.assertEqual(self.get_counts(), (2, 0, 3))
+
+        for _, xunit_data in self.result.errors:
+            self.assertTrue(xunit_data.exc_type.endswith(WorkerError.__name__))
+            self.assertIn('code "3"', xunit_data.reason)
+
+    @unittest.skipUnless(hasattr(signal, 'pthread_sigmask'), 'signals can not be blocked')
+    def test_kill_hung_worker(self):
+        self.config.ASYNC_SUITES = 1
+
+        with mock.patch.object(mp, 'KILL_GRACE', 0.1):
+            self.run_suites(
+                self.create_suite(SuccessCase, BlockedCase),
+                self.create_suite(SuccessCase),
+            )
+
+        # not reported cases of killed task are errors too
+        self.assertEqual(self.get_counts(), (2, 0, 3))
+
+        exc_types = sorted(
+            xunit_data.exc_type.split('.')[-1] for _, xunit_data in self.result.errors
+        )
+        self.assertEqual(
+            exc_types, [CaseTimeout.__name__, WorkerError.__name__, WorkerError.__name__],
+        )
+
+
+class TestCaseGranularity(MultiprocessingTestCase):
+
+    def setUp(self):
+        super(TestCaseGranularity, self).setUp()
+
+        self.config.MP_GRANULARITY = 'case'
+
+    def test_run(self):
+        suite = self.create_suite(SuccessCase, FailCase, ErrorCase)
+        self.assertIsInstance(suite._make_group(), mp.MultiprocessingCaseGroup)
+
+        suite(self.result)
+
+        self.assertEqual(self.get_counts(), (2, 1, 1))
+
+    def test_boxes(self):
+        suite = self.create_suite(SuccessCase, FixturesCase)
+
+        pool = mp.Multiprocessing(self.result, self.config)
+        pool.add_cases(list(suite))
+
+        # box with class fixtures is not separated
+        self.assertEqual(
+            sorted(len(list(obj)) for obj in pool.objects), [1, 1, 2],
+        )
+
+    def test_get_cases(self):
+        suite = self.create_suite(SuccessCase, FixturesCase)
+
+        self.assertEqual(len(mp.get_cases(suite)), 4)
+        self.assertTrue(
+            all(isinstance(c, (case.Case, case.CaseDescriptor)) for c in mp.get_cases(suite)),
+        )
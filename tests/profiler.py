@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import threading
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+from seismograph import profiler
+
+from .lib.factories import case_factory
+from .lib.case import (
+    BaseTestCase,
+    ResultTestCaseMixin,
+)
+
+
+class FakeFrame(object):
+
+    class Code(object):
+
+        def __init__(self, name):
+            self.co_filename = 'file.py'
+            self.co_firstlineno = 1
+            self.co_name = name
+
+    def __init__(self, name, back=None):
+        self.f_code = self.Code(name)
+        self.f_back = back
+
+
+class TestSampler(BaseTestCase):
+
+    def test_create_stats(self):
+        base = FakeFrame('runner')
+        outer = FakeFrame('outer', back=base)
+        inner = FakeFrame('inner', back=outer)
+
+        sampler = profiler.Sampler(1, base, 0.01)
+        self.assertTrue(sampler.is_empty)
+
+        sampler.sample(inner)
+        sampler.sample(inner)
+        sampler.sample(outer)
+        sampler.create_stats()
+
+        outer_func = ('file.py', 1, 'outer')
+        inner_func = ('file.py', 1, 'inner')
+
+        self.assertNotIn(('file.py', 1, 'runner'), sampler.stats)
+
+        cc, nc, tt, ct, callers = sampler.stats[outer_func]
+        self.assertEqual((cc, nc), (3, 3))
+        self.assertAlmostEqual(tt, 0.01)
+        self.assertAlmostEqual(ct, 0.03)
+        self.assertEqual(callers, {})
+
+        cc, nc, tt, ct, callers = sampler.stats[inner_func]
+        self.assertEqual((cc, nc), (2, 2))
+        self.assertAlmostEqual(tt, 0.02)
+        self.assertAlmostEqual(ct, 0.02)
+        self.assertEqual(list(callers), [outer_func])
+
+    def test_recursion(self):
+        base = FakeFrame('runner')
+        first = FakeFrame('func', back=base)
+        second = FakeFrame('func', back=first)
+
+        sampler = profiler.Sampler(1, base, 0.01)
+        sampler.sample(second)
+        sampler.create_stats()
+
+        cc, nc, tt, ct, _ = sampler.stats[('file.py', 1, 'func')]
+        self.assertEqual((cc, nc), (1, 1))
+        self.assertAlmostEqual(ct, 0.01)
+
+
+class TestProfileCaseLayer(ResultTestCaseMixin, BaseTestCase):
+
+    def setUp(self):
+        super(TestProfileCaseLayer, self).setUp()
+
+        self.directory = tempfile.mkdtemp()
+        self.layer = profiler.ProfileCaseLayer(self.directory)
+
+    def tearDown(self):
+        super(TestProfileCaseLayer, self).tearDown()
+
+        shutil.rmtree(self.directory)
+
+    def run_case(self):
+        class CaseClass(case_factory.FakeCase):
+            __layers__ = [self.layer]
+
+        CaseClass('test', config=self.config)(self.result)
+
+    def test_dump_by_suite(self):
+        self.run_case()
+        self.run_case()
+
+        stats_files = profiler.get_stats_files(self.directory)
+
+        self.assertEqual(list(stats_files), [case_factory.FakeCase.__mount_data__.suite_name])
+        self.assertEqual(len(stats_files[case_factory.FakeCase.__mount_data__.suite_name]), 2)
+
+    def test_report(self):
+        self.run_case()
+
+        stream = StringIO()
+        profiler.print_report(self.directory, limit=5, stream=stream)
+
+        self.assertIn('Profile by suites', stream.getvalue())
+        self.assertTrue(os.path.isfile(os.path.join(self.directory, profiler.PROGRAM_STATS)))
+
+        profiler.clear_stats(self.directory)
+        self.assertEqual(profiler.get_stats_files(self.directory), {})
+
+    def test_threads(self):
+        self.layer.configure(self.directory, mode=profiler.SAMPLING, interval=0.001)
+
+        def target():
+            for _ in range(10):
+                self.run_case()
+
+        threads = [threading.Thread(target=target) for _ in range(8)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.result.errors), 0)
+        self.assertEqual(len(self.result.successes), 80)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            profiler.ProfileCaseLayer(self.directory, mode='unknown')
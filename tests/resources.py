@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+import time
+import unittest
+import threading
+
+from seismograph import resources
+from seismograph.utils import pyv
+from seismograph.suite import MountData
+from seismograph.groups.executor import Executor
+
+from .lib.factories import suite_factory
+from .lib.case import (
+    BaseTestCase,
+    ResultTestCaseMixin,
+)
+
+
+class TestParse(BaseTestCase):
+
+    def test_string(self):
+        self.assertEqual(resources.parse('db'), (resources.exclusive('db'), ))
+
+    def test_list(self):
+        specs = ['db', resources.shared('mock', 2), 'db']
+
+        self.assertEqual(
+            resources.parse(specs),
+            (resources.exclusive('db'), resources.shared('mock', 2)),
+        )
+
+    def test_empty(self):
+        self.assertEqual(resources.parse(None), ())
+
+    def test_wrong_type(self):
+        with self.assertRaises(TypeError):
+            resources.parse([1])
+
+        with self.assertRaises(ValueError):
+            resources.shared('mock', 0)
+
+
+class TestResourceManager(BaseTestCase):
+
+    def setUp(self):
+        self.manager = resources.ResourceManager()
+
+    def test_exclusive(self):
+        db = (resources.exclusive('db'), )
+
+        self.assertTrue(self.manager.try_acquire('a', db))
+        self.assertFalse(self.manager.try_acquire('b', db))
+
+        self.manager.release('a')
+        self.assertTrue(self.manager.try_acquire('b', db))
+
+    def test_shared(self):
+        mock = (resources.shared('mock', 2), )
+
+        self.assertTrue(self.manager.try_acquire('a', mock))
+        self.assertTrue(self.manager.try_acquire('b', mock))
+        self.assertFalse(self.manager.try_acquire('c', mock))
+        self.assertFalse(self.manager.try_acquire('c', (resources.exclusive('mock'), )))
+
+        self.manager.release('a')
+        self.assertTrue(self.manager.try_acquire('c', mock))
+
+    def test_all_or_none(self):
+        self.manager.try_acquire('a', (resources.exclusive('db'), ))
+
+        both = (resources.exclusive('cache'), resources.exclusive('db'))
+        self.assertFalse(self.manager.try_acquire('b', both))
+
+        self.assertTrue(
+            self.manager.try_acquire('c', (resources.exclusive('cache'), )),
+        )
+
+    def test_parent(self):
+        db = (resources.exclusive('db'), )
+
+        self.manager.try_acquire('suite', db)
+
+        self.assertTrue(self.manager.try_acquire('case', db, parent='suite'))
+        self.assertFalse(self.manager.try_acquire('other', db, parent='other_suite'))
+
+        # resources of suite are not released by its case
+        self.manager.release('case')
+        self.assertFalse(self.manager.try_acquire('other', db))
+
+
+class TestExecutorWithLocks(BaseTestCase):
+
+    def test_conflicting_tasks(self):
+        manager = resources.ResourceManager()
+        executor = Executor(4)
+        queue = executor.queue()
+
+        lock = threading.Lock()
+        running = set()
+        conflicts = []
+
+        def task(name):
+            with lock:
+                if name in running:
+                    conflicts.append(name)
+                running.add(name)
+
+            time.sleep(0.01)
+
+            with lock:
+                running.discard(name)
+
+        for i in range(8):
+            name = 'db' if i % 2 else 'cache'
+            queue.submit_with_lock(
+                resources.Lock(i, (resources.exclusive(name), ), manager=manager),
+                task, name,
+            )
+
+        queue.join()
+        executor.shutdown()
+
+        self.assertEqual(conflicts, [])
+        self.assertEqual(manager.get_held(0), ())
+
+
+class TestReservation(BaseTestCase):
+
+    def setUp(self):
+        self.manager = resources.ResourceManager()
+
+    def test_suite_reserves_resources_of_cases(self):
+        db = (resources.exclusive('db'), )
+        mock = (resources.shared('mock', 2), )
+
+        self.assertTrue(self.manager.try_acquire('suite', db, reserved=mock))
+        self.assertEqual(self.manager.get_reserved('suite'), mock)
+
+        # others are waiting for suite, its cases are not
+        self.assertFalse(self.manager.try_acquire('other', mock))
+        self.assertTrue(self.manager.try_acquire('one', mock, parent='suite'))
+        self.assertTrue(self.manager.try_acquire('two', mock, parent='suite'))
+        self.assertFalse(self.manager.try_acquire('three', mock, parent='suite'))
+
+        self.manager.release('one')
+        self.assertTrue(self.manager.try_acquire('three', mock, parent='suite'))
+
+        self.manager.release('suite')
+        self.assertTrue(self.manager.try_acquire('other', mock))
+
+
+class DBSuite(suite_factory.FakeSuite):
+    __resources__ = ['db']
+
+
+class MockSuite(suite_factory.FakeSuite):
+    __resources__ = ['mock']
+
+
+def create_crossed_suite(suite_class, name, resource_of_case, config):
+    suite = suite_class(name)
+    suite.__mount_data__ = MountData(config)
+
+    @suite.register(resources=[resource_of_case])
+    def test_crossed(case):
+        time.sleep(0.05)
+
+    suite.build()
+
+    return suite
+
+
+class CrossedSuitesTestCaseMixin(ResultTestCaseMixin):
+    """
+    Suite holds resource which is needed by case of other suite
+    """
+
+    def run_suites(self, group_class):
+        suites = [
+            create_crossed_suite(DBSuite, 'tests.resources.a', 'mock', self.config),
+            create_crossed_suite(MockSuite, 'tests.resources.b', 'db', self.config),
+        ]
+
+        thread = threading.Thread(target=group_class(suites, self.config), args=(self.result, ))
+        thread.daemon = True
+        thread.start()
+        thread.join(timeout=10)
+
+        self.assertFalse(thread.is_alive(), 'Suites were waiting for each other')
+        self.assertEqual(len(self.result.successes), 2)
+
+
+class TestCrossedSuitesOnThreading(CrossedSuitesTestCaseMixin, BaseTestCase):
+
+    __config_options__ = {'THREADING': True, 'ASYNC_SUITES': 2, 'ASYNC_TESTS': 2}
+
+    def runTest(self):
+        from seismograph.groups.threading import ThreadingSuiteGroup
+
+        self.run_suites(ThreadingSuiteGroup)
+
+
+@unittest.skipIf(pyv.IS_PYTHON_2, 'asyncio is not available')
+class TestCrossedSuitesOnAsyncio(CrossedSuitesTestCaseMixin, BaseTestCase):
+
+    __config_options__ = {'ASYNCIO': True, 'ASYNC_SUITES': 1}
+
+    def runTest(self):
+        from seismograph.groups.asyncio import AsyncioSuiteGroup
+
+        self.run_suites(AsyncioSuiteGroup)
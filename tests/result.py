@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+import mock
+
+from seismograph import reason
+from seismograph.xunit import XUnitData
+from seismograph.result import ResultStorage
+
+from .lib.factories import case_factory
+from .lib.case import BaseTestCase
+
+
+class TestResultStorage(BaseTestCase):
+
+    def setUp(self):
+        self.first = case_factory.create()
+        self.second = case_factory.create()
+
+        self.storage = ResultStorage()
+        self.storage.append((self.first, XUnitData(runtime=0.1)))
+        self.storage.append((self.second, XUnitData(runtime=0.2)))
+
+    def test_list_behavior(self):
+        self.assertTrue(self.storage)
+        self.assertEqual(len(self.storage), 2)
+        self.assertIs(self.storage[0][0], self.first)
+        self.assertIs(self.storage[-1][0], self.second)
+        self.assertEqual([c for c, _ in self.storage[1:]], [self.second])
+
+        with self.assertRaises(IndexError):
+            self.storage[2]
+
+        del self.storage[:]
+
+        self.assertFalse(self.storage)
+        self.assertEqual(self.storage.runtime, 0)
+
+    def test_get(self):
+        self.assertEqual(self.storage.get(self.second).runtime, 0.2)
+        self.assertIsNone(self.storage.get(case_factory.create()))
+
+    def test_replace(self):
+        self.assertTrue(self.storage.replace(self.first, XUnitData(runtime=0.5)))
+        self.assertFalse(self.storage.replace(case_factory.create(), XUnitData(runtime=0.5)))
+
+        self.assertEqual([c for c, _ in self.storage], [self.second, self.first])
+        self.assertEqual(self.storage.get(self.first).runtime, 0.5)
+        self.assertEqual(round(self.storage.runtime, 3), 0.7)
+
+    def test_del_item(self):
+        del self.storage[0]
+
+        self.assertEqual(len(self.storage), 1)
+        self.assertIsNone(self.storage.get(self.first))
+        self.assertEqual(round(self.storage.runtime, 3), 0.2)
+
+
+class TestLazyReason(BaseTestCase):
+
+    def test_format_once(self):
+        case = case_factory.create()
+        case_reason = reason.create(case, 'traceback')
+
+        with mock.patch.object(
+                reason.Reason, '__format_reason__', return_value=u'formatted') as format_reason:
+            xunit_data = XUnitData(reason=case_reason, runtime=0.1)
+
+            self.assertFalse(hasattr(xunit_data, '__dict__'))
+            self.assertEqual(format_reason.call_count, 0)
+
+            self.assertEqual(xunit_data.reason, u'formatted')
+            self.assertEqual(xunit_data.to_dict()['reason'], u'formatted')
+            self.assertEqual(format_reason.call_count, 1)
+
+    def test_state_of_next_run(self):
+        case = case_factory.create()
+        case.reason_storage['run'] = 'first'
+
+        xunit_data = XUnitData(reason=reason.capture(case, 'traceback'), runtime=0.1)
+
+        # case is changed by repeated run before report
+        case.reason_storage['run'] = 'second'
+
+        self.assertIn('run: first', xunit_data.reason)
+        self.assertNotIn('second', xunit_data.reason)
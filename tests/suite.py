@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 
 import inspect
+import unittest
 
 from seismograph import (
     case,
     suite,
     steps,
     exceptions,
+    resources,
     SuiteLayer,
     CaseLayer,
 )
@@ -450,6 +452,29 @@ class TestRegisterCase(BaseTestCase):
 
         self.assertTrue(CaseClass.__always_success__)
 
+    def test_timeout_param(self):
+        suite_inst = suite_factory.create()
+
+        @suite_inst.register(timeout=10)
+        class CaseClass(case.Case):
+            def test(self):
+                pass
+
+        self.assertEqual(CaseClass.__timeout__, 10)
+
+    def test_resources_param(self):
+        suite_inst = suite_factory.create()
+
+        @suite_inst.register(resources=['db', resources.shared('mock', 2)])
+        class CaseClass(case.Case):
+            def test(self):
+                pass
+
+        self.assertEqual(
+            CaseClass.__resources__,
+            (resources.exclusive('db'), resources.shared('mock', 2)),
+        )
+
 
 class TestBuildRule(BaseTestCase):
 
@@ -673,6 +698,62 @@ class TestErrorOnContext(RunSuiteTestCaseMixin, BaseTestCase):
         )
 
 
+@unittest.skipIf(pyv.IS_PYTHON_2, 'asyncio is not available')
+class TestRunSuiteOnAsyncio(RunSuiteTestCaseMixin, BaseTestCase):
+
+    __config_options__ = {'ASYNCIO': True}
+
+    class SuiteClass(suite.Suite):
+
+        layer = layers.SuiteLayer()
+        __layers__ = (layer, )
+
+    class CaseClass(case_factory.FakeCase):
+
+        layer = layers.CaseLayer()
+        __layers__ = (layer, )
+
+        def test(self):
+            import asyncio
+            return asyncio.sleep(0)
+
+    def runTest(self):
+        from seismograph.groups.asyncio import AsyncioCaseGroup
+
+        self.assertIsInstance(self.suite._make_group(), AsyncioCaseGroup)
+        self.assertEqual(len(self.result.successes), 1)
+        self.assertEqual(self.result.current_state.tests, 1)
+
+        self.assertEqual(
+            self.suite.layer.calling_story,
+            ['on_init', 'on_require', 'on_run', 'on_setup', 'on_teardown'],
+        )
+        self.assertEqual(
+            self.CaseClass.layer.calling_story[-4:],
+            ['on_run', 'on_setup', 'on_teardown', 'on_success'],
+        )
+
+
+class FailedAwaitable(object):
+
+    def __await__(self):
+        raise AssertionError('message')
+        yield
+
+
+@unittest.skipIf(pyv.IS_PYTHON_2, 'asyncio is not available')
+class TestRunAwaitableOnDefaultGroup(RunSuiteTestCaseMixin, BaseTestCase):
+
+    class CaseClass(case_factory.FakeCase):
+
+        def test(self):
+            return FailedAwaitable()
+
+    def runTest(self):
+        self.assertEqual(len(self.result.failures), 1)
+        self.assertFalse(self.result.successes)
+
+
 class TestShouldStop(SuiteTestCaseMixin, ResultTestCaseMixin, BaseTestCase):
 
     class CaseClass(case_factory.FakeCase):
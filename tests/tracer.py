@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import shutil
+import tempfile
+
+from seismograph import tracer
+from seismograph.steps import step
+
+from .lib.factories import case_factory
+from .lib.case import (
+    BaseTestCase,
+    ResultTestCaseMixin,
+)
+
+
+class TestTracer(ResultTestCaseMixin, BaseTestCase):
+
+    def setUp(self):
+        super(TestTracer, self).setUp()
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, 'trace.json')
+
+        tracer.enable(self.file_path)
+
+    def tearDown(self):
+        super(TestTracer, self).tearDown()
+
+        tracer.disable()
+        shutil.rmtree(self.tmp_dir)
+
+    def read_trace(self):
+        with open(self.file_path) as fp:
+            return json.load(fp)['traceEvents']
+
+    def test_disabled(self):
+        tracer.disable()
+
+        self.assertIs(tracer.span('name', tracer.CASE), tracer.NULL_SPAN)
+
+        with tracer.span('name', tracer.CASE):
+            pass
+
+        self.assertEqual(tracer.get_events(), [])
+
+    def test_span(self):
+        with tracer.span('{}.{}', tracer.HOOK, 'Layer', 'on_setup'):
+            pass
+
+        metadata, event = tracer.get_events()
+
+        self.assertEqual(metadata['ph'], 'M')
+        self.assertEqual(event['name'], 'Layer.on_setup')
+        self.assertEqual(event['cat'], tracer.HOOK)
+        self.assertEqual(event['ph'], 'X')
+        self.assertEqual(event['pid'], os.getpid())
+        self.assertEqual(event['tid'], metadata['tid'])
+
+    def test_case_and_steps(self):
+        class StepCase(case_factory.FakeCase):
+
+            @step(1, 'step one')
+            def one(self):
+                pass
+
+            @step(2, 'step two')
+            def two(self):
+                pass
+
+        StepCase('test', config=self.config)(self.result)
+
+        events = dict(
+            (e['cat'], e) for e in tracer.get_events() if e['ph'] == 'X'
+        )
+
+        self.assertIn(tracer.CASE, events)
+        self.assertIn(tracer.STEP, events)
+
+        case_event, step_event = events[tracer.CASE], events[tracer.STEP]
+
+        self.assertTrue(case_event['name'].endswith('StepCase:test'))
+        self.assertGreaterEqual(step_event['ts'], case_event['ts'])
+
+    def test_merge_parts(self):
+        part_path = '{}.{}{}'.format(self.file_path, 1, tracer.PART_EXTENSION)
+
+        with open(part_path, 'w') as fp:
+            json.dump([{'name': 'worker', 'ph': 'X', 'ts': 0, 'dur': 1, 'pid': 1, 'tid': 1}], fp)
+
+        with tracer.span('main', tracer.PROGRAM):
+            pass
+
+        tracer.save()
+
+        names = [e['name'] for e in self.read_trace() if e['ph'] == 'X']
+
+        self.assertEqual(names, ['worker', 'main'])
+        self.assertFalse(os.path.exists(part_path))
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+import time
+import unittest
+import threading
+
+from seismograph import case
+from seismograph import watchdog
+from seismograph.utils import pyv
+from seismograph.exceptions import CaseTimeout
+
+from .lib.case import (
+    BaseTestCase,
+    RunSuiteTestCaseMixin,
+)
+from .lib.factories import (
+    case_factory,
+    config_factory,
+)
+
+
+def sleep_in_loop():
+    while True:
+        time.sleep(0.01)
+
+
+class TestGetTimeout(BaseTestCase):
+
+    def test_config(self):
+        config = config_factory.create(CASE_TIMEOUT=10)
+
+        self.assertIsNone(watchdog.get_timeout(case_factory.create()))
+        self.assertEqual(watchdog.get_timeout(case_factory.create(config=config)), 10)
+
+    def test_order(self):
+        config = config_factory.create(CASE_TIMEOUT=10)
+
+        @case.timeout(5)
+        class CaseClass(case_factory.FakeCase):
+            __mount_data__ = case.MountData(__name__, timeout=7)
+
+            @case.timeout(1)
+            def test(self):
+                pass
+
+            def test_other(self):
+                pass
+
+        self.assertEqual(watchdog.get_timeout(CaseClass('test', config=config)), 1)
+        self.assertEqual(watchdog.get_timeout(CaseClass('test_other', config=config)), 5)
+
+        CaseClass.__timeout__ = None
+        self.assertEqual(watchdog.get_timeout(CaseClass('test_other', config=config)), 7)
+
+    def test_null_guard(self):
+        self.assertIs(watchdog.guard(case_factory.create()), watchdog.NULL_GUARD)
+
+
+class TestGuard(BaseTestCase):
+
+    def setUp(self):
+        self.case = case_factory.create(config=config_factory.create())
+
+    def test_signal(self):
+        with self.assertRaises(CaseTimeout) as ctx:
+            with watchdog.Guard(self.case, 0.05):
+                sleep_in_loop()
+
+        self.assertIn('sleep_in_loop', ctx.exception.message)
+
+    def test_thread(self):
+        errors = []
+
+        def target():
+            try:
+                with watchdog.Guard(self.case, 0.05):
+                    sleep_in_loop()
+            except CaseTimeout as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join(timeout=5)
+
+        self.assertEqual(len(errors), 1)
+        self.assertIn('sleep_in_loop', errors[0].message)
+
+    def test_not_fired(self):
+        def target():
+            with watchdog.Guard(self.case, 0.05):
+                pass
+            # exception is not raised after exit
+            time.sleep(0.1)
+
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+
+        with watchdog.Guard(self.case, 0.05):
+            pass
+
+        time.sleep(0.1)
+
+
+@unittest.skipIf(pyv.IS_PYTHON_2, 'asyncio is not available')
+class TestGuardOfContextOnAsyncio(RunSuiteTestCaseMixin, BaseTestCase):
+
+    __config_options__ = {'ASYNCIO': True}
+
+    class CaseClass(case_factory.FakeCase):
+
+        __timeout__ = 0.05
+
+        def setup(self):
+            import asyncio
+            return asyncio.sleep(10)
+
+        def test(self):
+            pass
+
+    def runTest(self):
+        # guard is covering context as in sync case
+        self.assertEqual(len(self.result.errors), 1)
+
+        _, xunit_data = self.result.errors[0]
+        self.assertTrue(xunit_data.exc_type.endswith(CaseTimeout.__name__))
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+
+from seismograph import xunit
+from seismograph.suite import Suite
+from seismograph.utils import pyv
+
+from .lib.factories import case_factory
+from .lib.case import (
+    BaseTestCase,
+    ResultTestCaseMixin,
+)
+
+
+class TestXUnitWriter(ResultTestCaseMixin, BaseTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, 'report.xml')
+        self.__config_options__ = {'XUNIT_REPORT': self.file_path}
+
+        super(TestXUnitWriter, self).setUp()
+
+    def tearDown(self):
+        super(TestXUnitWriter, self).tearDown()
+
+        shutil.rmtree(self.tmp_dir)
+
+    def read_report(self):
+        with open(self.file_path, 'rb') as fp:
+            return fp.read()
+
+    def expected_report(self):
+        document = xunit.create_xml_document(self.result)
+
+        if pyv.IS_PYTHON_3:
+            return document.encode('utf-8')
+
+        return document
+
+    def test_proxies(self):
+        case = case_factory.create(config=self.config)
+
+        with self.result.proxy(Suite('first')) as first:
+            with self.result.proxy(Suite('second')) as second:
+                first.add_fail(case, 'traceback', 0.1, AssertionError('<fail>'))
+                second.add_success(case, 0.2)
+                first.add_success(case, 0.3)
+
+                with first.proxy() as case_proxy:
+                    case_proxy.add_error(case, 'traceback', 0.4, ValueError(u'ошибка'))
+                    case_proxy.add_skip(case, 'reason', 0.5)
+
+        with self.result.proxy(Suite('empty')):
+            pass
+
+        self.assertIsNotNone(self.result.xunit_writer)
+        self.result.xunit_writer.close(self.result)
+
+        self.assertEqual(self.read_report(), self.expected_report())
+
+    def test_without_proxies(self):
+        case = case_factory.create(config=self.config)
+
+        with self.result.proxy() as case_proxy:
+            case_proxy.add_success(case, 0.1)
+            case_proxy.add_fail(case, 'traceback', 0.2, AssertionError('fail'))
+
+        self.result.xunit_writer.close(self.result)
+
+        self.assertEqual(self.read_report(), self.expected_report())
+
+    def test_reset_item(self):
+        case = case_factory.create(config=self.config)
+
+        with self.result.proxy(Suite('suite')) as result_proxy:
+            result_proxy.add_fail(case, 'traceback', 0.1, AssertionError('fail'))
+
+            xunit_data = result_proxy.get_fail_by(case)
+            xunit_data.exc_message = 'changed'
+            result_proxy.reset_fail(case, xunit_data)
+
+        self.result.xunit_writer.close(self.result)
+
+        report = self.read_report()
+
+        self.assertIn(b'changed', report)
+        self.assertEqual(report, self.expected_report())
+
+
+class TestXUnitMetrics(BaseTestCase):
+
+    def test_properties(self):
+        xunit_data = xunit.XUnitData(
+            runtime=0.1,
+            class_name='suite.Case',
+            method_name='test',
+            metrics={'test': 0.05, 'memory_peak': 1024},
+        )
+
+        self.assertEqual(
+            xunit.success_to_xml(xunit_data),
+            u'<testcase time="0.1" name="test" classname="suite.Case">'
+            u'<properties>'
+            u'<property name="memory_peak" value="1024" />'
+            u'<property name="test" value="0.050000" />'
+            u'</properties>'
+            u'</testcase>',
+        )
+
+    def test_without_metrics(self):
+        xunit_data = xunit.XUnitData(runtime=0.1, method_name='test')
+
+        self.assertEqual(xunit.properties_to_xml(xunit_data), u'')
+        self.assertEqual(xunit.XUnitData.from_dict(xunit_data.to_dict()).metrics, None)